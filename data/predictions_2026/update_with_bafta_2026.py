@@ -5,6 +5,11 @@ Apply BAFTA boost to all categories
 
 import pandas as pd
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+
+from fit_boost_factors import boost_factor, load_boost_factors
 
 
 # BAFTA 2026 Winners (February 16, 2026)
@@ -54,77 +59,79 @@ def update_with_bafta():
     print(f"   Best Supporting Actress: Wunmi Mosaku (Sinners)")
     print(f"   + {len(BAFTA_2026_WINNERS)-4} more technical categories")
     
-    # Category mappings: file → BAFTA category → match field
+    # Category mappings: file → category → BAFTA winner → match field
+    # (boost = BAFTA odds factor fitted by src/fit_boost_factors.py)
+    factors = load_boost_factors()
     category_updates = {
         'best_picture_predictions.csv': {
+            'category': 'Best Picture',
             'bafta_winner': 'One Battle after Another',
-            'match_field': 'film',
-            'boost': 2.5  # BAFTA Best Film is VERY predictive
+            'match_field': 'film'
         },
         'best_director_predictions.csv': {
+            'category': 'Best Director',
             'bafta_winner': 'Paul Thomas Anderson',
-            'match_field': 'nominee',
-            'boost': 2.2
+            'match_field': 'nominee'
         },
         'best_actress_in_a_leading_role_predictions.csv': {
+            'category': 'Best Actress in a Leading Role',
             'bafta_winner': 'Jessie Buckley',
-            'match_field': 'nominee',
-            'boost': 2.0
+            'match_field': 'nominee'
         },
         'best_actress_in_a_supporting_role_predictions.csv': {
+            'category': 'Best Actress in a Supporting Role',
             'bafta_winner': 'Wunmi Mosaku',
-            'match_field': 'nominee',
-            'boost': 1.8
+            'match_field': 'nominee'
         },
         'best_actor_in_a_supporting_role_predictions.csv': {
+            'category': 'Best Actor in a Supporting Role',
             'bafta_winner': 'Sean Penn',
-            'match_field': 'nominee',
-            'boost': 1.8
+            'match_field': 'nominee'
         },
         'best_original_screenplay_predictions.csv': {
+            'category': 'Best Original Screenplay',
             'bafta_winner': 'Sinners',
-            'match_field': 'nominee',
-            'boost': 2.0
+            'match_field': 'nominee'
         },
         'best_adapted_screenplay_predictions.csv': {
+            'category': 'Best Adapted Screenplay',
             'bafta_winner': 'One Battle after Another',
-            'match_field': 'nominee',
-            'boost': 2.0
+            'match_field': 'nominee'
         },
         'best_cinematography_predictions.csv': {
+            'category': 'Best Cinematography',
             'bafta_winner': 'One Battle after Another',
-            'match_field': 'film',
-            'boost': 2.0
+            'match_field': 'film'
         },
         'best_film_editing_predictions.csv': {
+            'category': 'Best Film Editing',
             'bafta_winner': 'One Battle after Another',
-            'match_field': 'film',
-            'boost': 2.0
+            'match_field': 'film'
         },
         'best_production_design_predictions.csv': {
+            'category': 'Best Production Design',
             'bafta_winner': 'Frankenstein',
-            'match_field': 'film',
-            'boost': 2.0
+            'match_field': 'film'
         },
         'best_costume_design_predictions.csv': {
+            'category': 'Best Costume Design',
             'bafta_winner': 'Frankenstein',
-            'match_field': 'film',
-            'boost': 2.0
+            'match_field': 'film'
         },
         'best_makeup_and_hairstyling_predictions.csv': {
+            'category': 'Best Makeup and Hairstyling',
             'bafta_winner': 'Frankenstein',
-            'match_field': 'film',
-            'boost': 2.0
+            'match_field': 'film'
         },
         'best_sound_predictions.csv': {
+            'category': 'Best Sound',
             'bafta_winner': 'F1',
-            'match_field': 'film',
-            'boost': 1.8
+            'match_field': 'film'
         },
         'best_original_score_predictions.csv': {
+            'category': 'Best Original Score',
             'bafta_winner': 'Sinners',
-            'match_field': 'film',
-            'boost': 2.0
+            'match_field': 'film'
         },
     }
     
@@ -145,14 +152,14 @@ def update_with_bafta():
         
         bafta_winner = config['bafta_winner']
         match_field = config['match_field']
-        boost = config['boost']
+        boost = boost_factor(config['category'], 'bafta', factors)
         
         # Find and boost BAFTA winner
         mask = df[match_field].str.contains(bafta_winner, case=False, na=False, regex=False)
         
         if mask.any():
             df.loc[mask, 'win_probability'] = df.loc[mask, 'win_probability'] * boost
-            print(f"   ✅ Boosted '{bafta_winner}' by {boost}x")
+            print(f"   ✅ Boosted '{bafta_winner}' by {boost:.2f}x")
         else:
             print(f"   ⚠️ BAFTA winner '{bafta_winner}' not found in nominees")
         
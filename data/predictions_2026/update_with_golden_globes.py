@@ -4,8 +4,12 @@ Adds GG win data to boost prediction accuracy
 """
 
 import pandas as pd
-import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+
+from model_registry import has_bundle, lazy_bundle
 
 
 # Golden Globes 2026 Winners (83rd Awards - January 11, 2026)
@@ -51,27 +55,12 @@ def update_predictions_with_gg():
     
     # Load model
     print("\n🤖 Loading model...")
-    try:
-        model = joblib.load('models/tier2_enhanced_model.pkl')
-        print("✅ Model loaded")
-    except:
+    if not has_bundle('tier2_enhanced'):
         print("❌ Model not found!")
         return
-    
-    features = [
-        'total_nominations',
-        'nomination_share',
-        'nom_ratio',
-        'is_top_nominated',
-        'nom_rank',
-        'won_gg_drama',
-        'won_gg_musical',
-        'won_bafta',
-        'won_sag_cast',
-        'total_precursor_wins',
-        'has_precursor_win',
-        'precursor_sweep',
-    ]
+    # Loaded on the first prediction
+    model = lazy_bundle('tier2_enhanced')
+    print(f"✅ Model {model.version} found")
     
     # Categories to update
     categories_to_update = {
@@ -147,10 +136,9 @@ def update_predictions_with_gg():
         df['has_precursor_win'] = (df['total_precursor_wins'] > 0).astype(int)
         
         # Re-predict with updated features
-        X = df[features]
-        
         try:
-            probabilities = model.predict_proba(X)[:, 1]
+            # Checked against the model's feature schema first
+            probabilities = model.predict_proba(df)[:, 1]
             df['win_probability'] = probabilities
         except Exception as e:
             print(f"   ⚠️ Prediction failed: {e}")
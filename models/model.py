@@ -6,29 +6,15 @@ Trains Best Picture prediction model with engineered features
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_auc_score
-import joblib
 import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
 
-def engineer_features(df):
-    """
-    Create additional features to improve predictions
-    """
-    print("\n🔧 Engineering features...")
-    
-    # Nomination ratio (how many noms compared to that year's average)
-    df['nom_ratio'] = df['total_nominations'] / df['year_total_nominations']
-    
-    # Is it the most nominated film that year?
-    df['is_top_nominated'] = (df.groupby('year_ceremony')['total_nominations']
-                               .transform('max') == df['total_nominations']).astype(int)
-    
-    # Nomination rank within year
-    df['nom_rank'] = df.groupby('year_ceremony')['total_nominations'].rank(ascending=False, method='min')
-    
-    print(f"✅ Created new features: nom_ratio, is_top_nominated, nom_rank")
-    
-    return df
+from experiment_store import frame_hash
+from feature_registry import BASIC_FEATURES
+from feature_store import load_features
+from model_registry import save_bundle
 
 
 def train_model():
@@ -40,22 +26,13 @@ def train_model():
     # --------------------------------------------------
     # 1️⃣ Load Processed Data
     # --------------------------------------------------
-    print("\n📂 Loading processed data...")
-    df = pd.read_csv("data/processed/best_picture_clean.csv")
-    
-    # Engineer features
-    df = engineer_features(df)
+    print("\n📂 Loading feature matrix from the feature store...")
+    df = load_features('best_picture')
 
     # --------------------------------------------------
     # 2️⃣ Select Features
     # --------------------------------------------------
-    features = [
-        'total_nominations',
-        'nomination_share',
-        'nom_ratio',
-        'is_top_nominated',
-        'nom_rank'
-    ]
+    features = list(BASIC_FEATURES)
 
     target = 'winner'
 
@@ -111,9 +88,11 @@ def train_model():
     print("\n📋 Classification Report:")
     print(classification_report(y_test, y_pred, zero_division=0))
 
+    metrics = {}
     try:
         auc_score = roc_auc_score(y_test, y_prob)
         print(f"\n🎯 ROC-AUC Score: {auc_score:.4f}")
+        metrics['roc_auc'] = round(float(auc_score), 4)
     except:
         print("\n⚠️ Not enough data for ROC-AUC")
 
@@ -136,11 +115,12 @@ def train_model():
     # --------------------------------------------------
     # 6️⃣ Save Model
     # --------------------------------------------------
-    os.makedirs("models", exist_ok=True)
-
-    joblib.dump(model, "models/best_picture_model.pkl")
+    # Bundled with its feature schema (python src/model_registry.py lists it)
+    path = save_bundle('best_picture', model, X_train,
+                       frame_hash(train[features + [target, 'year_ceremony']]), metrics,
+                       years=train['year_ceremony'])
 
-    print("\n💾 Model saved to models/best_picture_model.pkl")
+    print(f"\n💾 Model saved to {path}")
     print("\n✅ Training complete!")
 
 
@@ -5,16 +5,16 @@ Applies empirical GG winner boost based on historical patterns
 
 import pandas as pd
 import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
 
-# Historical GG Winner Boost (based on training data)
-GG_BOOST_FACTORS = {
-    'drama': 1.8,      # GG Drama winners 80% more likely to win Oscar
-    'musical': 1.3,    # GG Musical/Comedy 30% boost (less predictive)
-    'supporting': 1.5, # Supporting actor GG = 50% boost
-    'director': 1.6,   # Director GG = 60% boost
-    'score': 1.7,      # Score GG = 70% boost
-}
+from fit_boost_factors import boost_factor, load_boost_factors
+
+
+# Historical GG winner boosts per (precursor, category) are fitted by
+# src/fit_boost_factors.py - Golden Globes without a drama/musical split
+# (director, acting, score, ...) count as 'gg_drama'
 
 
 def normalize_probabilities(probabilities):
@@ -23,9 +23,11 @@ def normalize_probabilities(probabilities):
     return [p / total for p in probabilities]
 
 
-def update_category_with_gg(filepath, gg_winners, boost_type='drama', match_field='nominee'):
+def update_category_with_gg(filepath, category, gg_winners, factors, match_field='nominee'):
     """
     Update a single category's predictions with GG boost
+    gg_winners: {winner: precursor}, e.g. {'Hamnet': 'gg_drama'}
+    factors: fitted boost factor table (load_boost_factors())
     """
     if not os.path.exists(filepath):
         return None
@@ -35,14 +37,13 @@ def update_category_with_gg(filepath, gg_winners, boost_type='drama', match_fiel
     df = pd.read_csv(filepath)
     
     # Apply boost to GG winners
-    boost_factor = GG_BOOST_FACTORS.get(boost_type, 1.5)
-    
-    for winner in gg_winners:
+    for winner, precursor in gg_winners.items():
+        factor = boost_factor(category, precursor, factors)
         mask = df[match_field].str.contains(winner, case=False, na=False)
         if mask.any():
             # Boost probability
-            df.loc[mask, 'win_probability'] = df.loc[mask, 'win_probability'] * boost_factor
-            print(f"   ✅ Boosted {winner} by {boost_factor}x")
+            df.loc[mask, 'win_probability'] = df.loc[mask, 'win_probability'] * factor
+            print(f"   ✅ Boosted {winner} ({precursor}) by {factor:.2f}x")
     
     # Normalize probabilities
     probabilities = df['win_probability'].tolist()
@@ -76,80 +77,60 @@ def create_final_predictions():
     print("   With Golden Globes 2026 Winners Boost Applied")
     print("="*70)
     
+    factors = load_boost_factors()
+    
     # ========== BEST PICTURE ==========
     update_category_with_gg(
         'data/predictions_2026/best_picture_predictions.csv',
-        ['Hamnet', 'One Battle After Another'],
-        boost_type='drama',
+        'Best Picture',
+        {'Hamnet': 'gg_drama', 'One Battle After Another': 'gg_musical'},
+        factors,
         match_field='film'
     )
     
     # ========== BEST DIRECTOR ==========
     update_category_with_gg(
         'data/predictions_2026/best_director_predictions.csv',
-        ['Paul Thomas Anderson'],
-        boost_type='director',
+        'Best Director',
+        {'Paul Thomas Anderson': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
     # ========== BEST ACTOR ==========
-    # Drama winner gets bigger boost
-    df = pd.read_csv('data/predictions_2026/best_actor_in_a_leading_role_predictions.csv')
-    
-    # Boost drama winner more
-    drama_mask = df['nominee'].str.contains('Wagner Moura', case=False, na=False)
-    df.loc[drama_mask, 'win_probability'] = df.loc[drama_mask, 'win_probability'] * 2.0
-    
-    # Boost musical/comedy winner less
-    musical_mask = df['nominee'].str.contains('Timothée Chalamet', case=False, na=False)
-    df.loc[musical_mask, 'win_probability'] = df.loc[musical_mask, 'win_probability'] * 1.5
-    
-    # Normalize
-    df['win_probability'] = normalize_probabilities(df['win_probability'].tolist())
-    df = df.sort_values('win_probability', ascending=False)
-    
-    print(f"\n📂 Updating best_actor_in_a_leading_role_predictions.csv...")
-    print(f"   ✅ Boosted Wagner Moura (GG Drama) by 2.0x")
-    print(f"   ✅ Boosted Timothée Chalamet (GG Musical) by 1.5x")
-    print(f"   📊 Updated predictions:")
-    for idx, row in df.head(3).iterrows():
-        print(f"      {row['nominee']}: {row['win_probability']:.1%}")
-    
-    df.to_csv('data/predictions_2026/best_actor_in_a_leading_role_predictions.csv', index=False)
+    # Drama and musical/comedy winners get their own fitted boosts
+    update_category_with_gg(
+        'data/predictions_2026/best_actor_in_a_leading_role_predictions.csv',
+        'Best Actor in a Leading Role',
+        {'Wagner Moura': 'gg_drama', 'Timothée Chalamet': 'gg_musical'},
+        factors,
+        match_field='nominee'
+    )
     
     # ========== BEST ACTRESS ==========
-    df = pd.read_csv('data/predictions_2026/best_actress_in_a_leading_role_predictions.csv')
-    
-    # Boost drama winner more
-    drama_mask = df['nominee'].str.contains('Jessie Buckley', case=False, na=False)
-    df.loc[drama_mask, 'win_probability'] = df.loc[drama_mask, 'win_probability'] * 2.2
-    
     # Rose Byrne won Musical/Comedy but not Oscar nominated
-    
-    # Normalize
-    df['win_probability'] = normalize_probabilities(df['win_probability'].tolist())
-    df = df.sort_values('win_probability', ascending=False)
-    
-    print(f"\n📂 Updating best_actress_in_a_leading_role_predictions.csv...")
-    print(f"   ✅ Boosted Jessie Buckley (GG Drama) by 2.2x")
-    print(f"   📊 Updated predictions:")
-    for idx, row in df.head(3).iterrows():
-        print(f"      {row['nominee']}: {row['win_probability']:.1%}")
-    
-    df.to_csv('data/predictions_2026/best_actress_in_a_leading_role_predictions.csv', index=False)
+    update_category_with_gg(
+        'data/predictions_2026/best_actress_in_a_leading_role_predictions.csv',
+        'Best Actress in a Leading Role',
+        {'Jessie Buckley': 'gg_drama'},
+        factors,
+        match_field='nominee'
+    )
     
     # ========== SUPPORTING ACTORS ==========
     update_category_with_gg(
         'data/predictions_2026/best_actor_in_a_supporting_role_predictions.csv',
-        ['Stellan Skarsgård'],
-        boost_type='supporting',
+        'Best Actor in a Supporting Role',
+        {'Stellan Skarsgård': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
     update_category_with_gg(
         'data/predictions_2026/best_actress_in_a_supporting_role_predictions.csv',
-        ['Teyana Taylor'],
-        boost_type='supporting',
+        'Best Actress in a Supporting Role',
+        {'Teyana Taylor': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
@@ -157,32 +138,36 @@ def create_final_predictions():
     # Paul Thomas Anderson won GG Screenplay
     update_category_with_gg(
         'data/predictions_2026/best_adapted_screenplay_predictions.csv',
-        ['One Battle After Another'],
-        boost_type='drama',
+        'Best Adapted Screenplay',
+        {'One Battle After Another': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
     # ========== SCORE ==========
     update_category_with_gg(
         'data/predictions_2026/best_original_score_predictions.csv',
-        ['Ludwig Goransson', 'Ludwig Göransson'],
-        boost_type='score',
+        'Best Original Score',
+        {'Ludwig Goransson': 'gg_drama', 'Ludwig Göransson': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
     # ========== SONG ==========
     update_category_with_gg(
         'data/predictions_2026/best_original_song_predictions.csv',
-        ['Golden'],
-        boost_type='drama',
+        'Best Original Song',
+        {'Golden': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
     # ========== ANIMATED FEATURE ==========
     update_category_with_gg(
         'data/predictions_2026/best_animated_feature_film_predictions.csv',
-        ['KPop Demon Hunters'],
-        boost_type='drama',
+        'Best Animated Feature Film',
+        {'KPop Demon Hunters': 'gg_drama'},
+        factors,
         match_field='nominee'
     )
     
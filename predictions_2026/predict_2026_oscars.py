@@ -5,8 +5,13 @@ Using live 2025 awards season data
 """
 
 import pandas as pd
-import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from feature_registry import compute_features
+from model_registry import has_bundle, lazy_bundle
 
 
 def predict_2026_oscars():
@@ -65,16 +70,13 @@ def predict_2026_oscars():
     
     # Simulate other required features
     contenders['year_ceremony'] = 2026
-    contenders['nomination_share'] = contenders['estimated_nominations'] / contenders['estimated_nominations'].sum()
-    contenders['year_total_nominations'] = contenders['estimated_nominations'].sum()
+    contenders['category'] = 'Best Picture'
     
     # Rename estimated to match training features
     contenders['total_nominations'] = contenders['estimated_nominations']
     
-    # Engineering features (same as training)
-    contenders['nom_ratio'] = contenders['total_nominations'] / contenders['year_total_nominations']
-    contenders['is_top_nominated'] = (contenders['total_nominations'] == contenders['total_nominations'].max()).astype(int)
-    contenders['nom_rank'] = contenders['total_nominations'].rank(ascending=False, method='min')
+    # Race features from the feature registry (same code as training)
+    contenders = compute_features(contenders, ['nomination_share', 'nom_ratio', 'is_top_nominated', 'nom_rank'])
     
     # Precursor wins
     contenders['total_precursor_wins'] = (
@@ -100,45 +102,21 @@ def predict_2026_oscars():
     # --------------------------------------------------
     print("\n🤖 Loading prediction models...")
     
-    try:
-        model_tier2 = joblib.load('models/tier2_enhanced_model.pkl')
-        print("✅ Loaded Tier 2 Enhanced Model (with precursor awards)")
-        use_tier = 2
-    except:
-        model_tier2 = joblib.load('models/tier1_basic_model.pkl')
-        print("⚠️ Using Tier 1 Basic Model")
-        use_tier = 1
+    # Registry bundle: loaded on the first prediction
+    if has_bundle('tier2_enhanced'):
+        model_tier2 = lazy_bundle('tier2_enhanced')
+        print(f"✅ Using Tier 2 Enhanced Model (with precursor awards, {model_tier2.version})")
+    else:
+        model_tier2 = lazy_bundle('tier1_basic')
+        print(f"⚠️ Using Tier 1 Basic Model ({model_tier2.version})")
     
     # --------------------------------------------------
     # 4️⃣ Prepare Features
     # --------------------------------------------------
     print("\n🔧 Preparing features for prediction...")
     
-    if use_tier == 2:
-        features = [
-            'total_nominations',
-            'nomination_share',
-            'nom_ratio',
-            'is_top_nominated',
-            'nom_rank',
-            'won_gg_drama',
-            'won_gg_musical',
-            'won_bafta',
-            'won_sag_cast',
-            'total_precursor_wins',
-            'has_precursor_win',
-            'precursor_sweep',
-        ]
-    else:
-        features = [
-            'total_nominations',
-            'nomination_share',
-            'nom_ratio',
-            'is_top_nominated',
-            'nom_rank',
-        ]
-    
-    X = contenders[features]
+    # The bundle's schema: the features (and dtypes) the model was trained on
+    X = model_tier2.validate(contenders)
     
     # --------------------------------------------------
     # 5️⃣ Generate Predictions
@@ -4,8 +4,13 @@ Uses actual 98th Academy Awards nominees (announced Jan 2026)
 """
 
 import pandas as pd
-import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from feature_registry import compute_features
+from model_registry import has_bundle, lazy_bundle
 
 
 def predict_real_2026_oscars():
@@ -68,13 +73,10 @@ def predict_real_2026_oscars():
     print("\n🔧 Calculating prediction features...")
     
     contenders['year_ceremony'] = 2026
-    contenders['nomination_share'] = contenders['total_nominations'] / contenders['total_nominations'].sum()
-    contenders['year_total_nominations'] = contenders['total_nominations'].sum()
+    contenders['category'] = 'Best Picture'
     
-    # Engineering features (same as training)
-    contenders['nom_ratio'] = contenders['total_nominations'] / contenders['year_total_nominations']
-    contenders['is_top_nominated'] = (contenders['total_nominations'] == contenders['total_nominations'].max()).astype(int)
-    contenders['nom_rank'] = contenders['total_nominations'].rank(ascending=False, method='min')
+    # Race features from the feature registry (same code as training)
+    contenders = compute_features(contenders, ['nomination_share', 'nom_ratio', 'is_top_nominated', 'nom_rank'])
     
     # Precursor wins
     contenders['total_precursor_wins'] = (
@@ -91,43 +93,19 @@ def predict_real_2026_oscars():
     # --------------------------------------------------
     print("\n🤖 Loading trained prediction model...")
     
-    try:
-        model = joblib.load('models/tier2_enhanced_model.pkl')
-        print("✅ Loaded Tier 2 Enhanced Model")
-        use_tier = 2
-    except:
-        model = joblib.load('models/tier1_basic_model.pkl')
-        print("⚠️ Using Tier 1 Basic Model")
-        use_tier = 1
+    # Registry bundle: loaded on the first prediction
+    if has_bundle('tier2_enhanced'):
+        model = lazy_bundle('tier2_enhanced')
+        print(f"✅ Using Tier 2 Enhanced Model ({model.version})")
+    else:
+        model = lazy_bundle('tier1_basic')
+        print(f"⚠️ Using Tier 1 Basic Model ({model.version})")
     
     # --------------------------------------------------
     # 5️⃣ Prepare Features
     # --------------------------------------------------
-    if use_tier == 2:
-        features = [
-            'total_nominations',
-            'nomination_share',
-            'nom_ratio',
-            'is_top_nominated',
-            'nom_rank',
-            'won_gg_drama',
-            'won_gg_musical',
-            'won_bafta',
-            'won_sag_cast',
-            'total_precursor_wins',
-            'has_precursor_win',
-            'precursor_sweep',
-        ]
-    else:
-        features = [
-            'total_nominations',
-            'nomination_share',
-            'nom_ratio',
-            'is_top_nominated',
-            'nom_rank',
-        ]
-    
-    X = contenders[features]
+    # The bundle's schema: the features (and dtypes) the model was trained on
+    X = model.validate(contenders)
     
     # --------------------------------------------------
     # 6️⃣ Generate Predictions
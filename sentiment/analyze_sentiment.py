@@ -9,10 +9,48 @@ from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import os
 
 
-def analyze_reviews_sentiment():
+def categorize_sentiment(score):
+    """
+    Map an average VADER compound score to a sentiment category
+    """
+    if score > 0.5:
+        return 'Very Positive'
+    if score > 0.2:
+        return 'Positive'
+    if score > -0.2:
+        return 'Neutral'
+    return 'Negative'
+
+
+def score_reviews(reviews, vader=None):
+    """
+    Score a batch of review texts with TextBlob and VADER
+    Returns one dict of scores per review, in input order
+    """
+    vader = vader or SentimentIntensityAnalyzer()
+    
+    scores = []
+    for review in reviews:
+        blob_sentiment = TextBlob(review).sentiment
+        vader_scores = vader.polarity_scores(review)
+        scores.append({
+            'textblob_polarity': blob_sentiment.polarity,
+            'textblob_subjectivity': blob_sentiment.subjectivity,
+            'vader_compound': vader_scores['compound'],
+            'vader_positive': vader_scores['pos'],
+            'vader_negative': vader_scores['neg'],
+        })
+    
+    return scores
+
+
+def analyze_reviews_sentiment(backend='vader'):
     """
     Analyze sentiment from sample movie reviews
     In production, you'd scrape from Twitter, Reddit, IMDb reviews
+    
+    backend='transformer' also scores every review with the quantized CPU
+    transformer model and adds avg_transformer_sentiment to the output
     """
     print("=" * 50)
     print("SENTIMENT ANALYSIS")
@@ -62,16 +100,14 @@ def analyze_reviews_sentiment():
     
     # Initialize sentiment analyzers
     print("\n🤖 Analyzing sentiment with TextBlob and VADER...")
-    vader = SentimentIntensityAnalyzer()
-    
-    # Analyze with TextBlob
-    df['textblob_polarity'] = df['review'].apply(lambda x: TextBlob(x).sentiment.polarity)
-    df['textblob_subjectivity'] = df['review'].apply(lambda x: TextBlob(x).sentiment.subjectivity)
+    scores = pd.DataFrame(score_reviews(df['review'].tolist()), index=df.index)
+    df = pd.concat([df, scores], axis=1)
     
-    # Analyze with VADER
-    df['vader_compound'] = df['review'].apply(lambda x: vader.polarity_scores(x)['compound'])
-    df['vader_positive'] = df['review'].apply(lambda x: vader.polarity_scores(x)['pos'])
-    df['vader_negative'] = df['review'].apply(lambda x: vader.polarity_scores(x)['neg'])
+    if backend == 'transformer':
+        from transformer_sentiment import TransformerSentimentScorer
+        
+        print("\n🤖 Scoring with quantized transformer backend...")
+        df['transformer_sentiment'] = TransformerSentimentScorer().score(df['review'].tolist())
     
     # Classify sentiment
     df['sentiment_label'] = df['vader_compound'].apply(
@@ -90,10 +126,14 @@ def analyze_reviews_sentiment():
     film_sentiment.columns = ['year', 'film', 'avg_textblob_sentiment', 
                               'avg_vader_sentiment', 'avg_positive_score', 'avg_negative_score']
     
+    if 'transformer_sentiment' in df.columns:
+        transformer_means = df.groupby(['year', 'film'])['transformer_sentiment'].mean()
+        film_sentiment['avg_transformer_sentiment'] = (
+            transformer_means.reindex(pd.MultiIndex.from_frame(film_sentiment[['year', 'film']])).values
+        )
+    
     # Add sentiment category
-    film_sentiment['sentiment_category'] = film_sentiment['avg_vader_sentiment'].apply(
-        lambda x: 'Very Positive' if x > 0.5 else ('Positive' if x > 0.2 else ('Neutral' if x > -0.2 else 'Negative'))
-    )
+    film_sentiment['sentiment_category'] = film_sentiment['avg_vader_sentiment'].apply(categorize_sentiment)
     
     # Save results
     os.makedirs('data/external', exist_ok=True)
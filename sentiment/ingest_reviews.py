@@ -0,0 +1,316 @@
+"""
+Streaming Review Ingestion
+Reads local review / social media dumps (.jsonl, .jsonl.gz, .ndjson.zst)
+in fixed-size chunks and feeds them to the sentiment scorer without ever
+loading the whole corpus into memory
+"""
+
+import glob
+import gzip
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from datetime import date, datetime, timezone
+
+try:
+    import zstandard
+except ImportError:  # only needed for .zst dumps
+    zstandard = None
+
+
+# Field names seen in the different dump formats, in order of preference
+TEXT_FIELDS = ['review', 'text', 'body', 'content', 'selftext', 'title']
+FILM_FIELDS = ['film', 'movie', 'title_film', 'subject']
+DATE_FIELDS = ['date', 'created_at', 'created_utc', 'timestamp', 'published']
+ID_FIELDS = ['id', 'review_id']
+
+DEFAULT_DUMP_GLOB = 'data/raw/reviews/*'
+
+EPOCH_MS_THRESHOLD = 1e11
+
+
+class IngestProgress:
+    """
+    Running counters for an ingestion pass, printed every few seconds
+    """
+
+    def __init__(self, report_every=5.0):
+        self.report_every = report_every
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.bad_rows = 0
+        self.bad_dates = 0
+        self.bytes_read = 0
+
+    def maybe_report(self):
+        now = time.perf_counter()
+        if now - self.last_report >= self.report_every:
+            self.last_report = now
+            self.report()
+
+    def report(self, final=False):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        label = "✅ Done" if final else "⏳ Ingesting"
+        print(f"{label}: {self.rows_read:,} rows read, {self.rows_kept:,} kept, "
+              f"{self.bad_rows:,} bad, {self.bad_dates:,} unparseable dates | {self.rows_read / elapsed:,.0f} rows/sec, "
+              f"{self.bytes_read / elapsed / 1e6:,.1f} MB/sec")
+
+
+class _CountingReader(io.RawIOBase):
+    """
+    Wraps the on-disk file so progress reports bytes read from disk
+    """
+
+    def __init__(self, raw, progress):
+        self.raw = raw
+        self.progress = progress
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self.raw.readinto(buffer)
+        if n:
+            self.progress.bytes_read += n
+        return n
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
+def open_dump(path, progress):
+    """
+    Open a dump as a text stream, decompressing by file extension
+    """
+    raw = io.BufferedReader(_CountingReader(open(path, 'rb', buffering=0), progress))
+
+    if path.endswith('.gz'):
+        stream = gzip.GzipFile(fileobj=raw)
+    elif path.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError(f"Reading {path} needs the zstandard package (pip install zstandard)")
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    else:
+        stream = raw
+
+    return io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+
+
+def iter_records(paths, progress):
+    """
+    Yield one parsed JSON object per line across all dump files
+    """
+    for path in paths:
+        with open_dump(path, progress) as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                progress.rows_read += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    progress.bad_rows += 1
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    progress.bad_rows += 1
+                progress.maybe_report()
+
+
+def _from_epoch(value):
+    # Dumps mix epoch seconds and milliseconds: 1e11 s is the year 5138
+    if abs(value) >= EPOCH_MS_THRESHOLD:
+        value = value / 1000
+    try:
+        return datetime.fromtimestamp(value, tz=timezone.utc).date()
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def parse_date(value):
+    """
+    Parse ISO strings and epoch seconds / milliseconds into a date (None if
+    unparseable)
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return _from_epoch(value)
+    text = str(value).strip()
+    if text.isdigit():
+        return _from_epoch(int(text))
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).date()
+    except ValueError:
+        try:
+            return datetime.strptime(text[:10], '%Y-%m-%d').date()
+        except ValueError:
+            return None
+
+
+def ceremony_year_for(review_date):
+    """
+    Awards season runs autumn to March - reviews from April on count
+    toward the following year's ceremony
+    """
+    return review_date.year + 1 if review_date.month >= 4 else review_date.year
+
+
+def _first_field(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+class FilmMatcher:
+    """
+    Resolves a record to a canonical film via an alias table
+
+    aliases: {canonical film: [alias, ...]}. The film field is matched
+    exactly (case-insensitive); records without one (social posts) are
+    matched by searching the text for any alias.
+    """
+
+    def __init__(self, aliases):
+        self.lookup = {}
+        for film, names in aliases.items():
+            for name in [film] + list(names):
+                self.lookup[name.lower().lstrip('#')] = film
+
+        # Longest aliases first so "Frankenstein" doesn't shadow a longer title
+        patterns = sorted(self.lookup, key=len, reverse=True)
+        self.text_pattern = re.compile(
+            r'(?<!\w)#?(' + '|'.join(re.escape(p) for p in patterns) + r')(?!\w)',
+            re.IGNORECASE
+        ) if patterns else None
+
+    def match(self, film_field, text):
+        if film_field:
+            return self.lookup.get(str(film_field).lower().lstrip('#'))
+        if self.text_pattern is not None and text:
+            found = self.text_pattern.search(text)
+            if found:
+                return self.lookup[found.group(1).lower()]
+        return None
+
+
+def normalize_record(record, matcher=None, progress=None):
+    """
+    Map a raw dump record onto the review dict the scorers expect
+    """
+    text = _first_field(record, TEXT_FIELDS)
+    if not text:
+        return None
+
+    film_field = _first_field(record, FILM_FIELDS)
+    film = matcher.match(film_field, text) if matcher else film_field
+    if not film:
+        return None
+
+    raw_date = _first_field(record, DATE_FIELDS)
+    review_date = parse_date(raw_date)
+    if review_date is None and raw_date not in (None, '') and progress is not None:
+        progress.bad_dates += 1
+    year = record.get('year') or (ceremony_year_for(review_date) if review_date else None)
+    try:
+        year = int(year) if year else None
+    except (TypeError, ValueError):
+        if progress is not None:
+            progress.bad_rows += 1
+        return None
+
+    return {
+        'id': _first_field(record, ID_FIELDS),
+        'year': year,
+        'film': film,
+        'aspect': record.get('aspect', 'general'),
+        'date': review_date,
+        'review': str(text),
+    }
+
+
+def stream_reviews(paths, aliases=None, start_date=None, end_date=None,
+                   chunk_size=10000, progress=None):
+    """
+    Yield lists of at most chunk_size review dicts from the given dumps,
+    filtered by film alias and [start_date, end_date] as they stream
+    """
+    progress = progress or IngestProgress()
+    matcher = FilmMatcher(aliases) if aliases else None
+
+    chunk = []
+    for record in iter_records(paths, progress):
+        review = normalize_record(record, matcher, progress)
+        if review is None:
+            continue
+
+        if start_date or end_date:
+            if review['date'] is None:
+                continue
+            if start_date and review['date'] < start_date:
+                continue
+            if end_date and review['date'] > end_date:
+                continue
+
+        progress.rows_kept += 1
+        chunk.append(review)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+    progress.report(final=True)
+
+
+def ingest_and_score(paths, aliases=None, start_date=None, end_date=None,
+                     chunk_size=10000, n_workers=None,
+                     output_path='data/external/sentiment_scores_streamed.csv'):
+    """
+    Stream dumps straight into the sharded sentiment scorer
+    """
+    from sharded_sentiment import aggregates_to_film_sentiment, run_sharded_sentiment
+
+    print("=" * 50)
+    print("STREAMING REVIEW INGESTION")
+    print("=" * 50)
+
+    paths = [p for p in paths if os.path.isfile(p)]
+    if not paths:
+        print("❌ No dump files found")
+        return None
+
+    total_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+    print(f"\n📂 {len(paths)} dump file(s), {total_mb:,.1f} MB on disk")
+
+    chunks = stream_reviews(paths, aliases, start_date, end_date, chunk_size)
+    reviews = itertools.chain.from_iterable(chunks)
+
+    totals = run_sharded_sentiment(reviews, n_workers=n_workers, chunk_size=chunk_size)
+    film_sentiment = aggregates_to_film_sentiment(totals)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    film_sentiment.to_csv(output_path, index=False)
+    print(f"\n💾 Saved film sentiment to {output_path}")
+
+    return film_sentiment
+
+
+if __name__ == "__main__":
+    from analyze_all_categories_2026 import TECHNICAL_REVIEWS
+
+    dump_paths = sys.argv[1:] or sorted(glob.glob(DEFAULT_DUMP_GLOB))
+    film_aliases = {film: [] for film in TECHNICAL_REVIEWS}
+    ingest_and_score(dump_paths, aliases=film_aliases, start_date=date(2025, 9, 1))
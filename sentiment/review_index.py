@@ -0,0 +1,251 @@
+"""
+Review Corpus Inverted Index
+Term -> posting list of review ids, plus (film, aspect) -> date-sorted
+postings, built incrementally as reviews are ingested. Answers queries like
+"film=Sinners, aspect=score, last 30 days" without rescanning the corpus
+"""
+
+import bisect
+import hashlib
+import os
+import pickle
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+
+INDEX_PATH = 'data/cache/review_index.pkl'
+
+# Aspect names match the categories in analyze_all_categories_2026.py
+ASPECT_KEYWORDS = {
+    'cinematography': ['cinematography', 'cinematographer', 'shot', 'shots', 'frame', 'frames', 'camera', 'lensing'],
+    'editing': ['editing', 'edited', 'editor', 'cutting', 'pacing', 'paced'],
+    'production_design': ['production design', 'set', 'sets', 'world-building', 'period detail'],
+    'costume_design': ['costume', 'costumes', 'wardrobe'],
+    'makeup': ['makeup', 'prosthetics', 'hair', 'hairstyling'],
+    'vfx': ['vfx', 'visual effects', 'cgi', 'effects'],
+    'sound': ['sound', 'audio', 'mixing', 'sound design'],
+    'score': ['score', 'music', 'soundtrack', 'composer'],
+    'acting': ['performance', 'performances', 'acting', 'cast'],
+    'screenplay': ['screenplay', 'script', 'dialogue', 'writing'],
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'in', 'is',
+    'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'with',
+}
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_ASPECT_PATTERNS = {
+    aspect: re.compile(r'\b(' + '|'.join(re.escape(k) for k in keywords) + r')\b')
+    for aspect, keywords in ASPECT_KEYWORDS.items()
+}
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def review_key(review):
+    """
+    Dedup key of a review: its dump id when it has one, else film + text
+    """
+    if review.get('id') is not None:
+        return f"id:{review['id']}"
+    payload = f"{review['film'].lower()}\0{review['review']}".encode()
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def infer_aspects(text):
+    """
+    Aspects a review talks about, from keyword matches ('general' if none)
+    """
+    lowered = text.lower()
+    aspects = [aspect for aspect, pattern in _ASPECT_PATTERNS.items() if pattern.search(lowered)]
+    return aspects or ['general']
+
+
+class ReviewIndex:
+    """
+    Append-only inverted index over scored reviews
+    """
+
+    def __init__(self):
+        self.reviews = []          # id -> (film, date ordinal, vader compound, text)
+        self.postings = {}         # term -> [review id, ...] (ids ascending)
+        self.film_aspect = {}      # (film lower, aspect) -> ([date ordinals], [review ids]) sorted by date
+        self.films = {}            # film lower -> display name
+        self.seen = set()          # review_key() of every indexed review
+
+    def add_reviews(self, reviews, vader=None):
+        """
+        Index a batch of review dicts (film, review, optional id / date /
+        aspect / vader_compound). Cost is proportional to the batch only;
+        reviews already in the index are skipped.
+        """
+        fresh = []
+        for review in reviews:
+            key = review_key(review)
+            if key not in self.seen:
+                self.seen.add(key)
+                fresh.append(review)
+        reviews = fresh
+
+        if vader is None and any('vader_compound' not in r for r in reviews):
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            vader = SentimentIntensityAnalyzer()
+
+        for review in reviews:
+            text = review['review']
+            film = review['film']
+            score = review.get('vader_compound')
+            if score is None:
+                score = vader.polarity_scores(text)['compound']
+            review_date = review.get('date')
+            ordinal = review_date.toordinal() if isinstance(review_date, date) else 0
+
+            review_id = len(self.reviews)
+            self.reviews.append((film, ordinal, score, text))
+            self.films[film.lower()] = film
+
+            for term in set(tokenize(text)):
+                self.postings.setdefault(term, []).append(review_id)
+
+            aspects = set(infer_aspects(text))
+            if review.get('aspect') and review['aspect'] != 'general':
+                aspects.add(review['aspect'])
+            aspects.add('all')
+
+            for aspect in aspects:
+                dates, ids = self.film_aspect.setdefault((film.lower(), aspect), ([], []))
+                if not dates or ordinal >= dates[-1]:
+                    dates.append(ordinal)
+                    ids.append(review_id)
+                else:  # out-of-order arrival
+                    pos = bisect.bisect_right(dates, ordinal)
+                    dates.insert(pos, ordinal)
+                    ids.insert(pos, review_id)
+
+        return self
+
+    def _candidate_ids(self, film, aspect, start, end):
+        keys = ([(film.lower(), aspect)] if film else
+                [k for k in self.film_aspect if k[1] == aspect])
+        ids = []
+        for key in keys:
+            if key not in self.film_aspect:
+                continue
+            dates, key_ids = self.film_aspect[key]
+            lo = bisect.bisect_left(dates, start)
+            hi = bisect.bisect_right(dates, end)
+            ids.extend(key_ids[lo:hi])
+        return ids
+
+    def query(self, film=None, aspect='all', days=None, as_of=None, terms=None, n_snippets=3):
+        """
+        Aggregate sentiment (and sample snippets) for matching reviews
+        """
+        start_time = time.perf_counter()
+
+        if days or as_of:
+            end = (as_of or date.today()).toordinal()
+        else:
+            end = date.max.toordinal()
+        start = end - days + 1 if days else 0
+
+        ids = self._candidate_ids(film, aspect, start, end)
+        for term in tokenize(' '.join(terms or [])):
+            ids = sorted(set(ids).intersection(self.postings.get(term, [])))
+
+        scores = [self.reviews[i][2] for i in ids]
+        ranked = sorted(ids, key=lambda i: self.reviews[i][2])
+
+        def snippet(i):
+            film_name, ordinal, score, text = self.reviews[i]
+            return {
+                'film': film_name,
+                'date': date.fromordinal(ordinal).isoformat() if ordinal else None,
+                'vader_compound': score,
+                'snippet': text if len(text) <= 200 else text[:197] + '...',
+            }
+
+        return {
+            'film': self.films.get(film.lower(), film) if film else None,
+            'aspect': aspect,
+            'num_reviews': len(ids),
+            'avg_vader': sum(scores) / len(scores) if scores else None,
+            'share_positive': sum(s > 0.05 for s in scores) / len(scores) if scores else None,
+            'most_positive': [snippet(i) for i in reversed(ranked) if self.reviews[i][2] > 0][:n_snippets],
+            'most_negative': [snippet(i) for i in ranked[:n_snippets] if self.reviews[i][2] < 0],
+            'query_ms': (time.perf_counter() - start_time) * 1000,
+        }
+
+    def aspect_summary(self, film, days=None, as_of=None):
+        """
+        One query per aspect the film has reviews for
+        """
+        aspects = sorted(a for f, a in self.film_aspect if f == film.lower() and a != 'all')
+        return [self.query(film, aspect, days, as_of, n_snippets=1) for aspect in aspects]
+
+    def save(self, path=INDEX_PATH):
+        # Plain containers only, so the file loads no matter which script
+        # (or __main__) defined the class
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path=INDEX_PATH):
+        index = ReviewIndex()
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                index.__dict__.update(pickle.load(f))
+        return index
+
+
+def index_dumps(paths, aliases=None, start_date=None, end_date=None, path=INDEX_PATH):
+    """
+    Stream dumps into the saved index (reviews not indexed yet are appended)
+    """
+    from ingest_reviews import stream_reviews
+
+    print("=" * 50)
+    print("REVIEW INDEX UPDATE")
+    print("=" * 50)
+
+    index = ReviewIndex.load(path)
+    before = len(index.reviews)
+    for chunk in stream_reviews(paths, aliases, start_date, end_date):
+        index.add_reviews(chunk)
+    index.save(path)
+
+    print(f"\n✅ Indexed {len(index.reviews) - before:,} new reviews "
+          f"({len(index.reviews):,} total, {len(index.postings):,} terms)")
+    print(f"💾 Saved index to {path}")
+
+    return index
+
+
+if __name__ == "__main__":
+    from analyze_all_categories_2026 import TECHNICAL_REVIEWS
+
+    if len(sys.argv) > 1:
+        index = index_dumps(sys.argv[1:], aliases={film: [] for film in TECHNICAL_REVIEWS})
+    else:
+        print("📝 No dumps given - indexing the sample technical reviews")
+        index = ReviewIndex()
+        index.add_reviews([
+            {'film': film, 'aspect': aspect, 'review': text, 'date': date.today() - timedelta(days=i)}
+            for film, film_reviews in TECHNICAL_REVIEWS.items()
+            for aspect, texts in film_reviews.items()
+            for i, text in enumerate(texts)
+        ])
+
+    result = index.query('Sinners', 'score', days=30)
+    print(f"\n🔍 film=Sinners, aspect=score, last 30 days "
+          f"({result['num_reviews']} reviews, {result['query_ms']:.2f} ms)")
+    if result['num_reviews']:
+        print(f"   Avg sentiment: {result['avg_vader']:.3f}")
+        for s in result['most_positive']:
+            print(f"   ✅ {s['snippet']}")
@@ -0,0 +1,66 @@
+"""
+Sentiment Score Cache
+SQLite-backed cache of per-review scores keyed by (backend, text hash),
+so re-running a scorer over an overlapping corpus only scores new text
+"""
+
+import hashlib
+import os
+import sqlite3
+
+
+DEFAULT_CACHE_PATH = 'data/cache/sentiment_cache.sqlite'
+
+
+def text_key(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """
+    get_many / put_many over a single SQLite table
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " backend TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " score REAL NOT NULL,"
+            " PRIMARY KEY (backend, text_hash))"
+        )
+        self.conn.commit()
+
+    def get_many(self, backend, texts):
+        """
+        Return {text: score} for the texts already cached under backend
+        """
+        by_key = {text_key(t): t for t in texts}
+        found = {}
+        keys = list(by_key)
+        # SQLite caps bound parameters, so look up in slices
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = self.conn.execute(
+                f"SELECT text_hash, score FROM scores WHERE backend = ? AND text_hash IN ({placeholders})",
+                [backend] + batch
+            )
+            for key, score in rows:
+                found[by_key[key]] = score
+        return found
+
+    def put_many(self, backend, scores):
+        """
+        Store {text: score} under backend
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO scores (backend, text_hash, score) VALUES (?, ?, ?)",
+            [(backend, text_key(t), float(s)) for t, s in scores.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,234 @@
+"""
+Incremental Sentiment Momentum Features
+Keeps rolling 7/30/90-day sentiment windows and an exponentially weighted
+momentum per film, updated from each daily batch of reviews only
+"""
+
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+import pandas as pd
+
+from analyze_sentiment import score_reviews
+
+
+WINDOWS = [7, 30, 90]
+
+# Half-lives (days) of the fast and slow exponentially weighted means;
+# momentum = fast - slow, so > 0 means sentiment is improving
+FAST_HALF_LIFE = 7
+SLOW_HALF_LIFE = 30
+
+STATE_PATH = 'data/external/sentiment_momentum_state.json'
+FEATURES_PATH = 'data/external/sentiment_momentum.csv'
+TIMESERIES_PATH = 'data/external/sentiment_momentum_timeseries.csv'
+
+
+def load_state(path=STATE_PATH):
+    """
+    Load the running aggregates (empty state on first run)
+    """
+    if not os.path.exists(path):
+        return {'as_of': None, 'films': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(state, f)
+
+
+def _new_film_state():
+    return {
+        'daily': {},                                   # ISO date -> [count, sum]
+        'windows': {str(w): [0, 0.0] for w in WINDOWS},  # running [count, sum]
+        'ewm_fast': None,
+        'ewm_slow': None,
+        'last_review_date': None,
+        'ewm_before': [None, None, None],              # EWMs and date before the last day
+    }
+
+
+def _ewm_step(previous, value, days_elapsed, half_life):
+    if previous is None:
+        return value
+    alpha = 1 - 0.5 ** (max(days_elapsed, 1) / half_life)
+    return alpha * value + (1 - alpha) * previous
+
+
+def _days_in_range(daily, after, up_to):
+    """
+    ISO dates of stored buckets in (after, up_to], walking whichever is
+    shorter: the date range or the stored buckets
+    """
+    span = (up_to - after).days
+    if span > len(daily):
+        return [d for d in daily if after < date.fromisoformat(d) <= up_to]
+    days = (after + timedelta(days=i) for i in range(1, span + 1))
+    return [d.isoformat() for d in days if d.isoformat() in daily]
+
+
+def advance_clock(state, new_as_of):
+    """
+    Move every window forward to new_as_of, subtracting only the days that
+    just fell out of each window
+    """
+    old_as_of = date.fromisoformat(state['as_of']) if state['as_of'] else None
+    if old_as_of is not None and new_as_of <= old_as_of:
+        return
+    state['as_of'] = new_as_of.isoformat()
+    if old_as_of is None:
+        return
+
+    for film_state in state['films'].values():
+        daily = film_state['daily']
+        for w in WINDOWS:
+            window = film_state['windows'][str(w)]
+            old_cutoff = old_as_of - timedelta(days=w)
+            new_cutoff = new_as_of - timedelta(days=w)
+            for d in _days_in_range(daily, old_cutoff, new_cutoff):
+                count, total = daily[d]
+                window[0] -= count
+                window[1] -= total
+
+        # Buckets older than the longest window are never needed again
+        oldest_kept = new_as_of - timedelta(days=max(WINDOWS))
+        for d in [d for d in daily if date.fromisoformat(d) <= oldest_kept]:
+            del daily[d]
+
+
+def update_with_daily_batch(state, batch_date, film_totals):
+    """
+    Fold one day's per-film totals into the state
+
+    film_totals: {(year, film): (count, sum of VADER compound)}
+    Work is proportional to the batch, never to the stored history.
+    """
+    as_of = date.fromisoformat(state['as_of']) if state['as_of'] else None
+    late = as_of is not None and batch_date < as_of
+    if not late:
+        advance_clock(state, batch_date)
+        as_of = batch_date
+
+    day_key = batch_date.isoformat()
+    for (year, film), (count, total) in film_totals.items():
+        key = f"{year}|{film}"
+        film_state = state['films'].setdefault(key, _new_film_state())
+
+        if (as_of - batch_date).days >= max(WINDOWS):
+            continue  # too old to land in any window
+
+        bucket = film_state['daily'].setdefault(day_key, [0, 0.0])
+        bucket[0] += count
+        bucket[1] += total
+
+        for w in WINDOWS:
+            if (as_of - batch_date).days < w:
+                film_state['windows'][str(w)][0] += count
+                film_state['windows'][str(w)][1] += total
+
+        # Late data still counts in the windows but can't rewrite the EWM
+        if late:
+            continue
+        if film_state['last_review_date'] == day_key and 'ewm_before' in film_state:
+            # Another batch for the same day: redo the day's step from the
+            # state before it with the merged bucket, instead of decaying again
+            fast, slow, last = film_state['ewm_before']
+        else:
+            fast, slow, last = film_state['ewm_fast'], film_state['ewm_slow'], film_state['last_review_date']
+            film_state['ewm_before'] = [fast, slow, last]
+        day_mean = bucket[1] / bucket[0]
+        elapsed = (batch_date - date.fromisoformat(last)).days if last else 1
+        film_state['ewm_fast'] = _ewm_step(fast, day_mean, elapsed, FAST_HALF_LIFE)
+        film_state['ewm_slow'] = _ewm_step(slow, day_mean, elapsed, SLOW_HALF_LIFE)
+        film_state['last_review_date'] = day_key
+
+    return state
+
+
+def film_totals_from_reviews(reviews):
+    """
+    Score review dicts (year, film, review) and total them per film;
+    reviews without a ceremony year are left out
+    """
+    totals = {}
+    reviews = [r for r in reviews if r.get('year') is not None]
+    scores = score_reviews([r['review'] for r in reviews])
+    for review, score in zip(reviews, scores):
+        key = (review['year'], review['film'])
+        count, total = totals.get(key, (0, 0.0))
+        totals[key] = (count + 1, total + score['vader_compound'])
+    return totals
+
+
+def momentum_features(state):
+    """
+    One row per film with the current window means and momentum
+    """
+    rows = []
+    for key, film_state in state['films'].items():
+        year, film = key.split('|', 1)
+        row = {'year': int(year), 'film': film}
+        for w in WINDOWS:
+            count, total = film_state['windows'][str(w)]
+            row[f'reviews_{w}d'] = count
+            row[f'vader_{w}d'] = total / count if count else None
+        fast, slow = film_state['ewm_fast'], film_state['ewm_slow']
+        row['vader_ewm_fast'] = fast
+        row['vader_ewm_slow'] = slow
+        row['sentiment_momentum'] = fast - slow if fast is not None else None
+        row['momentum_as_of'] = state['as_of']
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def append_timeseries(features, path=TIMESERIES_PATH):
+    """
+    Append today's feature rows to the time series (never rewritten)
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    features.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+
+def process_daily_batch(batch_date, reviews):
+    """
+    Load state, apply one day's reviews, save features + time series
+    """
+    print("=" * 50)
+    print(f"SENTIMENT MOMENTUM UPDATE - {batch_date}")
+    print("=" * 50)
+
+    state = load_state()
+    totals = film_totals_from_reviews(reviews)
+    update_with_daily_batch(state, batch_date, totals)
+    save_state(state)
+
+    features = momentum_features(state)
+    features.to_csv(FEATURES_PATH, index=False)
+    if not features.empty:
+        touched = {f"{year}|{film}" for year, film in totals}
+        append_timeseries(features[(features['year'].astype(str) + '|' + features['film']).isin(touched)])
+
+    print(f"\n✅ {len(reviews)} reviews across {len(totals)} films")
+    print(f"💾 Features saved to {FEATURES_PATH}")
+    if not features.empty:
+        print("\n📈 Momentum (fast - slow EWM):")
+        print(features.sort_values('sentiment_momentum', ascending=False)
+              [['film', 'vader_7d', 'vader_30d', 'sentiment_momentum']].to_string(index=False))
+
+    return features
+
+
+if __name__ == "__main__":
+    # Usage: python sentiment/sentiment_momentum.py YYYY-MM-DD dump [dump ...]
+    from ingest_reviews import stream_reviews
+    from analyze_all_categories_2026 import TECHNICAL_REVIEWS
+
+    day = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else date.today()
+    aliases = {film: [] for film in TECHNICAL_REVIEWS}
+    day_reviews = [r for chunk in stream_reviews(sys.argv[2:], aliases, day, day) for r in chunk]
+    process_daily_batch(day, day_reviews)
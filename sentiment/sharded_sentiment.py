@@ -0,0 +1,244 @@
+"""
+Sharded Multi-Process Sentiment Scoring
+Spreads a review corpus across a process pool, sharded by film, and merges
+per-film partial aggregates into the film_sentiment table
+"""
+
+import math
+import os
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from analyze_sentiment import categorize_sentiment, score_reviews
+
+
+# Scores kept per (year, film, aspect), in this order
+METRICS = ['textblob_polarity', 'vader_compound', 'vader_positive', 'vader_negative']
+
+# Column names used by analyze_reviews_sentiment() for each metric mean
+FILM_SENTIMENT_COLUMNS = {
+    'textblob_polarity': 'avg_textblob_sentiment',
+    'vader_compound': 'avg_vader_sentiment',
+    'vader_positive': 'avg_positive_score',
+    'vader_negative': 'avg_negative_score',
+}
+
+_worker_vader = None
+
+
+class PartialAggregate:
+    """
+    Mergeable count / sum / sum-of-squares for one group of reviews
+    """
+    __slots__ = ('count', 'sums', 'sumsq')
+
+    def __init__(self):
+        self.count = 0
+        self.sums = [0.0] * len(METRICS)
+        self.sumsq = [0.0] * len(METRICS)
+
+    def add(self, scores):
+        self.count += 1
+        for i, metric in enumerate(METRICS):
+            value = scores[metric]
+            self.sums[i] += value
+            self.sumsq[i] += value * value
+
+    def merge(self, other):
+        self.count += other.count
+        for i in range(len(METRICS)):
+            self.sums[i] += other.sums[i]
+            self.sumsq[i] += other.sumsq[i]
+        return self
+
+    def mean(self, metric):
+        return self.sums[METRICS.index(metric)] / self.count
+
+    def std(self, metric):
+        i = METRICS.index(metric)
+        mean = self.sums[i] / self.count
+        return math.sqrt(max(self.sumsq[i] / self.count - mean * mean, 0.0))
+
+
+def merge_aggregates(totals, partials):
+    """
+    Fold one worker's partial aggregates into the running totals
+    """
+    for key, partial in partials.items():
+        if key in totals:
+            totals[key].merge(partial)
+        else:
+            totals[key] = partial
+    return totals
+
+
+def shard_for_film(film, n_shards):
+    """
+    Stable shard number for a film (same film -> same shard in every run)
+    """
+    return zlib.crc32(str(film).encode('utf-8')) % n_shards
+
+
+def _init_worker():
+    global _worker_vader
+    _worker_vader = SentimentIntensityAnalyzer()
+
+
+def score_shard(reviews):
+    """
+    Score one chunk of reviews and return partial aggregates, not rows
+    """
+    texts = [r['review'] for r in reviews]
+    partials = {}
+
+    for review, scores in zip(reviews, score_reviews(texts, vader=_worker_vader)):
+        key = (review.get('year'), review['film'], review.get('aspect', 'general'))
+        if key not in partials:
+            partials[key] = PartialAggregate()
+        partials[key].add(scores)
+
+    return partials
+
+
+def run_sharded_sentiment(reviews, n_workers=None, chunk_size=2000, max_in_flight=None):
+    """
+    Score an iterable of review dicts (year, film, review, optional aspect)
+    on a process pool
+
+    Reviews are bucketed by film and sent out in chunks of chunk_size, with at
+    most max_in_flight chunks outstanding, so memory stays flat no matter how
+    large the corpus is. Returns {(year, film, aspect): PartialAggregate}.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * n_workers
+
+    buffers = [[] for _ in range(n_workers)]
+    totals = {}
+    pending = set()
+    n_reviews = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker) as pool:
+
+        def submit(chunk):
+            nonlocal pending
+            while len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge_aggregates(totals, future.result())
+            pending.add(pool.submit(score_shard, chunk))
+
+        for review in reviews:
+            n_reviews += 1
+            shard = shard_for_film(review['film'], n_workers)
+            buffers[shard].append(review)
+            if len(buffers[shard]) >= chunk_size:
+                submit(buffers[shard])
+                buffers[shard] = []
+
+        for chunk in buffers:
+            if chunk:
+                submit(chunk)
+
+        for future in pending:
+            merge_aggregates(totals, future.result())
+
+    elapsed = time.perf_counter() - start
+    rate = n_reviews / elapsed if elapsed > 0 else float('inf')
+    print(f"✅ Scored {n_reviews} reviews on {n_workers} workers "
+          f"in {elapsed:.2f}s ({rate:,.0f} reviews/sec)")
+
+    return totals
+
+
+def aggregates_to_film_sentiment(totals):
+    """
+    Collapse aspects and build the table analyze_reviews_sentiment() writes
+    """
+    films = {}
+    for (year, film, aspect), partial in totals.items():
+        key = (year, film)
+        if key not in films:
+            films[key] = PartialAggregate()
+        films[key].merge(partial)
+
+    rows = []
+    for (year, film), agg in films.items():
+        row = {'year': year, 'film': film}
+        for metric, column in FILM_SENTIMENT_COLUMNS.items():
+            row[column] = agg.mean(metric)
+        # Spread of review sentiment: how divided the critics are
+        row['std_vader_sentiment'] = agg.std('vader_compound')
+        row['num_reviews'] = agg.count
+        rows.append(row)
+
+    columns = ['year', 'film'] + list(FILM_SENTIMENT_COLUMNS.values()) + ['std_vader_sentiment', 'num_reviews']
+    film_sentiment = pd.DataFrame(rows, columns=columns)
+    film_sentiment['sentiment_category'] = film_sentiment['avg_vader_sentiment'].apply(categorize_sentiment)
+
+    return film_sentiment.sort_values(['year', 'film']).reset_index(drop=True)
+
+
+def aggregates_to_category_sentiment(totals):
+    """
+    Per (film, aspect) table in the sentiment_all_categories_2026.csv layout
+    """
+    rows = []
+    for (year, film, aspect), agg in totals.items():
+        rows.append({
+            'film': film,
+            'category': aspect,
+            'avg_textblob': agg.mean('textblob_polarity'),
+            'avg_vader': agg.mean('vader_compound'),
+            'std_vader': agg.std('vader_compound'),
+            'sentiment_label': categorize_sentiment(agg.mean('vader_compound')),
+            'num_reviews': agg.count,
+        })
+
+    return pd.DataFrame(rows).sort_values(['film', 'category']).reset_index(drop=True)
+
+
+def iter_sample_reviews():
+    """
+    Flatten the technical sample reviews into review dicts
+    """
+    from analyze_all_categories_2026 import TECHNICAL_REVIEWS
+
+    for film, film_reviews in TECHNICAL_REVIEWS.items():
+        for aspect, texts in film_reviews.items():
+            for text in texts:
+                yield {'year': 2026, 'film': film, 'aspect': aspect, 'review': text}
+
+
+def analyze_sharded_sentiment(reviews=None, output_path='data/external/sentiment_scores_sharded.csv',
+                              n_workers=None, chunk_size=2000):
+    """
+    Run the sharded scorer and save the merged film_sentiment table
+    """
+    print("=" * 50)
+    print("SHARDED SENTIMENT ANALYSIS")
+    print("=" * 50)
+
+    if reviews is None:
+        print("\n📝 No corpus given - using the sample technical reviews")
+        reviews = iter_sample_reviews()
+
+    totals = run_sharded_sentiment(reviews, n_workers=n_workers, chunk_size=chunk_size)
+    film_sentiment = aggregates_to_film_sentiment(totals)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    film_sentiment.to_csv(output_path, index=False)
+    print(f"\n💾 Saved film sentiment to {output_path}")
+
+    print("\n📊 Film Sentiment:")
+    print(film_sentiment.sort_values('avg_vader_sentiment', ascending=False).to_string(index=False))
+
+    return film_sentiment
+
+
+if __name__ == "__main__":
+    analyze_sharded_sentiment()
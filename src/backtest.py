@@ -0,0 +1,392 @@
+"""
+Rolling-Origin Backtesting Harness
+Evaluates any registered model on every ceremony year (rolling-origin or
+leave-one-year-out) instead of the single 2022-2024 split. Folds run in
+parallel on a process pool that shares one memory-mapped feature matrix,
+and each (model config, fold) result is cached on disk
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import BaseEnsemble, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+
+from conditional_logit import ConditionalLogit
+from feature_registry import BASIC_FEATURES, ENHANCED_FEATURES
+from feature_store import FeatureStore
+from model_backends import XGBOOST_AVAILABLE, GroupedBoosting
+from model_two_tier import TIER1_DEFAULTS, TIER2_DEFAULTS
+from retrain_with_full_gg import DEFAULTS as FULL_GG_DEFAULTS
+
+
+CACHE_ROOT = 'data/cache/backtest'
+
+FIRST_YEAR = 1995
+FULL_HISTORY_FIRST_YEAR = 1950
+MIN_TRAIN_YEARS = 5
+
+ID_COLUMNS = ['year_ceremony', 'category', 'nominee', 'film', 'winner']
+
+
+# ==================== MODEL CONFIGS ====================
+
+MODELS = {}
+
+
+def register_model(name, source, features, estimator, params):
+    """
+    Make a model available to the backtest (and everything built on it).
+    `estimator` is a scikit-learn style class, built as estimator(**params).
+    """
+    MODELS[name] = {
+        'name': name,
+        'source': source,
+        'features': list(features),
+        'estimator': estimator,
+        'params': dict(params),
+    }
+    return MODELS[name]
+
+
+def config_key(config):
+    """
+    Hash of everything that changes a model's predictions
+    """
+    estimator = config['estimator']
+    payload = {
+        'source': config['source'],
+        'features': config['features'],
+        'estimator': f"{estimator.__module__}.{estimator.__qualname__}",
+        'params': config['params'],
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+# Default settings of the training scripts
+register_model('tier1_basic', 'best_picture', BASIC_FEATURES, RandomForestClassifier, TIER1_DEFAULTS)
+register_model('tier2_enhanced', 'best_picture', ENHANCED_FEATURES, RandomForestClassifier, TIER2_DEFAULTS)
+register_model('full_gg', 'best_picture_full_gg', ENHANCED_FEATURES, RandomForestClassifier, FULL_GG_DEFAULTS)
+register_model('logit_basic', 'best_picture', BASIC_FEATURES, LogisticRegression, {
+    'class_weight': 'balanced', 'max_iter': 1000,
+})
+register_model('clogit_basic', 'best_picture', BASIC_FEATURES, ConditionalLogit, {'C': 1.0})
+register_model('clogit_enhanced', 'best_picture_full_gg', ENHANCED_FEATURES, ConditionalLogit, {'C': 1.0})
+register_model('hgb_enhanced', 'best_picture', ENHANCED_FEATURES, GroupedBoosting, {
+    'backend': 'hist_gb', 'learning_rate': 0.05, 'max_depth': 3,
+})
+if XGBOOST_AVAILABLE:
+    register_model('xgb_enhanced', 'best_picture', ENHANCED_FEATURES, GroupedBoosting, {
+        'backend': 'xgboost', 'learning_rate': 0.05, 'max_depth': 3,
+    })
+    register_model('xgb_rank_enhanced', 'best_picture', ENHANCED_FEATURES, GroupedBoosting, {
+        'backend': 'xgboost', 'objective': 'rank', 'learning_rate': 0.05, 'max_depth': 3,
+    })
+
+
+# ==================== SHARED FEATURE MATRIX ====================
+
+def matrix_dir(source, features):
+    """
+    Directory of the memory-mapped matrix for one store version + feature
+    list. The key covers every partition's contents, so added years and
+    recorded results give a new matrix (and new fold results).
+    """
+    key = hashlib.sha1(json.dumps([FeatureStore(source).content_hash(), list(features)]).encode())
+    return os.path.join(CACHE_ROOT, 'matrix', f"{source}_{key.hexdigest()[:12]}")
+
+
+def build_matrix(source, features):
+    """
+    Write X / y / year / race as .npy files (once) and return their directory
+    """
+    path = matrix_dir(source, features)
+    if os.path.exists(os.path.join(path, 'ids.parquet')):
+        return path
+
+    df = FeatureStore(source).load()
+    df = df.dropna(subset=list(features)).sort_values(['year_ceremony', 'category']).reset_index(drop=True)
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'X.npy'), df[list(features)].to_numpy(dtype=np.float64))
+    np.save(os.path.join(path, 'y.npy'), df['winner'].to_numpy(dtype=np.int8))
+    np.save(os.path.join(path, 'year.npy'), df['year_ceremony'].to_numpy(dtype=np.int32))
+    np.save(os.path.join(path, 'race.npy'), pd.factorize(
+        pd.MultiIndex.from_frame(df[['year_ceremony', 'category']]))[0].astype(np.int32))
+    df[ID_COLUMNS].to_parquet(os.path.join(path, 'ids.parquet'), index=False)
+    return path
+
+
+def open_matrix(path):
+    """
+    Read-only memory maps - every worker shares the same pages
+    """
+    return {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+            for name in ['X', 'y', 'year', 'race']}
+
+
+# ==================== FOLDS ====================
+
+def completed_years(df, year_column='year_ceremony', winner_column='winner'):
+    """
+    Years whose ceremony has happened (at least one winner recorded)
+    """
+    won = df.groupby(year_column)[winner_column].max()
+    return sorted(int(year) for year, value in won.items() if value > 0)
+
+
+def make_folds(years, mode='rolling', first_year=FIRST_YEAR, min_train_years=MIN_TRAIN_YEARS):
+    """
+    rolling: train on every year before the test year
+    loyo:    train on every other year
+    years: completed years only - a year without a winner can't be scored
+    """
+    years = sorted(set(int(y) for y in years))
+    folds = []
+    for i, year in enumerate(years):
+        if year < first_year:
+            continue
+        if mode == 'rolling':
+            if i < min_train_years:
+                continue
+        elif mode != 'loyo':
+            raise ValueError(f"Unknown backtest mode '{mode}' (expected 'rolling' or 'loyo')")
+        folds.append({'mode': mode, 'test_year': year})
+    return folds
+
+
+def train_mask(years, fold):
+    if fold['mode'] == 'rolling':
+        return years < fold['test_year']
+    return years != fold['test_year']
+
+
+# ==================== WORKERS ====================
+
+_MATRIX = {}
+
+
+def _init_worker(path):
+    _MATRIX.update(open_matrix(path))
+
+
+def run_fold(config, fold, matrix=None):
+    """
+    Fit on the fold's training years and predict its test year.
+    Returns test-row positions and probabilities.
+    """
+    m = matrix or _MATRIX
+    years = np.asarray(m['year'])
+    train = train_mask(years, fold)
+    test = years == fold['test_year']
+
+    y_train = np.asarray(m['y'][train])
+    if not test.any() or y_train.sum() == 0:
+        return None
+
+    params = dict(config['params'])
+    if issubclass(config['estimator'], (BaseEnsemble, GroupedBoosting)):
+        params.setdefault('n_jobs', 1)  # parallelism comes from the fold pool
+
+    # Race-level models (conditional logit) also need each row's race
+    race_aware = getattr(config['estimator'], 'race_aware', False)
+    fit_args = {'groups': np.asarray(m['race'][train])} if race_aware else {}
+    predict_args = {'groups': np.asarray(m['race'][test])} if race_aware else {}
+
+    start = time.perf_counter()
+    model = config['estimator'](**params)
+    model.fit(np.asarray(m['X'][train]), y_train, **fit_args)
+    probs = model.predict_proba(np.asarray(m['X'][test]), **predict_args)[:, 1]
+
+    return {
+        'fold': fold,
+        'rows': np.flatnonzero(test).tolist(),
+        'probability': probs.tolist(),
+        'fit_seconds': time.perf_counter() - start,
+    }
+
+
+def _run_fold_task(args):
+    config, fold = args
+    return run_fold(config, fold)
+
+
+# ==================== METRICS ====================
+
+def race_normalize(df, column='probability'):
+    """
+    Scale probabilities to sum to 1 within each race
+    """
+    totals = df.groupby(['year_ceremony', 'category'])[column].transform('sum')
+    return np.where(totals > 0, df[column] / totals.where(totals > 0, 1), 0)
+
+
+def race_metrics(oof):
+    """
+    Metrics over out-of-fold predictions: AUC on raw probabilities,
+    top-1 accuracy and race log-loss on race-normalized ones
+    """
+    # Races without a recorded winner can't be scored
+    oof = oof[oof.groupby(['year_ceremony', 'category'])['winner'].transform('max') > 0].copy()
+    oof['race_probability'] = race_normalize(oof)
+
+    races = oof.groupby(['year_ceremony', 'category'])
+    winners = oof[oof['winner'] == 1]
+    top_pick = oof.loc[races['race_probability'].idxmax()]
+
+    eps = 1e-6
+    winner_probs = np.clip(winners['race_probability'].to_numpy(), eps, 1)
+    metrics = {
+        'races': races.ngroups,
+        'top1_accuracy': float(top_pick['winner'].mean()),
+        'race_log_loss': float(-np.log(winner_probs).mean()),
+        'brier': float(((oof['race_probability'] - oof['winner']) ** 2).mean()),
+    }
+    try:
+        metrics['roc_auc'] = float(roc_auc_score(oof['winner'], oof['probability']))
+    except ValueError:
+        metrics['roc_auc'] = float('nan')
+    return metrics
+
+
+# ==================== HARNESS ====================
+
+def result_path(config, fold, matrix_path):
+    name = f"{config_key(config)}_{fold['mode']}_{fold['test_year']}.json"
+    return os.path.join(CACHE_ROOT, 'results', os.path.basename(matrix_path), name)
+
+
+def load_result(config, fold, path):
+    """
+    Cached result of one (config, fold), or None
+    """
+    cached = result_path(config, fold, path)
+    if not os.path.exists(cached):
+        return None
+    with open(cached) as f:
+        return json.load(f)
+
+
+def save_result(config, fold, path, result):
+    """
+    Cache one fold's result (an empty one when the fold couldn't be fitted)
+    """
+    result = result or {'fold': fold, 'rows': [], 'probability': [], 'fit_seconds': 0.0}
+    cached = result_path(config, fold, path)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    with open(cached, 'w') as f:
+        json.dump(result, f)
+    return result
+
+
+def run_folds(tasks, path, n_workers=None, use_cache=True):
+    """
+    Run (config, fold) tasks against one shared matrix, reading and writing
+    the per-fold cache. Returns (results in task order, number cached).
+    """
+    results = [None] * len(tasks)
+    todo = []
+    for i, (config, fold) in enumerate(tasks):
+        results[i] = load_result(config, fold, path) if use_cache else None
+        if results[i] is None:
+            todo.append(i)
+
+    if todo:
+        n_workers = min(n_workers or os.cpu_count() or 1, len(todo))
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(path,)) as pool:
+                chunksize = max(1, len(todo) // (n_workers * 4))
+                fresh = list(pool.map(_run_fold_task, [tasks[i] for i in todo], chunksize=chunksize))
+        else:
+            matrix = open_matrix(path)
+            fresh = [run_fold(*tasks[i], matrix) for i in todo]
+
+        for i, result in zip(todo, fresh):
+            config, fold = tasks[i]
+            results[i] = save_result(config, fold, path, result)
+
+    return results, len(tasks) - len(todo)
+
+
+def oof_frame(results, ids):
+    """
+    Out-of-fold predictions for a set of fold results
+    """
+    rows = [r for result in results for r in result['rows']]
+    probs = [p for result in results for p in result['probability']]
+    oof = ids.iloc[rows].copy()
+    oof['probability'] = probs
+    return oof.sort_values(['year_ceremony', 'category', 'probability'],
+                           ascending=[True, True, False]).reset_index(drop=True)
+
+
+def run_backtest(model, mode='rolling', full_history=False, n_workers=None, use_cache=True, verbose=True):
+    """
+    Backtest a registered model (name or config dict). Returns
+    (metrics dict, out-of-fold predictions DataFrame).
+    """
+    config = MODELS[model] if isinstance(model, str) else model
+    path = build_matrix(config['source'], config['features'])
+    ids = pd.read_parquet(os.path.join(path, 'ids.parquet'))
+
+    first_year = FULL_HISTORY_FIRST_YEAR if full_history else FIRST_YEAR
+    folds = make_folds(completed_years(ids), mode, first_year)
+    if full_history and ids['year_ceremony'].min() > FULL_HISTORY_FIRST_YEAR and verbose:
+        print(f"   ⚠️ {config['source']} starts in {ids['year_ceremony'].min()} - "
+              f"full-history folds begin there")
+
+    start = time.perf_counter()
+    results, cached_count = run_folds([(config, fold) for fold in folds], path, n_workers, use_cache)
+
+    oof = oof_frame(results, ids)
+    metrics = race_metrics(oof) if len(oof) else {}
+    metrics.update({
+        'model': config['name'],
+        'mode': mode,
+        'folds': len(folds),
+        'cached_folds': cached_count,
+        'wall_seconds': time.perf_counter() - start,
+    })
+
+    if verbose:
+        print(f"   {config['name']:<16} {mode:<8} {metrics['folds']:>3} folds "
+              f"({metrics['cached_folds']} cached) | top-1 {metrics.get('top1_accuracy', 0):.1%} | "
+              f"log-loss {metrics.get('race_log_loss', float('nan')):.3f} | "
+              f"AUC {metrics.get('roc_auc', float('nan')):.3f} | {metrics['wall_seconds']:.1f}s")
+
+    return metrics, oof
+
+
+def backtest_all(models=None, modes=('rolling', 'loyo'), **kwargs):
+    """
+    Backtest every registered model in every mode and save a summary
+    """
+    print("=" * 70)
+    print("BACKTEST")
+    print("=" * 70)
+
+    summary = []
+    for name in models or MODELS:
+        for mode in modes:
+            metrics, oof = run_backtest(name, mode, **kwargs)
+            oof.to_csv(os.path.join(CACHE_ROOT, f'oof_{name}_{mode}.csv'), index=False)
+            summary.append(metrics)
+
+    summary = pd.DataFrame(summary)
+    summary.to_csv(os.path.join(CACHE_ROOT, 'summary.csv'), index=False)
+    print(f"\n💾 Summary saved to {os.path.join(CACHE_ROOT, 'summary.csv')}")
+    return summary
+
+
+if __name__ == "__main__":
+    # python src/backtest.py [model ...] [--full-history]
+    names = [a for a in sys.argv[1:] if not a.startswith('--')]
+    backtest_all(names or None, full_history='--full-history' in sys.argv)
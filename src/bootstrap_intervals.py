@@ -0,0 +1,238 @@
+"""
+Bootstrap Uncertainty Intervals
+Resamples whole ceremony years with replacement, refits the selected model
+once per draw in parallel workers and scores the 2026 race every time, so
+each nominee gets a probability interval and a P(rank 1) next to the point
+estimate. Workers read the training rows from the backtest's memory-mapped
+feature matrix (shared pages, nothing pickled per task)
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import BaseEnsemble
+
+from backtest import MODELS, build_matrix, open_matrix
+from feature_store import store_category
+from hyperparameter_search import tuned_params
+from model_backends import GroupedBoosting
+from race_analogs import load_prediction_race
+
+
+N_BOOTSTRAP = 1000
+INTERVAL = 0.9            # central interval: 5th - 95th percentile
+OUTPUT_FOLDER = 'data/predictions_2026'
+
+
+# ==================== DATA ====================
+
+def target_race(category='Best Picture', config=None):
+    """
+    The 2026 nominees to score, from the category's predictions CSV.
+    Raises ValueError for a category the model wasn't trained on.
+    """
+    # Every backtest source except all_categories holds Best Picture only
+    if config is not None and config['source'] != 'all_categories' and store_category(category) != 'Best Picture':
+        raise ValueError(f"{config['name']} is trained on Best Picture races only - it can't score {category}")
+    race = load_prediction_race(category)
+    if race is None:
+        raise FileNotFoundError(f"No 2026 predictions for {category} - run the prediction script first")
+    return race.reset_index(drop=True)
+
+
+def year_slices(years):
+    """
+    {year: (start, stop)} row ranges - the matrix is sorted by year
+    """
+    values, starts = np.unique(years, return_index=True)
+    stops = np.append(starts[1:], len(years))
+    return {int(y): (int(a), int(b)) for y, a, b in zip(values, starts, stops)}
+
+
+def completed_years(matrix):
+    """
+    Years with a recorded winner (the store may hold an upcoming ceremony)
+    """
+    years, y = np.asarray(matrix['year']), np.asarray(matrix['y'])
+    return np.array(sorted(int(year) for year in np.unique(years[y == 1])))
+
+
+# ==================== WORKERS ====================
+
+_MATRIX = {}
+_TARGET = {}
+
+
+def _init_worker(path, X_target, target_groups):
+    _MATRIX.update(open_matrix(path))
+    _TARGET.update({'X': X_target, 'groups': target_groups})
+
+
+def race_normalize_rows(probs, groups):
+    """
+    Scale each draw's probabilities (rows of `probs`) to sum to 1 per race
+    """
+    out = np.empty_like(probs)
+    for g in np.unique(groups):
+        cols = groups == g
+        totals = probs[:, cols].sum(axis=1, keepdims=True)
+        out[:, cols] = np.where(totals > 0, probs[:, cols] / np.where(totals > 0, totals, 1),
+                                1 / cols.sum())
+    return out
+
+
+def fit_and_score(config, params, sample_years, seed, matrix=None, target=None):
+    """
+    Fit on the rows of `sample_years` (repeats allowed) and return the
+    target rows' probabilities
+    """
+    m = matrix or _MATRIX
+    t = target or _TARGET
+
+    slices = year_slices(np.asarray(m['year']))
+    rows = np.concatenate([np.arange(*slices[y]) for y in sample_years])
+
+    params = dict(params)
+    if 'random_state' in params:
+        params['random_state'] = int(seed)
+    if issubclass(config['estimator'], (BaseEnsemble, GroupedBoosting)):
+        params['n_jobs'] = 1  # parallelism comes from the bootstrap pool
+
+    model = config['estimator'](**params)
+    X, y = np.asarray(m['X'][rows]), np.asarray(m['y'][rows])
+
+    if getattr(config['estimator'], 'race_aware', False):
+        # A year drawn twice is two races: the k-th draw gets its own ids
+        # (race-major, so ids still sort by year)
+        race = np.asarray(m['race'])
+        draw = np.concatenate([np.full(slices[y][1] - slices[y][0], k) for k, y in enumerate(sample_years)])
+        model.fit(X, y, groups=race[rows].astype(np.int64) * len(sample_years) + draw)
+        return model.predict_proba(t['X'], groups=t['groups'])[:, 1]
+
+    model.fit(X, y)
+    return model.predict_proba(t['X'])[:, 1]
+
+
+def run_draws(config, params, years, seeds, matrix=None, target=None):
+    """
+    One bootstrap refit per seed -> array (len(seeds), n_target)
+    """
+    draws = []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        # Every completed year has a winner, so any resample can be fitted
+        sample_years = rng.choice(years, size=len(years), replace=True)
+        draws.append(fit_and_score(config, params, np.sort(sample_years), seed, matrix, target))
+    return np.array(draws)
+
+
+def _run_draws_task(args):
+    return run_draws(*args)
+
+
+# ==================== ENGINE ====================
+
+def bootstrap(model='tier2_enhanced', category='Best Picture', n_bootstrap=N_BOOTSTRAP,
+              n_workers=None, seed=42):
+    """
+    Refit `model` on n_bootstrap year-resamples. Returns (target race,
+    race-normalized probabilities of shape (n_bootstrap, n_nominees),
+    point estimate from the fit on every year).
+    """
+    config = MODELS[model]
+    race = target_race(category, config)
+    params = tuned_params(model, config['params'])
+    path = build_matrix(config['source'], config['features'])
+    matrix = open_matrix(path)
+    years = completed_years(matrix)
+
+    X_target = race[config['features']].to_numpy(dtype=np.float64)
+    target_groups = np.zeros(len(race), dtype=np.int64)
+    target = {'X': X_target, 'groups': target_groups}
+
+    point = fit_and_score(config, params, years, seed, matrix, target)
+
+    seeds = np.random.default_rng(seed).integers(0, 2 ** 31 - 1, size=n_bootstrap)
+    n_workers = min(n_workers or os.cpu_count() or 1, n_bootstrap)
+
+    if n_workers > 1:
+        # A few chunks per worker keeps them busy without a task per refit
+        chunks = np.array_split(seeds, n_workers * 4)
+        tasks = [(config, params, years, chunk) for chunk in chunks if len(chunk)]
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(path, X_target, target_groups)) as pool:
+            draws = np.vstack(list(pool.map(_run_draws_task, tasks)))
+    else:
+        draws = run_draws(config, params, years, seeds, matrix, target)
+
+    draws = race_normalize_rows(draws, target_groups)
+    point = race_normalize_rows(point[None, :], target_groups)[0]
+    return race, draws, point
+
+
+def summarize(race, draws, point, interval=INTERVAL):
+    """
+    Per-nominee point estimate, bootstrap mean / interval and P(rank 1):
+    the share of refits in which the nominee is the race favourite
+    """
+    tail = (1 - interval) / 2 * 100
+    favourite = draws.argmax(axis=1)
+
+    label = 'film' if 'film' in race.columns else 'nominee'
+    summary = pd.DataFrame({
+        label: race[label],
+        'win_probability': point,
+        'bootstrap_mean': draws.mean(axis=0),
+        'interval_low': np.percentile(draws, tail, axis=0),
+        'interval_high': np.percentile(draws, 100 - tail, axis=0),
+        'p_rank1': np.bincount(favourite, minlength=draws.shape[1]) / len(draws),
+    })
+    if label != 'nominee' and 'nominee' in race.columns:
+        summary.insert(0, 'nominee', race['nominee'])
+    return summary.sort_values('win_probability', ascending=False).reset_index(drop=True)
+
+
+def intervals_path(category):
+    safe_name = category.lower().replace(' ', '_').replace(',', '').replace('-', '_')
+    return os.path.join(OUTPUT_FOLDER, f'{safe_name}_intervals.csv')
+
+
+def run_intervals(model='tier2_enhanced', category='Best Picture', n_bootstrap=N_BOOTSTRAP,
+                  n_workers=None, interval=INTERVAL):
+    print("=" * 70)
+    print(f"BOOTSTRAP INTERVALS: 2026 {category.upper()}")
+    print("=" * 70)
+    print(f"\n🎲 {n_bootstrap} year-resampled refits of {model}...")
+
+    start = time.perf_counter()
+    race, draws, point = bootstrap(model, category, n_bootstrap, n_workers)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Done in {elapsed:.1f}s ({elapsed / n_bootstrap * 1000:.0f} ms per refit)")
+
+    summary = summarize(race, draws, point, interval)
+    label = 'film' if 'film' in summary.columns else 'nominee'
+
+    print(f"\n📊 Win probability with {interval:.0%} interval, and P(rank 1):")
+    for _, row in summary.iterrows():
+        print(f"   {row[label]:<32} {row['win_probability']:>6.1%}  "
+              f"[{row['interval_low']:>5.1%} - {row['interval_high']:>5.1%}]  "
+              f"P(rank 1) {row['p_rank1']:>5.1%}")
+
+    path = intervals_path(category)
+    summary.to_csv(path, index=False)
+    print(f"\n💾 Intervals saved to {path}")
+    return summary
+
+
+if __name__ == "__main__":
+    # python src/bootstrap_intervals.py [model] [--category "Best Picture"] [--n 1000]
+    args = sys.argv[1:]
+    category = args[args.index('--category') + 1] if '--category' in args else 'Best Picture'
+    n_bootstrap = int(args[args.index('--n') + 1]) if '--n' in args else N_BOOTSTRAP
+    names = [a for i, a in enumerate(args)
+             if not a.startswith('--') and (i == 0 or args[i - 1] not in ('--category', '--n'))]
+    run_intervals(names[0] if names else 'tier2_enhanced', category, n_bootstrap)
@@ -0,0 +1,294 @@
+"""
+Per-Category Probability Calibration
+Class-weighted forests, stacked log-probabilities and precursor boosts all
+distort probabilities, so a "63.6%" isn't a calibrated 63.6%. Fits one map
+per category (identity, Platt or isotonic - whichever has the lowest
+leave-one-year-out race log-loss) on a model's out-of-fold backtest
+predictions, attaches it to the model whenever the model is trained and
+applies it after the batched predict. That selection loss is optimistic,
+so the reported calibrated loss comes from a nested run: each year is
+calibrated by a map selected and fitted without it, and a category whose
+map loses to the raw probabilities there stays uncalibrated. Also writes
+reliability-diagram data for the website
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+from backtest import race_normalize
+from ensemble import ENSEMBLE_NAME, collect_oof, stack_frame, stacker_oof
+from joint_model import MODEL_NAME as JOINT_MODEL_NAME, canonical_category
+from model_registry import has_bundle, load_bundle, resave_bundle
+
+
+OUTPUT_ROOT = 'data/cache/calibration'
+RELIABILITY_PATH = os.path.join(OUTPUT_ROOT, 'reliability.csv')
+SUMMARY_PATH = os.path.join(OUTPUT_ROOT, 'summary.csv')
+
+ARTIFACTS = {
+    'ensemble': ENSEMBLE_NAME,
+    'joint': JOINT_MODEL_NAME,
+}
+
+METHODS = ['identity', 'platt', 'isotonic']
+MIN_RACES = 10            # fewer races than this: left uncalibrated
+# Lumped multi-winner races: a race probability isn't one nominee's chance
+# of winning, so there is nothing to calibrate against
+UNCALIBRATED_CATEGORIES = {'Other'}
+MIN_PROBABILITY = 1e-4
+N_BINS = 10
+
+
+# ==================== MAPS ====================
+
+def _logit(p):
+    p = np.clip(np.asarray(p, dtype=np.float64), MIN_PROBABILITY, 1 - MIN_PROBABILITY)
+    return np.log(p / (1 - p))
+
+
+def fit_map(method, p, y):
+    """
+    Parameters of one calibration map, fitted on probabilities p and outcomes y
+    """
+    if method == 'identity' or len(np.unique(y)) < 2:
+        return {'method': 'identity'}
+    if method == 'platt':
+        model = LogisticRegression(C=1e4).fit(_logit(p)[:, None], y)
+        return {'method': 'platt', 'slope': float(model.coef_[0, 0]), 'intercept': float(model.intercept_[0])}
+    if method == 'isotonic':
+        model = IsotonicRegression(y_min=0, y_max=1, out_of_bounds='clip').fit(p, y)
+        return {'method': 'isotonic', 'x': model.X_thresholds_.tolist(), 'y': model.y_thresholds_.tolist()}
+    raise ValueError(f"Unknown calibration method '{method}' (expected one of {METHODS})")
+
+
+def apply_map(params, p):
+    p = np.asarray(p, dtype=np.float64)
+    if params['method'] == 'platt':
+        return 1 / (1 + np.exp(-(params['slope'] * _logit(p) + params['intercept'])))
+    if params['method'] == 'isotonic':
+        return np.interp(p, params['x'], params['y'])
+    return p
+
+
+def renormalize(frame, probs):
+    """
+    Clip and rescale calibrated probabilities to sum to 1 within each race
+    """
+    scored = frame[['year_ceremony', 'category']].copy()
+    scored['probability'] = np.clip(probs, MIN_PROBABILITY, 1)
+    return race_normalize(scored)
+
+
+def race_log_loss(frame, probs):
+    winners = frame['winner'].to_numpy() == 1
+    return float(-np.log(np.clip(probs[winners], 1e-6, 1)).mean()) if winners.any() else float('nan')
+
+
+# ==================== CALIBRATOR ====================
+
+class CategoryCalibrator:
+    """
+    One calibration map per canonical category, chosen by leave-one-year-out
+    race log-loss. transform() maps and renormalizes any set of races.
+    """
+
+    def __init__(self, methods=METHODS):
+        self.methods = list(methods)
+
+    def _cross_validate(self, rows, method):
+        # Leave-one-year-out: calibrated, renormalized probability of every row
+        years = rows['year_ceremony'].to_numpy()
+        p, y = rows['probability'].to_numpy(), rows['winner'].to_numpy()
+        out = np.empty(len(rows))
+        for year in np.unique(years):
+            test = years == year
+            out[test] = apply_map(fit_map(method, p[~test], y[~test]), p[test])
+        return renormalize(rows, out)
+
+    def _select(self, rows):
+        # Method with the lowest leave-one-year-out race log-loss, with the
+        # loss and cross-validated probabilities of every method tried
+        scores = {'identity': race_log_loss(rows, rows['probability'].to_numpy())}
+        cross_validated = {'identity': rows['probability'].to_numpy()}
+        for method in self.methods:
+            if method != 'identity':
+                cross_validated[method] = self._cross_validate(rows, method)
+                scores[method] = race_log_loss(rows, cross_validated[method])
+        return min(scores, key=scores.get), scores, cross_validated
+
+    def _held_out(self, rows):
+        # Nested leave-one-year-out: each year calibrated by the map selected
+        # and fitted on the other years only
+        years = rows['year_ceremony'].to_numpy()
+        out = np.empty(len(rows))
+        for year in np.unique(years):
+            test = years == year
+            train = rows[~test]
+            method = self._select(train)[0]
+            params = fit_map(method, train['probability'].to_numpy(), train['winner'].to_numpy())
+            out[test] = apply_map(params, rows['probability'].to_numpy()[test])
+        return renormalize(rows, out)
+
+    def fit(self, oof):
+        """
+        oof: out-of-fold predictions (year_ceremony, category, winner,
+        race-normalized probability)
+        """
+        start = time.perf_counter()
+        oof = oof.reset_index(drop=True).copy()
+        oof['category'] = oof['category'].map(canonical_category)
+
+        self.maps_, summary = {}, []
+        self.oof_ = oof[['year_ceremony', 'category', 'winner', 'probability']].copy()
+        self.oof_['calibrated'] = oof['probability']
+
+        for category, rows in oof.groupby('category'):
+            n_races = rows['year_ceremony'].nunique()
+            raw = race_log_loss(rows, rows['probability'].to_numpy())
+            if category in UNCALIBRATED_CATEGORIES or n_races < MIN_RACES:
+                best, selection, held_out = 'identity', raw, rows['probability'].to_numpy()
+            else:
+                best, scores, _ = self._select(rows)
+                selection, held_out = scores[best], self._held_out(rows)
+                # The selection loss is optimistic: a map that loses to the
+                # raw probabilities held out isn't worth applying
+                if race_log_loss(rows, held_out) > raw:
+                    best, selection, held_out = 'identity', raw, rows['probability'].to_numpy()
+
+            self.maps_[category] = fit_map(best, rows['probability'].to_numpy(), rows['winner'].to_numpy())
+            self.oof_.loc[rows.index, 'calibrated'] = held_out
+            summary.append({'category': category, 'races': n_races, 'method': best,
+                            'raw_log_loss': raw, 'selection_log_loss': selection,
+                            'calibrated_log_loss': race_log_loss(rows, held_out)})
+
+        self.summary_ = pd.DataFrame(summary)
+        self.fit_seconds_ = time.perf_counter() - start
+        return self
+
+    def transform(self, df, probs):
+        """
+        Calibrated race probabilities for rows of df (year_ceremony,
+        category) with model probabilities probs
+        """
+        probs = np.asarray(probs, dtype=np.float64).copy()
+        categories = df['category'].map(canonical_category).to_numpy()
+        for category, params in self.maps_.items():
+            rows = categories == category
+            if rows.any() and params['method'] != 'identity':
+                probs[rows] = apply_map(params, probs[rows])
+        return renormalize(df.reset_index(drop=True), probs)
+
+    def reliability(self, n_bins=N_BINS):
+        """
+        Reliability-diagram bins per category (and 'All'), raw vs the
+        held-out (nested cross-validated) calibrated probabilities
+        """
+        edges = np.linspace(0, 1, n_bins + 1)
+        rows = []
+        # 'All' pools single-winner races only: in the lumped 'Other' races
+        # a race probability isn't one nominee's chance of winning
+        single = self.oof_.groupby(['year_ceremony', 'category'])['winner'].transform('sum') == 1
+        frames = [('All', self.oof_[single])] + list(self.oof_.groupby('category'))
+        for category, frame in frames:
+            for stage, column in [('raw', 'probability'), ('calibrated', 'calibrated')]:
+                p = frame[column].to_numpy()
+                bins = np.clip(np.digitize(p, edges[1:-1]), 0, n_bins - 1)
+                counts = np.bincount(bins, minlength=n_bins)
+                predicted = np.bincount(bins, weights=p, minlength=n_bins)
+                observed = np.bincount(bins, weights=frame['winner'].to_numpy(dtype=np.float64), minlength=n_bins)
+                for b in np.flatnonzero(counts):
+                    rows.append({
+                        'category': category,
+                        'stage': stage,
+                        'bin_low': edges[b],
+                        'bin_high': edges[b + 1],
+                        'mean_predicted': predicted[b] / counts[b],
+                        'observed_rate': observed[b] / counts[b],
+                        'count': int(counts[b]),
+                    })
+        return pd.DataFrame(rows)
+
+
+def calibrated_predict(model, df):
+    """
+    model.predict(df), through the model's calibrator when it has one
+    (model may be a registry bundle)
+    """
+    probs = model.predict(df)
+    calibrator = getattr(getattr(model, 'estimator', model), 'calibrator', None)
+    return calibrator.transform(df, probs) if calibrator is not None else probs
+
+
+# ==================== ARTIFACTS ====================
+
+def model_oof(kind, model):
+    """
+    Out-of-fold predictions of a saved model, from the ensemble's OOF cache
+    """
+    if kind == 'ensemble':
+        stacked = stack_frame(collect_oof(model.names))
+        scored = stacker_oof(stacked, model.names)
+        oof = scored[['year_ceremony', 'category', 'winner']].copy()
+        oof['probability'] = scored['ensemble']
+        return oof
+    if kind == 'joint':
+        return collect_oof(['joint'])['joint']
+    raise KeyError(f"Unknown model '{kind}' (expected one of {list(ARTIFACTS)})")
+
+
+def attach_calibrator(kind, model):
+    """
+    Fit a calibrator on a model's out-of-fold predictions and attach it to
+    the model (the training scripts call this before saving, so a retrain
+    never drops it)
+    """
+    model.calibrator = CategoryCalibrator().fit(model_oof(kind, model))
+    return model.calibrator
+
+
+def calibrate(kinds=None):
+    """
+    Refit and store the calibrator of every registered model, and write
+    reliability data for the website
+    """
+    print("=" * 70)
+    print("PROBABILITY CALIBRATION")
+    print("=" * 70)
+
+    reliability, summaries = [], []
+    for kind in kinds or ARTIFACTS:
+        if not has_bundle(ARTIFACTS[kind]):
+            print(f"\n⚠️ No registered {kind} model - train it first")
+            continue
+
+        bundle = load_bundle(ARTIFACTS[kind], cached=False)
+        calibrator = attach_calibrator(kind, bundle.estimator)
+        path = resave_bundle(bundle)
+
+        print(f"\n📐 {kind}: calibrated in {calibrator.fit_seconds_:.2f}s, saved with {path}")
+        for _, row in calibrator.summary_.iterrows():
+            print(f"   {row['category']:<20} {row['method']:<9} log-loss {row['raw_log_loss']:.3f} -> "
+                  f"{row['calibrated_log_loss']:.3f} held out (selection {row['selection_log_loss']:.3f}, "
+                  f"{row['races']} races)")
+
+        reliability.append(calibrator.reliability().assign(model=kind))
+        summaries.append(calibrator.summary_.assign(model=kind))
+
+    if reliability:
+        os.makedirs(OUTPUT_ROOT, exist_ok=True)
+        pd.concat(reliability, ignore_index=True).to_csv(RELIABILITY_PATH, index=False)
+        pd.concat(summaries, ignore_index=True).to_csv(SUMMARY_PATH, index=False)
+        print(f"\n💾 Reliability data saved to {RELIABILITY_PATH}")
+
+
+if __name__ == "__main__":
+    # python src/calibration.py [ensemble|joint ...]
+    # (through the module, so the calibrator unpickles outside this script)
+    import calibration
+    calibration.calibrate(sys.argv[1:] or None)
@@ -0,0 +1,213 @@
+"""
+Person Career-History Table
+Prior nominations, wins, years since last nomination and "overdue" counters
+for every nominated person across all categories, precomputed once as a
+dense (person x year) grid so any as-of-year lookup is O(1)
+"""
+
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+SOURCE_PATH = 'data/processed/all_categories_master.csv'
+HISTORY_PATH = 'data/features/career_history.npz'
+
+ACTING_CATEGORIES = ['Leading Actor', 'Leading Actress', 'Supporting Actor', 'Supporting Actress']
+
+# Stats as of the *start* of a ceremony year (that year's results excluded)
+CAREER_COLUMNS = [
+    'prior_nominations',
+    'prior_wins',
+    'prior_acting_nominations',
+    'years_since_last_nomination',
+    'losses_since_last_win',
+    'is_overdue',
+]
+
+# Never-won nominees with at least this many losses count as "overdue"
+OVERDUE_MIN_LOSSES = 3
+
+
+def canonical_person_id(name):
+    """
+    'Del Toro, Benicio' / 'Benicio del Toro' -> 'benicio-del-toro'
+    """
+    if not isinstance(name, str):
+        return None
+    if ',' in name:
+        last, first = name.split(',', 1)
+        name = f"{first} {last}"
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or None
+
+
+def explode_people(df):
+    """
+    One row per (person, year, category) - shared nominations
+    ('A/B/C') credit each person
+    """
+    people = df[['year', 'category', 'nominee', 'won']].copy()
+    people['nominee'] = people['nominee'].astype(str).str.split('/')
+    people = people.explode('nominee')
+    people['person_id'] = people['nominee'].str.strip().map(canonical_person_id)
+    return people.dropna(subset=['person_id'])
+
+
+def _shift_right(grid, fill):
+    """
+    Column t gets column t-1 (stats through last year = as of this year)
+    """
+    shifted = np.empty_like(grid)
+    shifted[:, 0] = fill
+    shifted[:, 1:] = grid[:, :-1]
+    return shifted
+
+
+class CareerHistory:
+    """
+    Dense (person, year) grid of career stats
+
+    Column t holds the stats as of the start of first_year + t; the grid runs
+    one year past the data so next year's nominees can be looked up too.
+    """
+
+    def __init__(self, person_ids, first_year, stats):
+        self.person_ids = np.asarray(person_ids)
+        self.first_year = int(first_year)
+        self.stats = stats  # column name -> (persons, years) array
+        self.n_years = next(iter(stats.values())).shape[1]
+        self.position = {pid: i for i, pid in enumerate(self.person_ids)}
+
+    @classmethod
+    def build(cls, df=None):
+        """
+        Build from all_categories_master (or a frame in its layout)
+        """
+        df = pd.read_csv(SOURCE_PATH) if df is None else df
+        people = explode_people(df)
+
+        codes, person_ids = pd.factorize(people['person_id'], sort=True)
+        first_year = int(people['year'].min())
+        n_years = int(people['year'].max()) - first_year + 2
+        cols = people['year'].to_numpy(dtype=np.int64) - first_year
+        shape = (len(person_ids), n_years)
+
+        noms = np.zeros(shape, dtype=np.int32)
+        wins = np.zeros(shape, dtype=np.int32)
+        acting = np.zeros(shape, dtype=np.int32)
+        np.add.at(noms, (codes, cols), 1)
+        np.add.at(wins, (codes, cols), people['won'].astype(int).to_numpy())
+        np.add.at(acting, (codes, cols), people['category'].isin(ACTING_CATEGORIES).to_numpy(dtype=np.int32))
+
+        years = first_year + np.arange(n_years)
+        noms_through = np.cumsum(noms, axis=1)
+
+        # Last nomination year before t (NaN if none)
+        last_nom = np.maximum.accumulate(np.where(noms > 0, years, -1), axis=1)
+        last_nom = _shift_right(last_nom, -1)
+        since_last = np.where(last_nom >= 0, years - last_nom, np.nan)
+
+        # Nominations since the last win: cumulative nominations now minus
+        # cumulative nominations through the last winning year
+        noms_at_last_win = np.maximum.accumulate(np.where(wins > 0, noms_through, 0), axis=1)
+        prior_noms = _shift_right(noms_through, 0)
+        prior_wins = _shift_right(np.cumsum(wins, axis=1), 0)
+        losses = prior_noms - _shift_right(noms_at_last_win, 0)
+
+        stats = {
+            'prior_nominations': prior_noms,
+            'prior_wins': prior_wins,
+            'prior_acting_nominations': _shift_right(np.cumsum(acting, axis=1), 0),
+            'years_since_last_nomination': since_last,
+            'losses_since_last_win': losses,
+            'is_overdue': ((prior_wins == 0) & (prior_noms >= OVERDUE_MIN_LOSSES)).astype(np.int32),
+        }
+        return cls(np.asarray(person_ids), first_year, stats)
+
+    # -------------------- lookups --------------------
+
+    def _column(self, year):
+        return int(np.clip(int(year) - self.first_year, 0, self.n_years - 1))
+
+    def lookup(self, name, year):
+        """
+        Career stats for one person as of a ceremony year (zeros if the
+        person has never been nominated)
+        """
+        row = self.position.get(canonical_person_id(name))
+        if row is None:
+            return {c: (np.nan if c == 'years_since_last_nomination' else 0) for c in CAREER_COLUMNS}
+        col = self._column(year)
+        return {c: self.stats[c][row, col].item() for c in CAREER_COLUMNS}
+
+    def features(self, names, years):
+        """
+        Vectorized lookup: one row of career stats per (name, year) pair,
+        ready to column-join onto a nominee frame
+        """
+        pids = pd.Series(list(names)).map(canonical_person_id)
+        rows = pids.map(self.position).to_numpy(dtype=np.float64)
+        known = ~np.isnan(rows)
+        rows = np.where(known, rows, 0).astype(np.int64)
+        cols = np.clip(np.asarray(years, dtype=np.int64) - self.first_year, 0, self.n_years - 1)
+
+        out = {}
+        for column in CAREER_COLUMNS:
+            values = self.stats[column][rows, cols].astype(np.float64)
+            missing = np.nan if column == 'years_since_last_nomination' else 0
+            out[column] = np.where(known, values, missing)
+        return pd.DataFrame(out)
+
+    def to_frame(self):
+        """
+        Long table (person_id, year, stats...) for inspection / export
+        """
+        persons, cols = np.indices((len(self.person_ids), self.n_years))
+        frame = pd.DataFrame({
+            'person_id': self.person_ids[persons.ravel()],
+            'year': self.first_year + cols.ravel(),
+        })
+        for column in CAREER_COLUMNS:
+            frame[column] = self.stats[column].ravel()
+        return frame
+
+    # -------------------- persistence --------------------
+
+    def save(self, path=HISTORY_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(path, person_ids=self.person_ids.astype(str),
+                 first_year=self.first_year, **self.stats)
+
+    @classmethod
+    def load(cls, path=HISTORY_PATH):
+        """
+        Load the saved table, rebuilding it if missing or older than the
+        source CSV
+        """
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(SOURCE_PATH):
+            history = cls.build()
+            history.save(path)
+            return history
+
+        with np.load(path) as data:
+            stats = {c: data[c] for c in CAREER_COLUMNS}
+            return cls(data['person_ids'], int(data['first_year']), stats)
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("CAREER HISTORY TABLE")
+    print("=" * 50)
+
+    history = CareerHistory.build()
+    history.save()
+    print(f"\n👥 {len(history.person_ids):,} people x {history.n_years} years "
+          f"({history.first_year}-{history.first_year + history.n_years - 1})")
+    print(f"💾 Saved to {HISTORY_PATH}")
+
+    for name in ['Leonardo DiCaprio', 'Timothée Chalamet', 'Ethan Hawke']:
+        print(f"\n🎭 {name} (as of 2025): {history.lookup(name, 2025)}")
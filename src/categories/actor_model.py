@@ -3,59 +3,77 @@ Leading Actor Category Prediction Model
 Using Manual Precursor Data
 """
 
+import os
+import sys
+
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, roc_auc_score
 
-
-def train_actor_model():
-    print("=" * 50)
-    print("LEADING ACTOR MODEL")
-    print("=" * 50)
-
-    # --------------------------------------------------
-    # 1️⃣ Load Master Dataset
-    # --------------------------------------------------
-    df = pd.read_csv("data/processed/all_categories_master.csv")
-
-    # Filter Leading Actor only
-    df_actor = df[df["category"] == "Leading Actor"].copy()
-    print(f"Leading Actor nominations: {len(df_actor)}")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from career_history import CareerHistory
+from cross_nominations import CrossNominations
+
+
+ACTOR_FEATURES = [
+    "total_nominations",
+    "film_is_bp_nominee",
+    "film_is_director_nominee",
+    "actor_prev_nominations",
+    "actor_prev_wins",
+    "actor_losses_since_win",
+    "actor_is_overdue",
+    "won_sag",
+    "won_golden_globe",
+    "won_bafta"
+]
+
+
+def fix_name_format(name):
+    """
+    Last, First → First Last
+    """
+    if isinstance(name, str) and "," in name:
+        parts = name.split(",")
+        return parts[1].strip() + " " + parts[0].strip()
+    return name
+
+
+def actor_frame(df=None, category="Leading Actor"):
+    """
+    One category's nominees with every model feature, from a frame in
+    all_categories_master's layout (year, category, nominee, film, won,
+    total_nominations). Cross-nomination features come from the whole frame.
+    """
+    df = pd.read_csv("data/processed/all_categories_master.csv") if df is None else df
+
+    df_actor = df[df["category"] == category].copy()
+    df_actor["original_nominee"] = df_actor["nominee"]
+    df_actor["nominee"] = df_actor["nominee"].apply(fix_name_format)
 
     # --------------------------------------------------
-    # Fix Name Format (Last, First → First Last)
+    # Career History Features (all categories, as of each year)
     # --------------------------------------------------
-    def fix_name_format(name):
-        if isinstance(name, str) and "," in name:
-            parts = name.split(",")
-            return parts[1].strip() + " " + parts[0].strip()
-        return name
+    df_actor = df_actor.sort_values(by=["year", "nominee"]).reset_index(drop=True)
+    history = CareerHistory.load()
+    career = history.features(df_actor["nominee"], df_actor["year"])
 
-    df_actor["nominee"] = df_actor["nominee"].apply(fix_name_format)
+    df_actor["actor_prev_nominations"] = career["prior_nominations"]
+    df_actor["actor_prev_wins"] = career["prior_wins"]
+    df_actor["actor_losses_since_win"] = career["losses_since_last_win"]
+    df_actor["actor_is_overdue"] = career["is_overdue"]
 
     # --------------------------------------------------
-    # 2️⃣ Career History Feature
+    # Cross-Nomination Features (Picture, Director, ...)
     # --------------------------------------------------
-    df_actor = df_actor.sort_values(by=["year", "nominee"])
-    df_actor["actor_prev_nominations"] = (
-        df_actor.groupby("nominee").cumcount()
+    cross = CrossNominations(df)
+    df_actor = cross.join(
+        df_actor, names=["film_is_bp_nominee", "film_is_director_nominee"]
     )
 
     # --------------------------------------------------
-    # 3️⃣ Best Picture Nominee Feature
-    # --------------------------------------------------
-    df_bp = df[df["category"] == "Best Picture"]
-    bp_films = df_bp.groupby("year")["film"].apply(list).to_dict()
-
-    def is_bp_nominee(row):
-        if row["year"] in bp_films:
-            return 1 if row["film"] in bp_films[row["year"]] else 0
-        return 0
-
-    df_actor["film_is_bp_nominee"] = df_actor.apply(is_bp_nominee, axis=1)
-
-    # --------------------------------------------------
-    # 4️⃣ Merge Manual Precursor Data
+    # Merge Manual Precursor Data
     # --------------------------------------------------
     precursors = pd.read_csv("data/external/acting_precursors.csv")
 
@@ -72,22 +90,32 @@ def train_actor_model():
         .fillna(0)
     )
 
+    df_actor["total_nominations"] = df_actor["total_nominations"].fillna(0)
+    return df_actor
+
+
+def make_actor_model():
+    return LogisticRegression(
+        class_weight="balanced",
+        max_iter=1000
+    )
+
+
+def train_actor_model():
+    print("=" * 50)
+    print("LEADING ACTOR MODEL")
+    print("=" * 50)
+
     # --------------------------------------------------
-    # 5️⃣ Feature Selection
+    # 1️⃣ Load Master Dataset + Features
     # --------------------------------------------------
-    df_actor["total_nominations"] = df_actor["total_nominations"].fillna(0)
+    df_actor = actor_frame()
+    print(f"Leading Actor nominations: {len(df_actor)}")
 
-    features = [
-        "total_nominations",
-        "film_is_bp_nominee",
-        "actor_prev_nominations",
-        "won_sag",
-        "won_golden_globe",
-        "won_bafta"
-    ]
+    features = ACTOR_FEATURES
 
     # --------------------------------------------------
-    # 6️⃣ Time-Based Split
+    # 2️⃣ Time-Based Split
     # --------------------------------------------------
     train = df_actor[df_actor["year"] <= 2021]
     test = df_actor[df_actor["year"] > 2021]
@@ -99,17 +127,14 @@ def train_actor_model():
     y_test = test["won"]
 
     # --------------------------------------------------
-    # 7️⃣ Train Model
+    # 3️⃣ Train Model
     # --------------------------------------------------
-    model = LogisticRegression(
-        class_weight="balanced",
-        max_iter=1000
-    )
+    model = make_actor_model()
 
     model.fit(X_train, y_train)
 
     # --------------------------------------------------
-    # 8️⃣ Evaluate
+    # 4️⃣ Evaluate
     # --------------------------------------------------
     y_pred = model.predict(X_test)
     y_proba = model.predict_proba(X_test)[:, 1]
@@ -0,0 +1,347 @@
+"""
+Per-Category Model Factory
+Generalizes actor_model.py to every category: each canonical category is a
+declarative spec (features, precursor sources, model family). The factory
+turns specs into training jobs, runs them concurrently on a process pool
+that shares one memory-mapped feature matrix, and registers one versioned
+bundle per category in the model registry (category_<name>)
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from backtest import race_metrics
+from career_history import CareerHistory
+from conditional_logit import ConditionalLogit, race_groups
+from cross_nominations import CROSS_FEATURES, CrossNominations, film_key
+from feature_registry import BASIC_FEATURES, PRECURSOR_COLUMNS
+from joint_model import canonical_category, merge_picture_precursors, training_frame
+from model_registry import MMAP_ARRAYS, activate, has_bundle, lazy_bundle, write_bundle
+
+
+MATRIX_ROOT = 'data/cache/category_factory'
+
+HOLDOUT_FIRST_YEAR = 2022  # same split as actor_model.py / model_two_tier.py
+
+CAREER_FEATURES = ['prior_nominations', 'prior_wins', 'losses_since_last_win', 'is_overdue']
+CROSS_NAMES = list(CROSS_FEATURES)
+
+# Every column a spec may ask for, in matrix order
+MATRIX_COLUMNS = BASIC_FEATURES + PRECURSOR_COLUMNS + CAREER_FEATURES + CROSS_NAMES
+
+ACTING_PRECURSORS_PATH = 'data/external/acting_precursors.csv'
+# acting_precursors.csv column -> store precursor column (per-category
+# meaning of the columns: feature_registry.PRECURSOR_MEANINGS)
+ACTING_PRECURSOR_COLUMNS = {
+    'won_golden_globe': 'won_gg_drama',
+    'won_bafta': 'won_bafta',
+    'won_sag': 'won_sag_cast',
+}
+
+
+# ==================== MODEL FAMILIES ====================
+
+FAMILIES = {
+    'logit': (LogisticRegression, {'class_weight': 'balanced', 'max_iter': 1000}),
+    'forest': (RandomForestClassifier, {'n_estimators': 200, 'max_depth': 6,
+                                        'class_weight': {0: 1, 1: 10}, 'random_state': 42, 'n_jobs': 1}),
+    'clogit': (ConditionalLogit, {'C': 1.0}),
+}
+# Bundle load mode per family: coefficient arrays are memory-mapped,
+# forests read into memory (see model_registry)
+FAMILY_MMAP_MODES = {'logit': MMAP_ARRAYS, 'forest': None, 'clogit': MMAP_ARRAYS}
+
+
+# ==================== PRECURSOR SOURCES ====================
+
+def merge_acting_precursors(df):
+    """
+    Copy manually collected acting precursor wins onto acting rows
+    """
+    precursors = pd.read_csv(ACTING_PRECURSORS_PATH)
+    if not len(precursors):
+        print(f"⚠️ {ACTING_PRECURSORS_PATH} has no rows - acting precursor columns stay 0")
+        return df
+
+    source = pd.MultiIndex.from_arrays([precursors['year'], precursors['category'],
+                                        film_key(precursors['nominee'])])
+    target = pd.MultiIndex.from_arrays([df['year_ceremony'], df['category'], film_key(df['nominee'])])
+    position = source.get_indexer(target)
+    found = position >= 0
+
+    for column, store_column in ACTING_PRECURSOR_COLUMNS.items():
+        values = df[store_column].to_numpy(dtype=np.float64, copy=True)
+        values[found] = precursors[column].fillna(0).to_numpy(dtype=np.float64)[position[found]]
+        df[store_column] = values
+    return df
+
+
+# Spec precursor source -> function filling the precursor columns of the
+# rows of the categories that name it
+PRECURSOR_SOURCES = {
+    'picture_gg': merge_picture_precursors,
+    'acting_manual': merge_acting_precursors,
+}
+
+
+# ==================== SPECS ====================
+
+CATEGORY_SPECS = {}
+
+
+def register_category(category, features, precursors=(), family='clogit', params=None):
+    """
+    Declare how one canonical category is modelled. `precursors` names the
+    precursor sources merged into its rows ('picture_gg', 'acting_manual')
+    and `features` picks columns from MATRIX_COLUMNS.
+    """
+    unknown = [f for f in features if f not in MATRIX_COLUMNS]
+    if unknown:
+        raise ValueError(f"{category}: unknown features {unknown}")
+    unknown = [p for p in precursors if p not in PRECURSOR_SOURCES]
+    if unknown:
+        raise ValueError(f"{category}: unknown precursor sources {unknown} "
+                         f"(expected some of {sorted(PRECURSOR_SOURCES)})")
+    if family not in FAMILIES:
+        raise ValueError(f"{category}: unknown model family '{family}' (expected one of {sorted(FAMILIES)})")
+
+    CATEGORY_SPECS[category] = {
+        'category': category,
+        'features': list(features),
+        'precursors': list(precursors),
+        'family': family,
+        'params': dict(params or {}),
+    }
+    return CATEGORY_SPECS[category]
+
+
+ACTING_FEATURES = BASIC_FEATURES + CAREER_FEATURES + [
+    'film_is_bp_nominee', 'film_is_director_nominee',
+    'won_gg_drama', 'won_bafta', 'won_sag_cast',
+]
+
+register_category('Best Picture', BASIC_FEATURES + PRECURSOR_COLUMNS + ['film_is_director_nominee',
+                                                                         'film_acting_nominations'],
+                  precursors=['picture_gg'])
+register_category('Director', BASIC_FEATURES + CAREER_FEATURES + ['film_is_bp_nominee',
+                                                                  'film_acting_nominations'])
+for _category in ['Leading Actor', 'Leading Actress', 'Supporting Actor', 'Supporting Actress']:
+    register_category(_category, ACTING_FEATURES, precursors=['acting_manual'])
+register_category('Cinematography', BASIC_FEATURES + ['film_is_bp_nominee', 'film_is_director_nominee'])
+register_category('Film Editing', BASIC_FEATURES + ['film_is_bp_nominee', 'film_is_director_nominee'])
+register_category('Other', BASIC_FEATURES + ['film_is_bp_nominee', 'film_craft_nominations'],
+                  family='forest')
+
+
+def model_name(category):
+    """
+    Registry name of a canonical category's model
+    """
+    return 'category_' + category.lower().replace(' ', '_')
+
+
+# ==================== SHARED FEATURE MATRIX ====================
+
+def merge_spec_precursors(df):
+    """
+    Fill each category's precursor columns from the sources its spec names;
+    categories naming none keep the store's values
+    """
+    categories = df['category'].map(canonical_category).to_numpy()
+    for source, merge in PRECURSOR_SOURCES.items():
+        users = [c for c, spec in CATEGORY_SPECS.items() if source in spec['precursors']]
+        rows = np.isin(categories, users)
+        if rows.any():
+            merged = merge(df[rows].reset_index(drop=True))
+            df.loc[rows, PRECURSOR_COLUMNS] = merged[PRECURSOR_COLUMNS].to_numpy()
+    return df
+
+
+def factory_frame():
+    """
+    Every historical nominee with all MATRIX_COLUMNS filled in, precursor
+    columns from the sources each category's spec names
+    """
+    df = merge_spec_precursors(training_frame(include_other=True, picture_precursors=False))
+    df['total_nominations'] = df['total_nominations'].fillna(0)
+
+    career = CareerHistory.load().features(df['nominee'], df['year_ceremony'])
+    cross = CrossNominations().features(df['year_ceremony'], df['film'], CROSS_NAMES)
+    for column in CAREER_FEATURES:
+        df[column] = career[column].to_numpy()
+    for column in CROSS_NAMES:
+        df[column] = cross[column].to_numpy()
+
+    df[MATRIX_COLUMNS] = df[MATRIX_COLUMNS].fillna(0)
+    return df.sort_values(['year_ceremony', 'category']).reset_index(drop=True)
+
+
+def build_feature_matrix():
+    """
+    Write the factory frame once as .npy files; returns the directory.
+    Keyed by the training data and column list, so it is rebuilt only when
+    either changes.
+    """
+    df = factory_frame()
+    ids = df[['year_ceremony', 'category', 'nominee', 'film', 'winner']]
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df[['year_ceremony', 'winner'] + MATRIX_COLUMNS],
+                                                     index=False).to_numpy().tobytes())
+    digest.update(json.dumps(MATRIX_COLUMNS).encode())
+    path = os.path.join(MATRIX_ROOT, digest.hexdigest()[:12])
+    if os.path.exists(os.path.join(path, 'ids.parquet')):
+        return path
+
+    os.makedirs(path, exist_ok=True)
+    categories = df['category'].map(canonical_category)
+    np.save(os.path.join(path, 'X.npy'), df[MATRIX_COLUMNS].to_numpy(dtype=np.float64))
+    np.save(os.path.join(path, 'y.npy'), df['winner'].to_numpy(dtype=np.int8))
+    np.save(os.path.join(path, 'year.npy'), df['year_ceremony'].to_numpy(dtype=np.int32))
+    np.save(os.path.join(path, 'race.npy'), race_groups(df).astype(np.int32))
+    np.save(os.path.join(path, 'category.npy'), pd.factorize(categories, sort=True)[0].astype(np.int16))
+    with open(os.path.join(path, 'columns.json'), 'w') as f:
+        json.dump({'columns': MATRIX_COLUMNS, 'categories': sorted(categories.unique())}, f)
+    ids.to_parquet(os.path.join(path, 'ids.parquet'), index=False)
+    return path
+
+
+def open_feature_matrix(path):
+    """
+    Read-only memory maps shared by every worker
+    """
+    matrix = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+              for name in ['X', 'y', 'year', 'race', 'category']}
+    with open(os.path.join(path, 'columns.json')) as f:
+        matrix.update(json.load(f))
+    return matrix
+
+
+# ==================== JOBS ====================
+
+_MATRIX = {}
+
+
+def _init_worker(path):
+    _MATRIX.update(open_feature_matrix(path))
+    _MATRIX['path'] = path
+
+
+def _fit(spec, X, y, races):
+    estimator, defaults = FAMILIES[spec['family']]
+    model = estimator(**{**defaults, **spec['params']})
+    if getattr(estimator, 'race_aware', False):
+        return model.fit(X, y, groups=races)
+    return model.fit(X, y)
+
+
+def _predict(model, X, races):
+    if getattr(model, 'race_aware', False):
+        return model.predict_proba(X, groups=races)[:, 1]
+    return model.predict_proba(X)[:, 1]
+
+
+def train_category(spec, matrix=None):
+    """
+    One job: holdout evaluation (train before HOLDOUT_FIRST_YEAR), then a
+    refit on every year that becomes the bundle. Writes the bundle only -
+    the parent process activates it, so workers never race on the manifest.
+    """
+    m = matrix or _MATRIX
+    start = time.perf_counter()
+
+    rows = np.flatnonzero(np.asarray(m['category']) == m['categories'].index(spec['category']))
+    cols = [m['columns'].index(f) for f in spec['features']]
+    X = np.asarray(m['X'][rows][:, cols])
+    y = np.asarray(m['y'][rows])
+    years = np.asarray(m['year'][rows])
+    races = np.asarray(m['race'][rows])
+
+    train, test = years < HOLDOUT_FIRST_YEAR, years >= HOLDOUT_FIRST_YEAR
+    holdout = _fit(spec, X[train], y[train], races[train])
+    scored = pd.DataFrame({'year_ceremony': years[test], 'category': spec['category'],
+                           'winner': y[test], 'probability': _predict(holdout, X[test], races[test])})
+    metrics = race_metrics(scored) if test.any() else {}
+
+    model = _fit(spec, X, y, races)
+    model.spec_ = spec
+    # Data hash: the matrix directory is named by the hash of its contents
+    artifact_path, bundle = write_bundle(model_name(spec['category']), model,
+                                         pd.DataFrame(X, columns=spec['features']),
+                                         os.path.basename(m.get('path', '')), metrics, years=years,
+                                         mmap_mode=FAMILY_MMAP_MODES[spec['family']])
+
+    return {
+        'category': spec['category'],
+        'family': spec['family'],
+        'version': bundle.version(),
+        'path': artifact_path,
+        'rows': int(len(rows)),
+        'seconds': time.perf_counter() - start,
+        **{k: metrics.get(k) for k in ['top1_accuracy', 'race_log_loss', 'roc_auc']},
+    }
+
+
+def train_all(categories=None, n_workers=None):
+    """
+    Train every registered category concurrently and make each bundle its
+    model's current version
+    """
+    print("=" * 70)
+    print("CATEGORY MODEL FACTORY")
+    print("=" * 70)
+
+    path = build_feature_matrix()
+    specs = [CATEGORY_SPECS[c] for c in (categories or CATEGORY_SPECS)]
+    n_workers = min(n_workers or os.cpu_count() or 1, len(specs))
+    print(f"\n🏭 {len(specs)} category jobs on {n_workers} worker(s), features from {path}")
+
+    start = time.perf_counter()
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(path,)) as pool:
+            results = list(pool.map(train_category, specs))
+    else:
+        _init_worker(path)
+        results = [train_category(spec) for spec in specs]
+    wall = time.perf_counter() - start
+
+    for r in results:
+        log_loss = f"{r['race_log_loss']:.3f}" if r['race_log_loss'] is not None else '  -  '
+        print(f"   {r['category']:<20} {r['family']:<7} {r['rows']:>5} rows | holdout log-loss {log_loss} | "
+              f"{r['seconds']:.2f}s -> {r['path']}")
+    slowest = max(r['seconds'] for r in results)
+    print(f"\n⏱️ Wall time {wall:.2f}s (slowest single category {slowest:.2f}s, "
+          f"sum of jobs {sum(r['seconds'] for r in results):.2f}s)")
+
+    for r in results:
+        activate(r['path'])
+    print(f"💾 {len(results)} category models registered (python src/model_registry.py lists them)")
+    return results
+
+
+# ==================== MODELS ====================
+
+def load_category_model(category):
+    """
+    Registered model of a category (loaded on the first prediction) -
+    2026 names ('Best Sound', 'Best Actor in a Leading Role') resolve to
+    their canonical category
+    """
+    name = model_name(canonical_category(category))
+    if not has_bundle(name):
+        raise FileNotFoundError(f"No trained model for {category} - run src/categories/category_factory.py")
+    return lazy_bundle(name)
+
+
+if __name__ == "__main__":
+    # python src/categories/category_factory.py [category ...]
+    train_all(sys.argv[1:] or None)
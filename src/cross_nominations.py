@@ -0,0 +1,110 @@
+"""
+Cross-Category Nomination Matrix
+Sparse (film, year) x category incidence matrix built once from
+all_categories_master, with vectorized extractors such as "film is also up
+for Best Picture / Director / Editing" for any category model to join on
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+SOURCE_PATH = 'data/processed/all_categories_master.csv'
+
+ACTING_CATEGORIES = ['Leading Actor', 'Leading Actress', 'Supporting Actor', 'Supporting Actress']
+CRAFT_CATEGORIES = ['Cinematography', 'Film Editing', 'Other']
+
+# Feature name -> (categories it counts, 'flag' or 'count')
+# Screenplay, score, design etc. are lumped into 'Other' in the source data
+CROSS_FEATURES = {
+    'film_is_bp_nominee': (['Best Picture'], 'flag'),
+    'film_is_director_nominee': (['Director'], 'flag'),
+    'film_is_editing_nominee': (['Film Editing'], 'flag'),
+    'film_is_cinematography_nominee': (['Cinematography'], 'flag'),
+    'film_acting_nominations': (ACTING_CATEGORIES, 'count'),
+    'film_craft_nominations': (CRAFT_CATEGORIES, 'count'),
+}
+
+
+def film_key(films):
+    return pd.Series(films).astype(str).str.strip().str.casefold()
+
+
+class CrossNominations:
+    """
+    counts[r, c]: nominations of film-year r in category c (wins likewise)
+    """
+
+    def __init__(self, df=None):
+        df = pd.read_csv(SOURCE_PATH) if df is None else df
+        df = df.dropna(subset=['film'])
+
+        keys = pd.MultiIndex.from_arrays([df['year'].to_numpy(), film_key(df['film']).to_numpy()])
+        rows, self.films = pd.factorize(keys)
+        cols, categories = pd.factorize(df['category'])
+        self.categories = list(categories)
+        self.category_position = {c: i for i, c in enumerate(self.categories)}
+
+        shape = (len(self.films), len(self.categories))
+        ones = np.ones(len(df), dtype=np.int32)
+        # Duplicate (row, col) entries are summed on conversion
+        self.counts = sparse.csr_matrix((ones, (rows, cols)), shape=shape)
+        self.wins = sparse.csr_matrix((df['won'].astype(np.int32).to_numpy(), (rows, cols)), shape=shape)
+
+    def rows_for(self, years, films):
+        """
+        Matrix row of each (year, film) pair, -1 where the film has no
+        nominations that year
+        """
+        keys = pd.MultiIndex.from_arrays([np.asarray(years), film_key(films).to_numpy()])
+        return self.films.get_indexer(keys)
+
+    def category_counts(self, rows, categories, wins=False):
+        """
+        Nominations (or wins) per row summed over `categories`
+        """
+        matrix = self.wins if wins else self.counts
+        cols = [self.category_position[c] for c in categories if c in self.category_position]
+        if not cols:
+            return np.zeros(len(rows), dtype=np.int64)
+        totals = np.asarray(matrix[:, cols].sum(axis=1)).ravel()
+        rows = np.asarray(rows)
+        return np.where(rows >= 0, totals[np.maximum(rows, 0)], 0)
+
+    def features(self, years, films, names=None):
+        """
+        Cross-nomination features for each (year, film) pair, row-aligned
+        with the inputs
+        """
+        rows = self.rows_for(years, films)
+        out = {}
+        for name in names or CROSS_FEATURES:
+            categories, kind = CROSS_FEATURES[name]
+            values = self.category_counts(rows, categories)
+            out[name] = (values > 0).astype(int) if kind == 'flag' else values
+        return pd.DataFrame(out)
+
+    def join(self, df, year_col='year', film_col='film', names=None):
+        """
+        Copy of df with the cross-nomination columns added
+        """
+        df = df.reset_index(drop=True)
+        extra = self.features(df[year_col], df[film_col], names)
+        return pd.concat([df, extra], axis=1)
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("CROSS-NOMINATION MATRIX")
+    print("=" * 50)
+
+    matrix = CrossNominations()
+    print(f"\n🎬 {matrix.counts.shape[0]:,} film-years x {matrix.counts.shape[1]} categories "
+          f"({matrix.counts.nnz:,} non-zero)")
+
+    sample = pd.DataFrame({
+        'year': [2020, 2020, 2024],
+        'film': ['Parasite', '1917', 'Oppenheimer'],
+    })
+    print("\n" + matrix.join(sample).to_string(index=False))
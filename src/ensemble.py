@@ -0,0 +1,453 @@
+"""
+Stacked Ensemble
+Collects out-of-fold per-race probabilities from every base model (the
+backtest registry - RF tiers, logits, conditional logit, boosting - plus
+the joint all-category model and the Leading Actor model) and trains a
+conditional-logit stacker on their log-probabilities. Each base model's
+OOF table is cached on its own, so adding a base model only computes that
+model's folds
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'categories'))
+
+from actor_model import ACTOR_FEATURES, actor_frame, make_actor_model
+from backtest import (MODELS, build_matrix, completed_years, make_folds, open_matrix, race_metrics, race_normalize,
+                      run_backtest)
+from conditional_logit import ConditionalLogit, race_groups
+from cross_nominations import CrossNominations, film_key
+from experiment_store import code_hash
+from feature_registry import BASIC_FEATURES, PRECURSOR_COLUMNS
+from feature_store import SOURCES, FeatureStore, file_hash
+from joint_model import (CATEGORY_GROUPS, GROUPS, JointCategoryModel, backtest as joint_backtest,
+                         canonical_category, training_frame)
+from model_registry import has_bundle, lazy_bundle, save_bundle
+
+
+OOF_ROOT = 'data/cache/ensemble/oof'
+ENSEMBLE_NAME = 'ensemble'
+
+STACKER_C = 0.1
+MIN_PROBABILITY = 1e-4
+
+ID_COLUMNS = ['year_ceremony', 'category', 'nominee', 'film', 'winner']
+
+
+# ==================== BASE MODELS ====================
+
+def base_models():
+    """
+    Every base model the stacker can use: backtest models plus the two
+    that live outside the backtest registry
+    """
+    return list(MODELS) + ['joint', 'actor_leading']
+
+
+def _code_hash(*modules):
+    return code_hash(*(sys.modules[module] for module in modules if module in sys.modules))
+
+
+def base_key(name):
+    """
+    Cache key of a base model's OOF table: changes with its config, data
+    and the code that fits it
+    """
+    if name in MODELS:
+        config = MODELS[name]
+        payload = [config['source'], config['features'], f"{config['estimator'].__module__}."
+                   f"{config['estimator'].__qualname__}", config['params'],
+                   FeatureStore(config['source']).content_hash(),
+                   _code_hash('backtest', config['estimator'].__module__)]
+    elif name == 'joint':
+        payload = [name, FeatureStore('all_categories').content_hash(),
+                   FeatureStore('best_picture_full_gg').content_hash(),
+                   _code_hash('joint_model', 'cross_nominations', 'conditional_logit')]
+    elif name == 'actor_leading':
+        payload = [name, ACTOR_FEATURES, file_hash(SOURCES['all_categories']),
+                   file_hash('data/external/acting_precursors.csv'), _code_hash('actor_model')]
+    else:
+        raise KeyError(f"Unknown base model '{name}'")
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def _actor_oof():
+    df = actor_frame()
+    folds = make_folds(completed_years(df, 'year', 'won'), 'rolling')
+    parts = []
+    for fold in folds:
+        train, test = df['year'] < fold['test_year'], df['year'] == fold['test_year']
+        model = make_actor_model().fit(df.loc[train, ACTOR_FEATURES], df.loc[train, 'won'])
+        parts.append(pd.DataFrame({
+            'year_ceremony': df.loc[test, 'year'],
+            'category': 'Leading Actor',
+            'nominee': df.loc[test, 'original_nominee'],
+            'film': df.loc[test, 'film'],
+            'winner': df.loc[test, 'won'].astype(int),
+            'probability': model.predict_proba(df.loc[test, ACTOR_FEATURES])[:, 1],
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+def compute_oof(name):
+    """
+    Rolling-origin out-of-fold predictions of one base model
+    """
+    if name in MODELS:
+        # One worker per base model already; folds run in-process
+        _, oof = run_backtest(name, 'rolling', n_workers=1, verbose=False)
+    elif name == 'joint':
+        df = training_frame()
+        folds = make_folds(completed_years(df), 'rolling')
+        oof, _, _ = joint_backtest(JointCategoryModel, df, CrossNominations(), folds)
+    elif name == 'actor_leading':
+        oof = _actor_oof()
+    else:
+        raise KeyError(f"Unknown base model '{name}'")
+
+    oof = oof[ID_COLUMNS + ['probability']].copy()
+    oof['probability'] = race_normalize(oof)
+    return oof
+
+
+def oof_path(name):
+    return os.path.join(OOF_ROOT, f'{name}_{base_key(name)}.parquet')
+
+
+def _compute_and_cache(name):
+    start = time.perf_counter()
+    oof = compute_oof(name)
+    os.makedirs(OOF_ROOT, exist_ok=True)
+    oof.to_parquet(oof_path(name), index=False)
+    return name, time.perf_counter() - start
+
+
+def collect_oof(names=None, n_workers=None):
+    """
+    {name: OOF table}, computing only the base models without a cached table
+    (in parallel, one process per base model)
+    """
+    names = names or base_models()
+    todo = [n for n in names if not os.path.exists(oof_path(n))]
+
+    if todo:
+        n_workers = min(n_workers or os.cpu_count() or 1, len(todo))
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                timings = list(pool.map(_compute_and_cache, todo))
+        else:
+            timings = [_compute_and_cache(n) for n in todo]
+        for name, seconds in timings:
+            print(f"   ⚙️ {name:<18} out-of-fold predictions computed in {seconds:.1f}s")
+
+    cached = [n for n in names if n not in todo]
+    if cached:
+        print(f"   ♻️ Reused cached OOF for {len(cached)} model(s): {', '.join(cached)}")
+    return {name: pd.read_parquet(oof_path(name)) for name in names}
+
+
+# ==================== STACKING ====================
+
+def entry_key(df):
+    """
+    Join key for one nomination across sources: Best Picture rows match on
+    film (the sources disagree on the nominee - film vs producers)
+    """
+    category = df['category'].map(canonical_category)
+    film = film_key(df['film'].fillna('')).to_numpy()
+    nominee = film_key(df['nominee'].fillna('')).to_numpy()
+    return pd.DataFrame({
+        'year_ceremony': df['year_ceremony'].astype(int).to_numpy(),
+        'category': category.to_numpy(),
+        'key': np.where(category.to_numpy() == 'Best Picture', film,
+                        pd.Series(nominee).str.cat(pd.Series(film), sep='|').to_numpy()),
+    })
+
+
+def stack_frame(predictions):
+    """
+    One row per nomination seen by any base model, one probability column
+    per model. Where a model doesn't cover a nominee its share is 1/field,
+    and each column is re-normalized within the race - a constant column
+    drops out of the race softmax, so uncovered races ignore that model.
+    """
+    frames = []
+    for name, oof in predictions.items():
+        part = entry_key(oof)
+        part['winner'] = oof['winner'].to_numpy()
+        part[name] = oof['probability'].to_numpy()
+        frames.append(part.drop_duplicates(['year_ceremony', 'category', 'key']))
+
+    keys = ['year_ceremony', 'category', 'key']
+    stacked = pd.concat([f[keys + ['winner']] for f in frames]).groupby(keys, as_index=False)['winner'].max()
+    for name, part in zip(predictions, frames):
+        stacked = stacked.merge(part[keys + [name]], on=keys, how='left')
+
+    races = stacked.groupby(['year_ceremony', 'category'])
+    field = races['key'].transform('size')
+    for name in predictions:
+        # Races the model scored at all (for like-for-like comparisons)
+        stacked[f'covers_{name}'] = races[name].transform('count') > 0
+        stacked[name] = stacked[name].fillna(1 / field)
+        stacked[name] = race_normalize(stacked, name)
+    return stacked.sort_values(keys).reset_index(drop=True)
+
+
+def stack_features(stacked, names):
+    """
+    Log-probability of every base model, one block per category group so
+    each group (picture, acting, ...) gets its own model weights
+    """
+    log_probs = np.log(np.clip(stacked[names].to_numpy(dtype=np.float64), MIN_PROBABILITY, 1))
+    groups = stacked['category'].map(canonical_category).map(CATEGORY_GROUPS).to_numpy()
+    return np.hstack([log_probs * (groups == group)[:, None] for group in GROUPS])
+
+
+def fit_stacker(stacked, names, C=STACKER_C):
+    return ConditionalLogit(C=C).fit(stack_features(stacked, names), stacked['winner'], race_groups(stacked))
+
+
+def stacker_oof(stacked, names):
+    """
+    Rolling-origin out-of-fold stacker probabilities ('ensemble' column)
+    for every year with a training history
+    """
+    folds = make_folds(completed_years(stacked), 'rolling')
+    years = stacked['year_ceremony'].to_numpy()
+    tested = np.isin(years, [f['test_year'] for f in folds])
+
+    probs = np.zeros(len(stacked))
+    for fold in folds:
+        train, test = years < fold['test_year'], years == fold['test_year']
+        stacker = fit_stacker(stacked[train], names)
+        probs[test] = stacker.predict_race_proba(stack_features(stacked[test], names),
+                                                 race_groups(stacked[test]))
+
+    scored = stacked[tested].copy()
+    scored['ensemble'] = probs[tested]
+    return scored
+
+
+def evaluate(stacked, names):
+    """
+    Rolling-origin evaluation of the stacker on the OOF table itself: over
+    all races, and against each base model on the races that model covers
+    """
+    scored = stacker_oof(stacked, names)
+
+    def metrics(column, rows):
+        frame = scored.loc[rows, ['year_ceremony', 'category', 'winner']].copy()
+        frame['probability'] = scored.loc[rows, column]
+        return race_metrics(frame)
+
+    everything = np.ones(len(scored), dtype=bool)
+    rows = [{'model': 'ensemble', 'races': 'all', **metrics('ensemble', everything)}]
+    for name in names:
+        covered = scored[f'covers_{name}'].to_numpy()
+        ours, theirs = metrics('ensemble', covered), metrics(name, covered)
+        rows.append({'model': name, 'races': 'covered', **theirs,
+                     'ensemble_log_loss': ours['race_log_loss'], 'ensemble_top1': ours['top1_accuracy']})
+    return pd.DataFrame(rows)
+
+
+# ==================== FITTED ENSEMBLE ====================
+
+def fit_base_model(name):
+    """
+    A base model refitted on all history, for this year's predictions
+    """
+    if name in MODELS:
+        config = MODELS[name]
+        m = open_matrix(build_matrix(config['source'], config['features']))
+        model = config['estimator'](**config['params'])
+        if getattr(model, 'race_aware', False):
+            return model.fit(np.asarray(m['X']), np.asarray(m['y']), groups=np.asarray(m['race']))
+        return model.fit(np.asarray(m['X']), np.asarray(m['y']))
+    if name == 'joint':
+        return JointCategoryModel().fit(training_frame())
+    if name == 'actor_leading':
+        df = actor_frame()
+        return make_actor_model().fit(df[ACTOR_FEATURES], df['won'])
+    raise KeyError(f"Unknown base model '{name}'")
+
+
+def master_layout(df):
+    """
+    Store rows -> all_categories_master columns (for the actor features)
+    """
+    return pd.DataFrame({
+        'row_id': np.arange(len(df)),
+        'year': df['year_ceremony'].to_numpy(),
+        'category': df['category'].map(canonical_category).to_numpy(),
+        'nominee': df['nominee'].to_numpy(),
+        'film': df['film'].to_numpy(),
+        'won': df['winner'].to_numpy(),
+        'total_nominations': df['total_nominations'].to_numpy(),
+    })
+
+
+def predict_base_model(name, model, df):
+    """
+    Race probabilities from one base model for the rows it covers (NaN
+    elsewhere). df holds all_categories feature-store rows.
+    """
+    probs = np.full(len(df), np.nan)
+    if name in MODELS:
+        rows = (df['category'] == 'Best Picture').to_numpy()
+        if rows.any():
+            X = df.loc[rows, MODELS[name]['features']].to_numpy(dtype=np.float64)
+            if getattr(model, 'race_aware', False):
+                probs[rows] = model.predict_proba(X, groups=race_groups(df[rows]))[:, 1]
+            else:
+                probs[rows] = model.predict_proba(X)[:, 1]
+    elif name == 'joint':
+        probs = model.predict(df)
+    elif name == 'actor_leading':
+        actors = actor_frame(master_layout(df))
+        if len(actors):
+            probs[actors['row_id'].to_numpy()] = model.predict_proba(actors[ACTOR_FEATURES])[:, 1]
+    return probs
+
+
+def base_features(name):
+    """
+    Feature-store columns predict_base_model reads for one base model
+    """
+    if name in MODELS:
+        return list(MODELS[name]['features'])
+    if name == 'joint':
+        return BASIC_FEATURES + PRECURSOR_COLUMNS
+    if name == 'actor_leading':
+        return ['total_nominations']
+    raise KeyError(f"Unknown base model '{name}'")
+
+
+class EnsembleModel:
+    """
+    Fitted base models + stacker; predict() scores any set of races
+    """
+
+    # Base models read ids, categories and films: registry bundles pass it
+    # the whole frame
+    frame_input = True
+
+    def __init__(self, names, base, stacker, metrics):
+        self.names = names
+        self.base = base
+        self.stacker = stacker
+        self.metrics = metrics
+
+    def get_params(self, deep=True):
+        return {'names': self.names}
+
+    def predict(self, df):
+        df = df.reset_index(drop=True)
+        frame = df[['year_ceremony', 'category']].copy()
+        field = frame.groupby(['year_ceremony', 'category'])['category'].transform('size')
+        for name in self.names:
+            frame[name] = predict_base_model(name, self.base[name], df)
+            frame[name] = frame[name].fillna(1 / field)
+            frame[name] = race_normalize(frame, name)
+        return self.stacker.predict_race_proba(stack_features(frame, self.names), race_groups(df))
+
+    def compare(self, name):
+        """
+        (ensemble, base model) rolling race log-loss on the races the base
+        model covers, or None if it isn't one of the base models
+        """
+        for row in self.metrics:
+            if row['model'] == name:
+                return row['ensemble_log_loss'], row['race_log_loss']
+        return None
+
+    def weights(self):
+        """
+        {group: {base model: weight}} on log-probabilities
+        """
+        coef = (self.stacker.coef_ / self.stacker.scale_).reshape(len(GROUPS), len(self.names))
+        return {group: dict(zip(self.names, row)) for group, row in zip(GROUPS, coef)}
+
+
+def train_ensemble(names=None, n_workers=None):
+    print("=" * 70)
+    print("STACKED ENSEMBLE")
+    print("=" * 70)
+
+    names = names or base_models()
+    print(f"\n📦 Base models: {', '.join(names)}")
+    predictions = collect_oof(names, n_workers)
+
+    stacked = stack_frame(predictions)
+    print(f"\n📊 {len(stacked)} nominations in "
+          f"{stacked.groupby(['year_ceremony', 'category']).ngroups} races")
+
+    metrics = evaluate(stacked, names)
+    overall = metrics.iloc[0]
+    print(f"\n🏁 Rolling evaluation - ensemble over all races: log-loss {overall['race_log_loss']:.3f} | "
+          f"top-1 {overall['top1_accuracy']:.1%}")
+    print("   Each base model vs the ensemble on the races it covers:")
+    for _, row in metrics.iloc[1:].iterrows():
+        marker = '✅' if row['ensemble_log_loss'] <= row['race_log_loss'] else '  '
+        print(f"   {marker} {row['model']:<18} {int(row['races']):>4} races | log-loss {row['race_log_loss']:.3f} "
+              f"vs {row['ensemble_log_loss']:.3f} | top-1 {row['top1_accuracy']:.1%} vs {row['ensemble_top1']:.1%}")
+
+    start = time.perf_counter()
+    stacker = fit_stacker(stacked, names)
+    if n_workers is None or n_workers > 1:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(names))) as pool:
+            base = dict(zip(names, pool.map(fit_base_model, names)))
+    else:
+        base = {name: fit_base_model(name) for name in names}
+    model = EnsembleModel(names, base, stacker, metrics.to_dict('records'))
+    print(f"\n⚖️ Stacker weights (on log-probabilities):")
+    for group, weights in model.weights().items():
+        used = {n: w for n, w in weights.items() if abs(w) > 1e-3}
+        print(f"   {group:<9} " + ', '.join(f"{n} {w:+.2f}" for n, w in
+                                          sorted(used.items(), key=lambda item: -abs(item[1]))))
+
+    fit_seconds = time.perf_counter() - start
+
+    # Imported here: calibration imports this module
+    from calibration import attach_calibrator
+    calibrator = attach_calibrator('ensemble', model)
+    print(f"\n📐 Calibrated in {calibrator.fit_seconds_:.2f}s: "
+          f"{(calibrator.summary_['method'] != 'identity').sum()} of {len(calibrator.summary_)} categories mapped")
+
+    # Schema: every column a base model reads; metrics: the rolling
+    # evaluation, with the joint model comparison the prediction script
+    # chooses on (from the manifest, before anything is loaded)
+    df = training_frame()
+    features = list(dict.fromkeys(f for name in names for f in base_features(name)))
+    summary = {k: float(overall[k]) for k in ['race_log_loss', 'top1_accuracy', 'brier', 'roc_auc']}
+    summary['races'] = int(overall['races'])
+    if model.compare('joint') is not None:
+        ours, joint = model.compare('joint')
+        summary.update({'ensemble_log_loss_vs_joint': float(ours), 'joint_log_loss': float(joint)})
+    data = hashlib.sha1(json.dumps([base_key(name) for name in names]).encode()).hexdigest()[:12]
+    # Forest base models: loaded into memory, not mapped
+    path = save_bundle(ENSEMBLE_NAME, model, df[features], data, summary, years=df['year_ceremony'])
+    print(f"\n💾 Ensemble ({len(names)} base models, fitted in {fit_seconds:.1f}s) "
+          f"saved to {path}")
+    return model
+
+
+def load_ensemble():
+    """
+    Registered ensemble (loaded on the first prediction), or None
+    """
+    return lazy_bundle(ENSEMBLE_NAME) if has_bundle(ENSEMBLE_NAME) else None
+
+
+if __name__ == "__main__":
+    # python src/ensemble.py [base model ...]
+    # (through the module, so the artifact unpickles outside this script)
+    import ensemble
+    ensemble.train_ensemble(sys.argv[1:] or None)
@@ -0,0 +1,185 @@
+"""
+Local Experiment Store
+Records every training run - params, code / data / feature-registry hashes,
+metrics and artifacts - in a SQLite table plus an artifact directory. A run
+is keyed by (code, data, params): when an identical run is already stored,
+training is skipped and its artifacts are restored into models/ with the
+cached metrics, so sweeps and reruns cost next to nothing
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from feature_registry import registry_hash
+
+
+STORE_ROOT = 'experiments'
+DB_PATH = os.path.join(STORE_ROOT, 'runs.db')
+ARTIFACT_ROOT = os.path.join(STORE_ROOT, 'artifacts')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created TEXT NOT NULL,
+    code_hash TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    registry_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    artifacts TEXT NOT NULL,
+    seconds REAL
+)
+"""
+
+
+# ==================== HASHES ====================
+
+def _digest(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def code_hash(*modules):
+    """
+    Hash of the source files of the given modules (the training script and
+    the project modules whose code decides what it trains)
+    """
+    digest = hashlib.sha1()
+    for module in modules:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def frame_hash(df):
+    """
+    Hash of the exact rows and columns a model is trained on
+    """
+    values = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(values.tobytes() + ','.join(map(str, df.columns)).encode()).hexdigest()[:12]
+
+
+def run_key(name, code, data, params):
+    return _digest({'name': name, 'code': code, 'data': data, 'params': params})
+
+
+# ==================== STORE ====================
+
+class ExperimentStore:
+    """
+    experiments/runs.db (one row per run) + experiments/artifacts/<run key>/
+    """
+
+    def __init__(self, root=STORE_ROOT):
+        self.root = root
+        self.db_path = os.path.join(root, 'runs.db')
+        self.artifact_root = os.path.join(root, 'artifacts')
+        os.makedirs(self.artifact_root, exist_ok=True)
+        with self._connect() as db:
+            db.execute(SCHEMA)
+
+    def _connect(self):
+        # Parallel sweeps may write at once: wait on the lock instead of failing
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key):
+        """
+        The stored run with this key, or None (also when its artifacts are gone)
+        """
+        with self._connect() as db:
+            db.row_factory = sqlite3.Row
+            row = db.execute('SELECT * FROM runs WHERE run_key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        for column in ('params', 'metrics', 'artifacts'):
+            run[column] = json.loads(run[column])
+        if not all(os.path.exists(stored) for stored in run['artifacts'].values()):
+            return None
+        return run
+
+    def record(self, key, name, code, data, params, metrics, artifacts, seconds):
+        """
+        Copy the run's artifact files into the store and insert its row
+        """
+        folder = os.path.join(self.artifact_root, key)
+        os.makedirs(folder, exist_ok=True)
+        stored = {}
+        for path in artifacts:
+            stored[path] = os.path.join(folder, os.path.basename(path))
+            shutil.copy2(path, stored[path])
+
+        with self._connect() as db:
+            db.execute('INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+                key, name, datetime.now().isoformat(timespec='seconds'), code, data, registry_hash(),
+                json.dumps(params, sort_keys=True, default=str), json.dumps(metrics), json.dumps(stored),
+                seconds,
+            ))
+        return self.get(key)
+
+    def restore(self, run):
+        """
+        Copy a stored run's artifacts back to where the training script writes them
+        """
+        for path, stored in run['artifacts'].items():
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            shutil.copy2(stored, path)
+
+    def runs(self, name=None):
+        """
+        Every stored run (newest first), one column per param and metric
+        """
+        query = 'SELECT * FROM runs' + (' WHERE name = ?' if name else '') + ' ORDER BY created DESC'
+        with self._connect() as db:
+            df = pd.read_sql_query(query, db, params=(name,) if name else ())
+        if df.empty:
+            return df
+        params = pd.json_normalize(df['params'].map(json.loads).tolist()).add_prefix('param.')
+        metrics = pd.json_normalize(df['metrics'].map(json.loads).tolist())
+        return pd.concat([df.drop(columns=['params', 'metrics', 'artifacts']), params, metrics], axis=1)
+
+
+def tracked_run(name, params, data, train, code_modules=(), store=None, force=False):
+    """
+    Run train() -> (metrics dict, artifact paths) unless a run with the same
+    (name, code, data, params) key is stored, in which case its artifacts are
+    restored and the stored run is returned instead. Returns the run dict,
+    with run['cached'] telling which happened.
+
+    data: hash of the training data (frame_hash of the training frame)
+    """
+    store = store or ExperimentStore()
+    code = code_hash(*code_modules)
+    key = run_key(name, code, data, params)
+
+    run = None if force else store.get(key)
+    if run is not None:
+        store.restore(run)
+        print(f"\n♻️ Identical run {key} found ({run['created']}): training skipped, artifacts restored")
+        run['cached'] = True
+        return run
+
+    start = time.perf_counter()
+    metrics, artifacts = train()
+    run = store.record(key, name, code, data, params, metrics, artifacts, time.perf_counter() - start)
+    print(f"\n🗄️ Run {key} recorded in {store.db_path}")
+    run['cached'] = False
+    return run
+
+
+if __name__ == "__main__":
+    # python src/experiment_store.py [run name]
+    runs = ExperimentStore().runs(sys.argv[1] if len(sys.argv) > 1 else None)
+    if runs.empty:
+        print("No runs recorded yet")
+    else:
+        with pd.option_context('display.max_columns', None, 'display.width', 200):
+            print(runs.drop(columns=['run_key', 'code_hash', 'data_hash', 'registry_hash']).to_string(index=False))
@@ -0,0 +1,185 @@
+"""
+Feature Registry
+Single definition of every model feature: the columns it reads, the group
+it is computed within, and one vectorized implementation
+"""
+
+import hashlib
+import inspect
+
+from race_kernels import RaceIndex, race_max_flag, race_rank, race_ratio, race_share
+
+
+# A "race" is one Oscar category in one ceremony year
+RACE_KEY = ['year_ceremony', 'category']
+
+PRECURSOR_COLUMNS = ['won_gg_drama', 'won_gg_musical', 'won_bafta', 'won_sag_cast']
+
+# What a precursor column records depends on the race: the stores keep one
+# column per precursor award and each category's rows hold that award's
+# equivalent for the category (0 for categories without one). Models that
+# pool categories (joint_model.py) see the columns with these meanings.
+PRECURSOR_MEANINGS = {
+    'won_gg_drama': {
+        'Best Picture': 'Golden Globe, Best Motion Picture - Drama',
+        'acting': "Golden Globe in the nominee's acting category (drama or musical/comedy)",
+    },
+    'won_gg_musical': {
+        'Best Picture': 'Golden Globe, Best Motion Picture - Musical or Comedy',
+        'acting': '0 - acting Globes are recorded in won_gg_drama',
+    },
+    'won_bafta': {
+        'Best Picture': 'BAFTA Best Film',
+        'acting': "BAFTA in the nominee's acting category",
+    },
+    'won_sag_cast': {
+        'Best Picture': 'SAG Outstanding Performance by a Cast',
+        'acting': "SAG award in the nominee's acting category",
+    },
+}
+
+FEATURES = {}
+
+
+class Feature:
+    """
+    A registered feature (see register())
+    """
+
+    def __init__(self, name, inputs, group, func):
+        self.name = name
+        self.inputs = list(inputs)
+        self.group = list(group) if group else None
+        self.func = func
+
+    def signature(self):
+        group = ','.join(self.group or [])
+        return f"{self.name}|{','.join(self.inputs)}|{group}|{inspect.getsource(self.func)}"
+
+
+def register(name, inputs, group=None):
+    """
+    Decorator: func(df, groups) -> Series or array, where groups is a
+    race_kernels.RaceIndex over the `group` columns (None for row-wise
+    features). Features may use earlier ones as
+    inputs, so registration order is computation order.
+    """
+    def decorator(func):
+        FEATURES[name] = Feature(name, inputs, group, func)
+        return func
+    return decorator
+
+
+# ==================== NOMINATION FEATURES ====================
+
+@register('nomination_share', inputs=['total_nominations'], group=RACE_KEY)
+def nomination_share(df, groups):
+    # Share of all nominations earned by this race's nominees
+    return race_share(groups, df['total_nominations'].to_numpy())
+
+
+@register('nom_ratio', inputs=['total_nominations'], group=RACE_KEY)
+def nom_ratio(df, groups):
+    # Nominations vs. the race average (1.0 = average nominee)
+    return race_ratio(groups, df['total_nominations'].to_numpy())
+
+
+@register('is_top_nominated', inputs=['total_nominations'], group=RACE_KEY)
+def is_top_nominated(df, groups):
+    return race_max_flag(groups, df['total_nominations'].to_numpy())
+
+
+@register('nom_rank', inputs=['total_nominations'], group=RACE_KEY)
+def nom_rank(df, groups):
+    return race_rank(groups, df['total_nominations'].to_numpy())
+
+
+# ==================== PRECURSOR FEATURES ====================
+
+@register('total_precursor_wins', inputs=PRECURSOR_COLUMNS)
+def total_precursor_wins(df, groups):
+    return df[PRECURSOR_COLUMNS].sum(axis=1)
+
+
+@register('has_precursor_win', inputs=['total_precursor_wins'])
+def has_precursor_win(df, groups):
+    return (df['total_precursor_wins'] > 0).astype(int)
+
+
+@register('precursor_sweep', inputs=PRECURSOR_COLUMNS)
+def precursor_sweep(df, groups):
+    # Won all 3 majors: a Golden Globe (either), BAFTA and SAG
+    return (
+        ((df['won_gg_drama'] == 1) | (df['won_gg_musical'] == 1)) &
+        (df['won_bafta'] == 1) &
+        (df['won_sag_cast'] == 1)
+    ).astype(int)
+
+
+# ==================== FEATURE SETS ====================
+
+BASIC_FEATURES = [
+    'total_nominations',
+    'nomination_share',
+    'nom_ratio',
+    'is_top_nominated',
+    'nom_rank',
+]
+
+ENHANCED_FEATURES = BASIC_FEATURES + PRECURSOR_COLUMNS + [
+    'total_precursor_wins',
+    'has_precursor_win',
+    'precursor_sweep',
+]
+
+
+def registry_hash():
+    """
+    Short hash of every feature definition - changes whenever a feature's
+    inputs, grouping or code changes
+    """
+    digest = hashlib.sha256()
+    for feature in FEATURES.values():
+        digest.update(feature.signature().encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def dependents(columns):
+    """
+    Registered features that read any of `columns`, directly or through
+    another feature, in computation order
+    """
+    changed = set(columns)
+    names = []
+    for feature in FEATURES.values():
+        if changed.intersection(feature.inputs):
+            names.append(feature.name)
+            changed.add(feature.name)
+    return names
+
+
+def compute_features(df, names=None):
+    """
+    Add registered features to a copy of df (all of them by default)
+    """
+    df = df.copy()
+    for column in PRECURSOR_COLUMNS:
+        if column not in df.columns:
+            df[column] = 0
+        df[column] = df[column].fillna(0)
+
+    wanted = set(names or FEATURES)
+    # One sort per grouping key, shared by every feature that uses it
+    grouped = {}
+    for feature in FEATURES.values():
+        if feature.name not in wanted:
+            continue
+        groups = None
+        if feature.group:
+            key = tuple(feature.group)
+            if key not in grouped:
+                grouped[key] = RaceIndex.from_frame(df, feature.group)
+            groups = grouped[key]
+        df[feature.name] = feature.func(df, groups)
+
+    return df
@@ -0,0 +1,463 @@
+"""
+Materialized Feature Store
+Computes the feature registry once and caches the full feature matrix on
+disk, one Parquet file per ceremony year, versioned by the registry hash.
+Training and prediction both read from here so their features can't drift
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from feature_registry import FEATURES, PRECURSOR_COLUMNS, compute_features, dependents, registry_hash
+
+
+STORE_ROOT = 'data/features'
+
+SOURCES = {
+    'best_picture': 'data/processed/master_dataset.csv',
+    'best_picture_full_gg': 'data/processed/oscar_with_full_gg_matched.csv',
+    'all_categories': 'data/processed/all_categories_master.csv',
+}
+
+ID_COLUMNS = ['year_ceremony', 'category', 'nominee', 'film', 'winner']
+
+# all_categories_master column -> store column
+ALL_CATEGORIES_COLUMNS = {'year': 'year_ceremony', 'won': 'winner'}
+
+FIRST_CEREMONY_YEAR = 1929
+
+# Precursor award name -> store column
+PRECURSOR_AWARDS = {
+    'gg_drama': 'won_gg_drama',
+    'gg_musical': 'won_gg_musical',
+    'bafta': 'won_bafta',
+    'sag': 'won_sag_cast',
+}
+
+# Ceremony category names -> the names the historical sources use, so rows
+# added for a new year land in the same races
+CATEGORY_ALIASES = {
+    'Best Actor in a Leading Role': 'Leading Actor',
+    'Best Actress in a Leading Role': 'Leading Actress',
+    'Best Actor in a Supporting Role': 'Supporting Actor',
+    'Best Actress in a Supporting Role': 'Supporting Actress',
+    'Best Actor': 'Leading Actor',
+    'Best Actress': 'Leading Actress',
+    'Best Supporting Actor': 'Supporting Actor',
+    'Best Supporting Actress': 'Supporting Actress',
+    'Best Director': 'Director',
+    'Best Cinematography': 'Cinematography',
+    'Best Film Editing': 'Film Editing',
+}
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def load_base_frame(source='best_picture'):
+    """
+    Load a source CSV in the store's common layout: one row per nominee with
+    year_ceremony, category, nominee, film, winner, total_nominations and
+    the precursor columns (0 where the source has none)
+    """
+    df = pd.read_csv(SOURCES[source])
+
+    if source == 'all_categories':
+        df = df.rename(columns=ALL_CATEGORIES_COLUMNS)
+    else:
+        df['category'] = 'Best Picture'
+        df['nominee'] = df['film']
+
+    df['winner'] = df['winner'].astype(int)
+    df['total_nominations'] = df['total_nominations'].fillna(0)
+    for column in PRECURSOR_COLUMNS:
+        if column not in df.columns:
+            df[column] = 0
+        df[column] = df[column].fillna(0).astype(int)
+
+    others = [c for c in df.columns if c not in ID_COLUMNS]
+    return df[ID_COLUMNS + others].reset_index(drop=True)
+
+
+def source_rows(source, rows):
+    """
+    Rows of one race in the store layout (e.g. read from another source's
+    store) reshaped to `source`'s own columns, as load_base_frame gives
+    them, so they can be passed to that store's add_year. Columns the rows
+    don't carry are left empty.
+    """
+    raw = pd.read_csv(SOURCES[source], nrows=0).rename(columns=ALL_CATEGORIES_COLUMNS)
+    rows = rows.copy()
+    if source != 'all_categories':
+        # The Best Picture sources: one row per film, producers in `name`
+        rows['name'] = rows['nominee']
+        rows['nominee'] = rows['film']
+        rows['category'] = 'Best Picture'
+        rows['canon_category'] = 'BEST PICTURE'
+        rows['year_film'] = rows['year_ceremony'] - 1
+        rows['ceremony'] = rows['year_ceremony'] - FIRST_CEREMONY_YEAR + 1
+
+    others = [c for c in raw.columns if c not in ID_COLUMNS]
+    columns = ID_COLUMNS + others + [c for c in PRECURSOR_COLUMNS if c not in others]
+    rows = rows.reindex(columns=columns)
+    rows['total_nominations'] = rows['total_nominations'].fillna(0)
+    rows[PRECURSOR_COLUMNS] = rows[PRECURSOR_COLUMNS].fillna(0).astype(int)
+    return rows
+
+
+def store_category(name):
+    """
+    The source's name for a category (names without an alias are kept)
+    """
+    return CATEGORY_ALIASES.get(name, name)
+
+
+def precursor_column(award):
+    column = PRECURSOR_AWARDS.get(award.lower(), award.lower())
+    if column not in PRECURSOR_COLUMNS:
+        raise ValueError(f"Unknown precursor award '{award}' "
+                         f"(expected one of {sorted(PRECURSOR_AWARDS)})")
+    return column
+
+
+def set_precursor_result(df, result):
+    """
+    Apply one precursor result in place: the winner's row gets 1 and the
+    rest of its race 0. Returns the race's row mask.
+    """
+    return _mark_winner(df, result, precursor_column(result['award']))
+
+
+def set_ceremony_result(df, result):
+    """
+    Apply one Oscar result in place (the `winner` column); same matching
+    as set_precursor_result
+    """
+    return _mark_winner(df, result, 'winner')
+
+
+def _mark_winner(df, result, column):
+    race = (df['year_ceremony'] == result['year']) & (df['category'] == store_category(result['category']))
+    if not race.any():
+        raise ValueError(f"No {result['category']} race in {result['year']}")
+
+    name = result['winner'].casefold()
+    won = race & ((df['nominee'].astype(str).str.casefold() == name) |
+                  (df['film'].astype(str).str.casefold() == name))
+    if not won.any():
+        raise ValueError(f"'{result['winner']}' is not a {result['year']} {result['category']} nominee")
+
+    df.loc[race, column] = 0
+    df.loc[won, column] = 1
+    return race
+
+
+class FeatureStore:
+    """
+    data/features/<source>/<registry hash>/year=YYYY.parquet + manifest.json
+    """
+
+    def __init__(self, source='best_picture', root=STORE_ROOT):
+        self.source = source
+        self.version = registry_hash()
+        self.path = os.path.join(root, source, self.version)
+        self.manifest_path = os.path.join(self.path, 'manifest.json')
+        # Precursor and ceremony results survive re-materialization and
+        # registry changes
+        self.results_path = os.path.join(root, source, 'precursor_results.jsonl')
+        self.winners_path = os.path.join(root, source, 'ceremony_results.jsonl')
+        # So do the input rows of years added after the source was built
+        self.added_path = os.path.join(root, source, 'added')
+
+    # -------------------- manifest --------------------
+
+    def read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def write_manifest(self, manifest):
+        manifest['updated'] = datetime.now().isoformat(timespec='seconds')
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def is_current(self):
+        """
+        True when the store was built from the current source file
+        """
+        manifest = self.read_manifest()
+        if manifest is None:
+            return False
+        source_path = SOURCES.get(self.source)
+        return source_path is None or manifest['source_hash'] == file_hash(source_path)
+
+    def content_hash(self):
+        """
+        Hash of everything stored: source, registry version, every
+        partition's contents and the pending years (materializing first if
+        the store isn't current)
+        """
+        if not self.is_current():
+            self.materialize()
+        manifest = self.read_manifest()
+        partitions = {year: file_hash(self.year_path(year)) for year in sorted(manifest['years'])}
+        payload = [manifest['source_hash'], self.version, partitions, manifest.get('pending', [])]
+        return hashlib.sha1(json.dumps(payload).encode()).hexdigest()[:12]
+
+    def year_path(self, year):
+        return os.path.join(self.path, f'year={int(year)}.parquet')
+
+    def added_rows(self):
+        """
+        Input rows of every year added with add_year that the source
+        itself doesn't have
+        """
+        if not os.path.isdir(self.added_path):
+            return pd.DataFrame()
+        parts = [pd.read_parquet(os.path.join(self.added_path, name))
+                 for name in sorted(os.listdir(self.added_path)) if name.endswith('.parquet')]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+    # -------------------- build --------------------
+
+    def materialize(self, base=None):
+        """
+        Compute every registered feature over the source (plus the years
+        added since) and write one partition per ceremony year
+        """
+        base = load_base_frame(self.source) if base is None else base
+        added = self.added_rows()
+        if len(added):
+            added = added[~added['year_ceremony'].isin(base['year_ceremony'])]
+            base = pd.concat([base, added], ignore_index=True)
+        features = compute_features(self.replay_results(base))
+
+        os.makedirs(self.path, exist_ok=True)
+        years, pending = {}, []
+        for year, part in features.groupby('year_ceremony'):
+            part.to_parquet(self.year_path(year), index=False)
+            years[str(int(year))] = len(part)
+            if part['winner'].max() <= 0:
+                pending.append(int(year))
+
+        source_path = SOURCES.get(self.source)
+        self.write_manifest({
+            'source': self.source,
+            'source_hash': file_hash(source_path) if source_path else None,
+            'registry_hash': self.version,
+            'features': {name: {'inputs': f.inputs, 'group': f.group} for name, f in FEATURES.items()},
+            'years': years,
+            'pending': pending,
+            'stale': [],
+        })
+
+        print(f"💾 Materialized {len(features)} rows x {len(FEATURES)} features "
+              f"({len(years)} years) to {self.path}")
+        return features
+
+    def add_year(self, rows):
+        """
+        Compute features for one new ceremony year (e.g. this year's
+        nominees) and store it as its own partition. Category names are
+        mapped to the source's names (the given name is kept in
+        display_category); a year with no winner yet is flagged pending and
+        left out of load() until record_winner fills it in.
+        """
+        years = rows['year_ceremony'].unique()
+        if len(years) != 1:
+            raise ValueError(f"add_year expects one ceremony year, got {sorted(years)}")
+        year = int(years[0])
+
+        rows = rows.copy()
+        if 'display_category' not in rows.columns:
+            rows['display_category'] = rows['category']
+        rows['category'] = rows['category'].map(store_category)
+
+        # Kept outside the versioned partitions so re-materializing (new
+        # source file or registry) brings the year back
+        os.makedirs(self.added_path, exist_ok=True)
+        rows.to_parquet(os.path.join(self.added_path, f'year={year}.parquet'), index=False)
+
+        manifest = self.read_manifest()
+        if manifest is None:
+            self.materialize()
+            manifest = self.read_manifest()
+
+        features = compute_features(self.replay_results(rows))
+        features.to_parquet(self.year_path(year), index=False)
+        manifest['years'][str(year)] = len(features)
+        self._set_pending(manifest, year, features['winner'].max() <= 0)
+        self.write_manifest(manifest)
+
+        return features
+
+    @staticmethod
+    def _set_pending(manifest, year, pending):
+        years = set(manifest.get('pending', []))
+        years = years | {year} if pending else years - {year}
+        manifest['pending'] = sorted(years)
+
+    # -------------------- precursor results --------------------
+
+    def logged_results(self, path=None):
+        path = path or self.results_path
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def replay_results(self, df):
+        """
+        Re-apply logged precursor and ceremony results to freshly loaded rows
+        """
+        df = df.copy()
+        for column in PRECURSOR_COLUMNS:
+            if column not in df.columns:
+                df[column] = 0
+        for result in self.logged_results():
+            if (df['year_ceremony'] == result['year']).any():
+                set_precursor_result(df, result)
+        for result in self.logged_results(self.winners_path):
+            if (df['year_ceremony'] == result['year']).any():
+                set_ceremony_result(df, result)
+        return df
+
+    def apply_precursor_result(self, award, category, winner, year=2026):
+        """
+        Record one precursor result (e.g. 'bafta', 'Best Picture', 'Hamnet')
+        and recompute only the features that depend on it, for that race
+        only. The race's predictions are marked stale.
+        """
+        start = time.perf_counter()
+        category = store_category(category)
+        result = {'award': award, 'category': category, 'winner': winner, 'year': int(year)}
+        column = precursor_column(award)
+
+        manifest = self.read_manifest()
+        if manifest is None or str(result['year']) not in manifest['years']:
+            raise ValueError(f"{self.source} has no materialized {result['year']} partition")
+
+        part = pd.read_parquet(self.year_path(result['year']))
+        race = set_precursor_result(part, result)
+
+        names = dependents([column])
+        part.loc[race, names] = compute_features(part[race], names)[names]
+        part.to_parquet(self.year_path(result['year']), index=False)
+
+        with open(self.results_path, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+
+        stale = [result['year'], category]
+        if stale not in manifest.setdefault('stale', []):
+            manifest['stale'].append(stale)
+        self.write_manifest(manifest)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"⚡ {award} → {winner} ({year} {category}): recomputed {', '.join(names)} "
+              f"for {int(race.sum())} rows in {elapsed_ms:.1f} ms")
+        return part[race]
+
+    def record_winner(self, category, winner, year=2026):
+        """
+        Record one Oscar result once the ceremony is over. No feature reads
+        `winner`, so only the partition's label column changes; the year
+        stops being pending once it has a winner.
+        """
+        result = {'category': store_category(category), 'winner': winner, 'year': int(year)}
+        manifest = self.read_manifest()
+        if manifest is None or str(result['year']) not in manifest['years']:
+            raise ValueError(f"{self.source} has no materialized {result['year']} partition")
+
+        part = pd.read_parquet(self.year_path(result['year']))
+        race = set_ceremony_result(part, result)
+        part.to_parquet(self.year_path(result['year']), index=False)
+
+        with open(self.winners_path, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+
+        self._set_pending(manifest, result['year'], False)
+        self.write_manifest(manifest)
+        return part[race]
+
+    def stale_races(self):
+        """
+        (year, category) races whose features changed since their
+        predictions were last written
+        """
+        manifest = self.read_manifest() or {}
+        return [tuple(race) for race in manifest.get('stale', [])]
+
+    def clear_stale(self, races=None):
+        """
+        Mark races (default: all) as freshly predicted
+        """
+        manifest = self.read_manifest()
+        if manifest is None:
+            return
+        done = None if races is None else {tuple(r) for r in races}
+        manifest['stale'] = [r for r in manifest.get('stale', [])
+                             if done is not None and tuple(r) not in done]
+        self.write_manifest(manifest)
+
+    # -------------------- read --------------------
+
+    def load(self, years=None, include_pending=False):
+        """
+        Read the feature matrix (materializing it first if it's missing or
+        its source changed). Pending years - nominees without a winner -
+        are only read with include_pending=True.
+        """
+        if not self.is_current():
+            self.materialize()
+
+        manifest = self.read_manifest()
+        stored = sorted(int(y) for y in manifest['years'])
+        wanted = stored if years is None else [y for y in stored if y in set(years)]
+        if not include_pending:
+            pending = set(manifest.get('pending', []))
+            wanted = [y for y in wanted if y not in pending]
+
+        parts = [pd.read_parquet(self.year_path(y)) for y in wanted]
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, ignore_index=True)
+
+
+def load_features(source='best_picture', years=None, include_pending=False):
+    """
+    Shortcut used by the training and prediction scripts
+    """
+    return FeatureStore(source).load(years, include_pending)
+
+
+if __name__ == "__main__":
+    # python src/feature_store.py result <award> "<category>" "<winner>" [year] [source]
+    if len(sys.argv) >= 5 and sys.argv[1] == 'result':
+        award, category, winner = sys.argv[2:5]
+        year = int(sys.argv[5]) if len(sys.argv) > 5 else 2026
+        source = sys.argv[6] if len(sys.argv) > 6 else 'all_categories'
+        store = FeatureStore(source)
+        store.apply_precursor_result(award, category, winner, year)
+        print(f"♻️ Stale races: {store.stale_races()}")
+        sys.exit(0)
+
+    print("=" * 60)
+    print("FEATURE STORE")
+    print("=" * 60)
+    print(f"\n🔑 Registry hash: {registry_hash()}")
+
+    for source_name in SOURCES:
+        print(f"\n📂 {source_name}")
+        FeatureStore(source_name).materialize()
@@ -0,0 +1,291 @@
+"""
+Precursor Boost Factors Fitted on History
+Estimates the multiplicative odds factor of every (precursor award, Oscar
+category) pair - the number the 2026 update scripts multiply a precursor
+winner's probability by before renormalizing - by maximum likelihood over
+historical races. One penalized race-softmax fit covers every category at
+once; a category's factor is shrunk towards the precursor's pooled effect,
+and that towards no boost at all, so sparse categories borrow strength
+instead of getting extreme or hand-picked values. Every pair is in the
+table - one without precursor history gets the pooled effect. The table is
+versioned by its input data and settings, like the category models
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'categories'))
+
+from category_factory import ACTING_PRECURSORS_PATH, merge_acting_precursors
+from cross_nominations import film_key
+from feature_store import PRECURSOR_AWARDS, SOURCES, file_hash
+from joint_model import CATEGORY_GROUPS, canonical_category, training_frame
+from race_kernels import RaceIndex
+
+
+ARTIFACT_ROOT = 'models/boost_factors'
+MANIFEST_PATH = os.path.join(ARTIFACT_ROOT, 'manifest.json')
+
+# Best Picture precursor results not in the matched Golden Globe dataset
+PICTURE_PRECURSOR_FILES = {
+    'won_bafta': 'data/external/bafta.csv',
+    'won_sag_cast': 'data/external/sag_awards.csv',
+}
+
+# SAG lead actor nominees by film year (scrapers/scrape_acting_precursors.py
+# flags every nominee; the winner is listed first)
+SAG_ACTOR_PATH = 'data/external/sag_actor_winners.csv'
+
+PRECURSORS = list(PRECURSOR_AWARDS)          # gg_drama, gg_musical, bafta, sag
+CATEGORIES = list(CATEGORY_GROUPS)
+
+# Factors are measured on top of nomination strength - the update scripts
+# boost model probabilities that already reflect it
+CONTROLS = ['nomination_share', 'is_top_nominated']
+
+# Gaussian prior precision (inverse variance) of each log-odds level, all
+# centred on no boost: all precursors (sd 0.5), one precursor across
+# categories (sd 0.35), one category's deviation (sd 0.35). A handful of
+# races moves a factor a little (7 Best Picture SAG races: x4, not x10).
+PRIOR_PRECISION = {'global': 4.0, 'precursor': 8.0, 'category': 8.0, 'control': 0.01}
+
+# Informative races for a factor to count as the category's own estimate;
+# below this it is mostly the pooled effect ('shrunk'), at 0 entirely ('pooled')
+MIN_RACES = 10
+
+
+# ==================== DATA ====================
+
+def precursor_frame():
+    """
+    Historical nominees of every category with their precursor wins:
+    Golden Globes for Best Picture (matched dataset), BAFTA Best Film and
+    SAG ensemble for Best Picture, SAG lead actor, manually collected
+    acting precursors
+    """
+    df = merge_sag_actor_history(merge_acting_precursors(training_frame()))
+
+    picture = (df['category'] == 'Best Picture').to_numpy()
+    target = pd.MultiIndex.from_arrays([df['year_ceremony'], film_key(df['film'])])
+    for column, path in PICTURE_PRECURSOR_FILES.items():
+        results = pd.read_csv(path)
+        source = pd.MultiIndex.from_arrays([results['year'], film_key(results['film'])])
+        position = source.get_indexer(target)
+        found = picture & (position >= 0)
+        values = df[column].fillna(0).to_numpy(dtype=np.float64, copy=True)
+        values[found] = np.maximum(values[found], results[column].to_numpy(dtype=np.float64)[position[found]])
+        df[column] = values
+
+    df['category'] = df['category'].map(canonical_category)
+    return df
+
+
+def merge_sag_actor_history(df):
+    """
+    SAG lead actor wins onto Leading Actor rows ('sag' for that category -
+    see feature_registry.PRECURSOR_MEANINGS)
+    """
+    sag = pd.read_csv(SAG_ACTOR_PATH)
+    sag['nominee'] = sag['nominee'].str.replace(r'[‡†]', '', regex=True).str.strip()
+    winners = sag.groupby('year', sort=False).head(1)
+
+    actor = (df['category'] == 'Leading Actor').to_numpy()
+    ceremonies = set(sag['year'] + 1)
+    covered = actor & df['year_ceremony'].isin(ceremonies).to_numpy()
+
+    source = pd.MultiIndex.from_arrays([winners['year'] + 1, film_key(winners['nominee'])])
+    target = pd.MultiIndex.from_arrays([df['year_ceremony'], film_key(df['nominee'])])
+    won = covered & (source.get_indexer(target) >= 0)
+
+    values = df['won_sag_cast'].fillna(0).to_numpy(dtype=np.float64, copy=True)
+    values[covered] = won[covered]
+    df['won_sag_cast'] = values
+    return df
+
+
+def data_version():
+    """
+    Hash of the inputs and settings - changes whenever the table would
+    """
+    payload = [file_hash(SOURCES['all_categories']), file_hash(SOURCES['best_picture_full_gg']),
+               file_hash(ACTING_PRECURSORS_PATH), file_hash(SAG_ACTOR_PATH),
+               *[file_hash(p) for p in PICTURE_PRECURSOR_FILES.values()],
+               CONTROLS, PRIOR_PRECISION, MIN_RACES]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:12]
+
+
+# ==================== FIT ====================
+
+def fit_factors(df):
+    """
+    Penalized race-softmax fit of every (category, precursor) log-odds at
+    once: log-odds = global + precursor + category deviation. Returns the
+    (categories x precursors) log-odds matrix and the control coefficients.
+    """
+    columns = list(PRECURSOR_AWARDS.values())
+    X = df[columns].fillna(0).to_numpy(dtype=np.float64)
+    Z = df[CONTROLS].fillna(0).to_numpy(dtype=np.float64)
+    y = df['winner'].fillna(0).to_numpy(dtype=np.float64)
+    onehot = (df['category'].to_numpy()[:, None] == np.array(CATEGORIES)[None, :]).astype(np.float64)
+
+    # Rows sorted by race once; only races with a winner carry likelihood
+    index = RaceIndex.from_frame(df)
+    keep = index.reduce(np.add, y)[index.race_id] > 0
+    index = RaceIndex.from_frame(df[keep])
+    order = np.flatnonzero(keep)[index.order]
+    X, Z, y, onehot = X[order], Z[order], y[order], onehot[order]
+    starts = index.starts
+    sorted_race = np.repeat(np.arange(index.n_races), index.sizes)
+    winners = np.add.reduceat(y, starts)
+
+    P, C, K = len(PRECURSORS), len(CATEGORIES), len(CONTROLS)
+    sizes = [1, P, C * P, K]
+    precision = np.concatenate([np.full(n, PRIOR_PRECISION[level]) for n, level in
+                                zip(sizes, ['global', 'precursor', 'category', 'control'])])
+
+    def unpack(w):
+        g, mu, delta, gamma = np.split(w, np.cumsum(sizes)[:-1])
+        return g[0], mu, delta.reshape(C, P), gamma
+
+    def objective(w):
+        g, mu, delta, gamma = unpack(w)
+        row_delta = onehot @ delta
+        scores = X @ (g + mu) + (X * row_delta).sum(axis=1) + Z @ gamma
+
+        maxima = np.maximum.reduceat(scores, starts)
+        exp = np.exp(scores - maxima[sorted_race])
+        totals = np.add.reduceat(exp, starts)
+        nll = winners @ (maxima + np.log(totals)) - y @ scores
+
+        # d nll / d score of each row
+        r = winners[sorted_race] * exp / totals[sorted_race] - y
+        grad = np.concatenate([[r @ X.sum(axis=1)], r @ X, (onehot.T @ (r[:, None] * X)).ravel(), r @ Z])
+        return nll + 0.5 * precision @ (w * w), grad + precision * w
+
+    result = minimize(objective, np.zeros(sum(sizes)), jac=True, method='L-BFGS-B',
+                      options={'maxiter': 1000, 'gtol': 1e-8})
+    g, mu, delta, gamma = unpack(result.x)
+    return g + mu[None, :] + delta, dict(zip(CONTROLS, gamma))
+
+
+def evidence(df):
+    """
+    Per (category, precursor): races where the precursor separates the
+    nominees, precursor winners nominated, and how many of them won
+    """
+    rows = []
+    for category, group in df.groupby('category'):
+        races = group.groupby(['year_ceremony'])
+        for name, column in PRECURSOR_AWARDS.items():
+            flag = group[column].fillna(0) > 0
+            spread = races[column].agg(lambda x: x.fillna(0).max() > x.fillna(0).min())
+            rows.append({
+                'category': category,
+                'precursor': name,
+                'informative_races': int(spread.sum()),
+                'precursor_nominees': int(flag.sum()),
+                'precursor_oscar_wins': int((flag & (group['winner'] == 1)).sum()),
+            })
+    return pd.DataFrame(rows)
+
+
+def factor_table(df):
+    log_odds, controls = fit_factors(df)
+    table = pd.DataFrame([
+        {'category': c, 'precursor': p, 'log_odds': log_odds[i, j], 'factor': float(np.exp(log_odds[i, j]))}
+        for i, c in enumerate(CATEGORIES) for j, p in enumerate(PRECURSORS)
+    ])
+    table = table.merge(evidence(df), on=['category', 'precursor'], how='left')
+    table[['informative_races', 'precursor_nominees', 'precursor_oscar_wins']] = (
+        table[['informative_races', 'precursor_nominees', 'precursor_oscar_wins']].fillna(0).astype(int))
+    table['hit_rate'] = table['precursor_oscar_wins'] / table['precursor_nominees'].where(
+        table['precursor_nominees'] > 0)
+    table['source'] = np.select([table['informative_races'] >= MIN_RACES, table['informative_races'] > 0],
+                                ['fitted', 'shrunk'], 'pooled')
+    return table, controls
+
+
+# ==================== ARTIFACTS ====================
+
+def read_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH) as f:
+        return json.load(f)
+
+
+def fit_boost_factors():
+    print("=" * 70)
+    print("PRECURSOR BOOST FACTORS")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    df = precursor_frame()
+    table, controls = factor_table(df)
+    version = data_version()
+    print(f"\n📐 Fitted {len(table)} (category, precursor) factors on "
+          f"{df.groupby(['year_ceremony', 'category']).ngroups} races in {time.perf_counter() - start:.2f}s")
+
+    for _, row in table[table['source'] != 'pooled'].iterrows():
+        print(f"   {row['category']:<20} {row['precursor']:<11} x{row['factor']:.2f}  "
+              f"({row['precursor_oscar_wins']}/{row['precursor_nominees']} precursor winners won, "
+              f"{row['informative_races']} races, {row['source']})")
+    # Without history a category has no deviation: every one gets the same pooled factor
+    for precursor, rows in table[table['source'] == 'pooled'].groupby('precursor'):
+        print(f"   ⚠️ {precursor}: no history for {', '.join(rows['category'])} - "
+              f"pooled x{rows['factor'].iloc[0]:.2f}")
+
+    path = os.path.join(ARTIFACT_ROOT, f'{version}.csv')
+    os.makedirs(ARTIFACT_ROOT, exist_ok=True)
+    table.to_csv(path, index=False)
+
+    manifest = read_manifest()
+    manifest['current'] = version
+    manifest.setdefault('versions', {})[version] = {
+        'path': path,
+        'controls': controls,
+        'prior_precision': PRIOR_PRECISION,
+        'min_races': MIN_RACES,
+        'fitted': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"\n💾 Factor table {version} saved to {path}")
+    return table
+
+
+def load_boost_factors(version=None):
+    """
+    The current (or a given) factor table, fitted first if none exists
+    """
+    manifest = read_manifest()
+    version = version or manifest.get('current')
+    if version is None:
+        return fit_boost_factors()
+    return pd.read_csv(manifest['versions'][version]['path'])
+
+
+def boost_factor(category, precursor, table=None):
+    """
+    Odds multiplier for a `precursor` winner ('gg_drama', 'gg_musical',
+    'bafta', 'sag') nominated in `category` - 2026 names resolve to their
+    canonical category
+    """
+    table = load_boost_factors() if table is None else table
+    row = table[(table['category'] == canonical_category(category)) & (table['precursor'] == precursor)]
+    if row.empty:
+        raise KeyError(f"No boost factor for {precursor} in {category} (known: {PRECURSORS})")
+    return float(row['factor'].iloc[0])
+
+
+if __name__ == "__main__":
+    # python src/fit_boost_factors.py
+    fit_boost_factors()
@@ -0,0 +1,224 @@
+"""
+Incremental Retraining After a Ceremony
+Records the Oscar results, appends the completed year to the feature
+stores and refreshes the saved models in seconds instead of retraining
+from scratch: forests grow extra trees (warm_start) weighted towards the
+new year, linear / logit models take a few optimizer steps from their
+previous coefficients. Every few updates, or when the drift check finds
+the refreshed model too far from a full retrain, the model is rebuilt
+"""
+
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+
+from backtest import MODELS, completed_years, race_normalize
+from conditional_logit import ConditionalLogit, race_groups
+from experiment_store import frame_hash
+from feature_store import FeatureStore, load_features, source_rows
+from hyperparameter_search import SAVED_MODELS, tuned_params
+from model_registry import has_bundle, load_bundle, save_bundle
+
+
+# Full rebuild after this many incremental updates
+FULL_REBUILD_EVERY = 4
+
+# Mean absolute difference in race probabilities vs a full retrain above
+# which the incremental model is replaced
+DRIFT_TOLERANCE = 0.05
+
+NEW_TREE_FRACTION = 0.1   # extra trees per update, as a share of the forest
+RECENT_WEIGHT = 3.0       # sample weight of the new year's rows for those trees
+WARM_START_ITER = 25      # optimizer steps for linear / logit models
+
+BEST_PICTURE_SOURCES = ['best_picture', 'best_picture_full_gg']
+
+
+# ==================== DATA ====================
+
+def record_ceremony(year, winners):
+    """
+    Store the Oscar winners ({category: winner}) in the all-categories
+    store and append the year's Best Picture race to the Best Picture
+    stores, in each store's own layout
+    """
+    store = FeatureStore('all_categories')
+    for category, winner in winners.items():
+        store.record_winner(category, winner, year)
+        print(f"🏆 {year} {category}: {winner}")
+
+    rows = store.load([year])
+    picture = rows[rows['category'] == 'Best Picture']
+    if picture.empty:
+        return
+
+    for source in BEST_PICTURE_SOURCES:
+        FeatureStore(source).add_year(source_rows(source, picture))
+        print(f"💾 Appended {year} Best Picture race to {source}")
+
+
+def training_data(config):
+    df = load_features(config['source']).dropna(subset=config['features'])
+    return df[df['year_ceremony'].isin(completed_years(df))].reset_index(drop=True)
+
+
+def _fit(model, df, config, sample_weight=None):
+    X, y = df[config['features']].to_numpy(dtype=np.float64), df['winner'].to_numpy()
+    if getattr(model, 'race_aware', False):
+        return model.fit(X, y, groups=race_groups(df))
+    if sample_weight is not None:
+        return model.fit(X, y, sample_weight=sample_weight)
+    return model.fit(X, y)
+
+
+# ==================== UPDATES ====================
+
+def full_rebuild(name, df=None):
+    """
+    Train from scratch on every completed year
+    """
+    config = MODELS[name]
+    df = training_data(config) if df is None else df
+    model = config['estimator'](**tuned_params(name, config['params']))
+    _fit(model, df, config)
+    model.training_ = {
+        'years': completed_years(df),
+        'updates': 0,
+        'full_rebuild': datetime.now().isoformat(timespec='seconds'),
+    }
+    return model
+
+
+def incremental_fit(model, df, config, new_years):
+    """
+    Refresh a trained model with the rows of `new_years` added to `df`
+    """
+    if isinstance(model, RandomForestClassifier):
+        # Grow extra trees; only they see the new year, weighted up
+        extra = max(10, int(model.n_estimators * NEW_TREE_FRACTION))
+        weight = np.where(df['year_ceremony'].isin(new_years), RECENT_WEIGHT, 1.0)
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + extra)
+        _fit(model, df, config, sample_weight=weight)
+        model.set_params(warm_start=False)
+
+    elif isinstance(model, (LogisticRegression, ConditionalLogit)):
+        max_iter = model.max_iter
+        model.set_params(warm_start=True, max_iter=WARM_START_ITER)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', ConvergenceWarning)
+            _fit(model, df, config)
+        model.set_params(warm_start=False, max_iter=max_iter)
+
+    else:
+        raise TypeError(f"No incremental update for {type(model).__name__}")
+    return model
+
+
+def race_probabilities(model, df, config):
+    X = df[config['features']].to_numpy(dtype=np.float64)
+    if getattr(model, 'race_aware', False):
+        return model.predict_proba(X, groups=race_groups(df))[:, 1]
+    scored = df[['year_ceremony', 'category']].copy()
+    scored['probability'] = model.predict_proba(X)[:, 1]
+    return race_normalize(scored)
+
+
+def drift_check(name, model, df):
+    """
+    Compare the incremental model with a full retrain on the same data:
+    mean absolute race-probability difference and top-pick agreement
+    """
+    config = MODELS[name]
+    reference = full_rebuild(name, df)
+
+    ours = race_probabilities(model, df, config)
+    theirs = race_probabilities(reference, df, config)
+
+    scored = df[['year_ceremony', 'category']].copy()
+    scored['ours'], scored['theirs'] = ours, theirs
+    races = scored.groupby(['year_ceremony', 'category'])
+    agreement = float((races['ours'].idxmax() == races['theirs'].idxmax()).mean())
+
+    return {'mean_abs_diff': float(np.abs(ours - theirs).mean()), 'top1_agreement': agreement}, reference
+
+
+def update_model(name, check_drift=False, force_full=False):
+    """
+    Bring one saved model up to date with every completed year
+    """
+    config = MODELS[name]
+    start = time.perf_counter()
+    df = training_data(config)
+    years = completed_years(df)
+
+    # A private copy: the forest is grown in place
+    bundle = load_bundle(name, cached=False) if has_bundle(name) and not force_full else None
+    model = None
+    if bundle is not None and getattr(bundle, 'years', None) is None:
+        print(f"   {name:<16} saved without its training years - rebuilding")
+    elif bundle is not None:
+        model = bundle.estimator
+        training = getattr(model, 'training_', {'updates': 0})
+        new_years = [y for y in years if y not in set(bundle.years)]
+        if not new_years:
+            print(f"   {name:<16} already up to date ({years[-1]})")
+            return model
+
+    if model is None or training['updates'] + 1 >= FULL_REBUILD_EVERY:
+        model = full_rebuild(name, df)
+        action = 'full rebuild'
+    else:
+        model = incremental_fit(model, df, config, new_years)
+        model.training_ = {**training, 'years': years, 'updates': training['updates'] + 1}
+        action = f"incremental (+{', '.join(map(str, new_years))}, update {model.training_['updates']})"
+
+    message = f"   {name:<16} {action} in {time.perf_counter() - start:.2f}s"
+
+    metrics = {}
+    if check_drift and action != 'full rebuild':
+        drift, reference = drift_check(name, model, df)
+        metrics = drift
+        message += (f" | drift {drift['mean_abs_diff']:.3f}, "
+                    f"top-1 agreement {drift['top1_agreement']:.0%}")
+        if drift['mean_abs_diff'] > DRIFT_TOLERANCE:
+            model = reference
+            message += " -> replaced by full rebuild"
+
+    frame = df[config['features']].astype(np.float64)
+    save_bundle(name, model, frame, frame_hash(df[config['features'] + ['winner', 'year_ceremony']]), metrics,
+                years=years)
+    print(message)
+    return model
+
+
+def update_all(names=None, check_drift=False, force_full=False):
+    print("=" * 70)
+    print("POST-CEREMONY MODEL REFRESH")
+    print("=" * 70 + "\n")
+
+    start = time.perf_counter()
+    for name in names or SAVED_MODELS:
+        update_model(name, check_drift, force_full)
+    print(f"\n✅ Models refreshed in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    # python src/incremental_retrain.py winners <year> "<category>=<winner>" ...
+    # python src/incremental_retrain.py update [model ...] [--check-drift] [--full]
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    command = args[0] if args else 'update'
+
+    if command == 'winners':
+        year = int(args[1])
+        record_ceremony(year, dict(pair.split('=', 1) for pair in args[2:]))
+        update_all(check_drift='--check-drift' in sys.argv)
+    else:
+        update_all(args[1:] or None, check_drift='--check-drift' in sys.argv,
+                   force_full='--full' in sys.argv)
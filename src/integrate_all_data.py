@@ -6,11 +6,14 @@ Combines Oscar data with all external sources:
 - SAG Awards
 - Movie Ratings (IMDb, RT, Metacritic)
 - Sentiment Analysis
+- Sentiment Momentum (rolling windows + EWM trend)
 """
 
 import pandas as pd
 import os
 
+from feature_registry import compute_features
+
 
 def integrate_all_data():
     """
@@ -72,6 +75,15 @@ def integrate_all_data():
         print("⚠️ Sentiment data not found")
         sentiment_df = pd.DataFrame()
     
+    # Sentiment Momentum (maintained daily by sentiment/sentiment_momentum.py)
+    if os.path.exists('data/external/sentiment_momentum.csv'):
+        momentum_df = pd.read_csv('data/external/sentiment_momentum.csv')
+        momentum_df = momentum_df.drop(columns=['momentum_as_of'], errors='ignore')
+        print(f"✅ Sentiment Momentum: {len(momentum_df)} records")
+    else:
+        print("⚠️ Sentiment momentum data not found")
+        momentum_df = pd.DataFrame()
+    
     # --------------------------------------------------
     # 3️⃣ Merge All Data
     # --------------------------------------------------
@@ -144,30 +156,29 @@ def integrate_all_data():
         master_df = master_df.drop('year_sentiment', axis=1, errors='ignore')
         print("✅ Merged Sentiment Scores")
     
+    # Merge Sentiment Momentum
+    if not momentum_df.empty:
+        master_df = master_df.merge(
+            momentum_df,
+            left_on=['year_ceremony', 'film'],
+            right_on=['year', 'film'],
+            how='left',
+            suffixes=('', '_momentum')
+        )
+        master_df = master_df.drop('year_momentum', axis=1, errors='ignore')
+        print("✅ Merged Sentiment Momentum")
+    
     # --------------------------------------------------
     # 4️⃣ Create New Features
     # --------------------------------------------------
     print("\n🔧 Engineering new features...")
     
-    # Total precursor awards won
-    master_df['total_precursor_wins'] = (
-        master_df.get('won_gg_drama', 0) + 
-        master_df.get('won_gg_musical', 0) + 
-        master_df.get('won_bafta', 0) + 
-        master_df.get('won_sag_cast', 0)
+    # Precursor features use the same definitions as the feature store
+    master_df = compute_features(
+        master_df,
+        names=['total_precursor_wins', 'has_precursor_win', 'precursor_sweep']
     )
     
-    # Has any precursor win
-    master_df['has_precursor_win'] = (master_df['total_precursor_wins'] > 0).astype(int)
-    
-    # Sweep indicator (won all 3 major precursors: GG, BAFTA, SAG)
-    if all(col in master_df.columns for col in ['won_bafta', 'won_sag_cast']):
-        master_df['precursor_sweep'] = (
-            ((master_df.get('won_gg_drama', 0) == 1) | (master_df.get('won_gg_musical', 0) == 1)) &
-            (master_df['won_bafta'] == 1) &
-            (master_df['won_sag_cast'] == 1)
-        ).astype(int)
-    
     print("✅ Created precursor award features")
     
     # --------------------------------------------------
@@ -0,0 +1,339 @@
+"""
+Joint Multi-Category Model
+One conditional-logit model over every named-category race in
+all_categories_master: shared nomination / precursor / cross-nomination
+features plus category-group interactions, with each category reading only
+the precursor awards that apply to it. One fit and one batched predict cover all 24
+categories. Benchmarked against one model per category on rolling backtest
+log-loss and on train / predict wall time.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import completed_years, make_folds, race_metrics
+from conditional_logit import ConditionalLogit, race_groups
+from cross_nominations import CrossNominations, film_key
+from experiment_store import frame_hash
+from feature_registry import BASIC_FEATURES, PRECURSOR_COLUMNS
+from feature_store import load_features, store_category
+from model_registry import MMAP_ARRAYS, has_bundle, lazy_bundle, save_bundle
+
+
+MODEL_NAME = 'joint'
+RESULTS_PATH = 'data/cache/joint_model_benchmark.csv'
+
+# Historical category -> group sharing interaction terms. Every 2026
+# category without its own history (screenplay, sound, shorts...) is
+# lumped into 'Other' in the source data, so it maps there too.
+CATEGORY_GROUPS = {
+    'Best Picture': 'picture',
+    'Director': 'director',
+    'Leading Actor': 'acting',
+    'Leading Actress': 'acting',
+    'Supporting Actor': 'acting',
+    'Supporting Actress': 'acting',
+    'Cinematography': 'craft',
+    'Film Editing': 'craft',
+    'Other': 'other',
+}
+# 'Other' rows are one ~80-nominee pseudo-race per year, not real races, so
+# they are left out of training and get no slopes of their own: those
+# categories are scored with the shared terms only
+GROUPS = sorted(set(CATEGORY_GROUPS.values()) - {'other'})
+
+# Precursor columns that carry a signal for each group (the result CLI in
+# feature_store.py records e.g. a BAFTA win in any race; a Golden Globe
+# drama/musical split or SAG ensemble only exists for some)
+GROUP_PRECURSORS = {
+    'picture': PRECURSOR_COLUMNS,
+    'acting': PRECURSOR_COLUMNS,
+    'director': ['won_gg_drama', 'won_gg_musical', 'won_bafta'],
+    'craft': ['won_bafta'],
+    'other': ['won_bafta'],
+}
+
+CROSS_NAMES = ['film_is_bp_nominee', 'film_is_director_nominee', 'film_acting_nominations']
+
+SHARED_FEATURES = BASIC_FEATURES + ['precursor_wins', 'has_precursor'] + CROSS_NAMES
+INTERACTION_FEATURES = ['nomination_share', 'is_top_nominated', 'precursor_wins', 'film_is_bp_nominee']
+
+
+def canonical_category(name):
+    """
+    Historical category name for a 2026 (or historical) category
+    """
+    name = store_category(name)
+    return name if name in CATEGORY_GROUPS else 'Other'
+
+
+# ==================== DATA ====================
+
+def merge_picture_precursors(df):
+    """
+    Copy Best Picture precursor results in from the Golden Globe matched
+    dataset (the only category with historical precursor data)
+    """
+    picture = load_features('best_picture_full_gg')
+    source = pd.MultiIndex.from_arrays([picture['year_ceremony'], film_key(picture['film'])])
+    target = pd.MultiIndex.from_arrays([df['year_ceremony'], film_key(df['film'])])
+    position = source.get_indexer(target)
+    matched = (df['category'] == 'Best Picture').to_numpy() & (position >= 0)
+
+    for column in PRECURSOR_COLUMNS:
+        values = df[column].to_numpy(dtype=np.float64, copy=True)
+        values[matched] = picture[column].to_numpy(dtype=np.float64)[position[matched]]
+        df[column] = values
+    return df
+
+
+def training_frame(include_other=False, picture_precursors=True):
+    """
+    all_categories feature-store rows of completed years, with Best Picture
+    precursor results merged in unless picture_precursors=False. The lumped
+    'Other' rows aren't real races and are left out unless
+    include_other=True.
+    """
+    df = load_features('all_categories')
+    df = df[df['year_ceremony'].isin(completed_years(df))]
+    if not include_other:
+        df = df[df['category'].map(canonical_category) != 'Other']
+    df = df.reset_index(drop=True)
+    return merge_picture_precursors(df) if picture_precursors else df
+
+
+def cross_source(df):
+    """
+    Frame in all_categories_master's layout (canonical category names) for
+    building a CrossNominations matrix over the given rows
+    """
+    return pd.DataFrame({
+        'year': df['year_ceremony'].to_numpy(),
+        'category': df['category'].map(canonical_category).to_numpy(),
+        'film': df['film'].to_numpy(),
+        'won': df['winner'].fillna(0).astype(int).to_numpy(),
+    })
+
+
+def design_matrix(df, cross=None):
+    """
+    (X, feature names) for the joint model. `cross` is the
+    CrossNominations matrix to read film-level features from (built from
+    df itself by default)
+    """
+    cross = cross or CrossNominations(cross_source(df))
+    groups = df['category'].map(canonical_category).map(CATEGORY_GROUPS).to_numpy()
+
+    precursors = df[PRECURSOR_COLUMNS].fillna(0).to_numpy(dtype=np.float64)
+    mapped = np.zeros(len(df))
+    for group, columns in GROUP_PRECURSORS.items():
+        mask = [c in columns for c in PRECURSOR_COLUMNS]
+        mapped += np.where(groups == group, precursors[:, mask].sum(axis=1), 0)
+
+    shared = df[BASIC_FEATURES].to_numpy(dtype=np.float64)
+    films = cross.features(df['year_ceremony'], df['film'], CROSS_NAMES).to_numpy(dtype=np.float64)
+    columns = dict(zip(BASIC_FEATURES, shared.T))
+    columns.update({'precursor_wins': mapped, 'has_precursor': (mapped > 0).astype(np.float64)})
+    columns.update(zip(CROSS_NAMES, films.T))
+
+    # Category-group interactions: each group gets its own slope on top of
+    # the shared one
+    for group in GROUPS:
+        in_group = (groups == group).astype(np.float64)
+        for feature in INTERACTION_FEATURES:
+            columns[f'{group}_x_{feature}'] = columns[feature] * in_group
+
+    return np.column_stack(list(columns.values())), list(columns)
+
+
+# ==================== MODELS ====================
+
+class JointCategoryModel:
+    """
+    One conditional logit across all categories
+    """
+
+    # Reads categories, films and race ids: registry bundles pass it the
+    # whole frame
+    frame_input = True
+
+    def __init__(self, C=1.0):
+        self.C = C
+
+    def get_params(self, deep=True):
+        return {'C': self.C}
+
+    def fit(self, df, cross=None):
+        X, self.features_ = design_matrix(df, cross)
+        self.model_ = ConditionalLogit(C=self.C).fit(X, df['winner'], race_groups(df))
+        return self
+
+    def predict(self, df, cross=None):
+        """
+        Win probability of every row within its (year, category) race
+        """
+        X, _ = design_matrix(df, cross)
+        return self.model_.predict_race_proba(X, race_groups(df))
+
+
+class PerCategoryModels:
+    """
+    Baseline: a separate conditional logit (shared features only) per
+    historical category
+    """
+
+    frame_input = True
+
+    def __init__(self, C=1.0):
+        self.C = C
+
+    def get_params(self, deep=True):
+        return {'C': self.C}
+
+    def fit(self, df, cross=None):
+        X, names = design_matrix(df, cross)
+        X = X[:, [names.index(f) for f in SHARED_FEATURES]]
+        categories = df['category'].map(canonical_category).to_numpy()
+        groups = race_groups(df)
+
+        self.models_ = {}
+        for category in np.unique(categories):
+            rows = categories == category
+            self.models_[category] = ConditionalLogit(C=self.C).fit(
+                X[rows], df['winner'].to_numpy()[rows], groups[rows])
+        # Categories without history of their own use one pooled model
+        self.pooled_ = ConditionalLogit(C=self.C).fit(X, df['winner'], groups)
+        return self
+
+    def predict(self, df, cross=None):
+        X, names = design_matrix(df, cross)
+        X = X[:, [names.index(f) for f in SHARED_FEATURES]]
+        categories = df['category'].map(canonical_category).to_numpy()
+        groups = race_groups(df)
+
+        probs = np.zeros(len(df))
+        for category in np.unique(categories):
+            rows = categories == category
+            model = self.models_.get(category, self.pooled_)
+            probs[rows] = model.predict_race_proba(X[rows], groups[rows])
+        return probs
+
+
+# ==================== BENCHMARK ====================
+
+def backtest(model_class, df, cross, folds):
+    """
+    Rolling-origin out-of-fold predictions plus total fit / predict seconds
+    """
+    years = df['year_ceremony'].to_numpy()
+    oof, fit_seconds, predict_seconds = [], 0.0, 0.0
+
+    for fold in folds:
+        train, test = years < fold['test_year'], years == fold['test_year']
+
+        start = time.perf_counter()
+        model = model_class().fit(df[train], cross)
+        fit_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        probs = model.predict(df[test], cross)
+        predict_seconds += time.perf_counter() - start
+
+        rows = df.loc[test, ['year_ceremony', 'category', 'nominee', 'film', 'winner']].copy()
+        rows['probability'] = probs
+        oof.append(rows)
+
+    return pd.concat(oof, ignore_index=True), fit_seconds, predict_seconds
+
+
+def benchmark():
+    """
+    Joint vs per-category models: overall and per-category race log-loss,
+    top-1 accuracy and wall time
+    """
+    print("=" * 70)
+    print("JOINT MULTI-CATEGORY MODEL vs PER-CATEGORY MODELS")
+    print("=" * 70)
+
+    df = training_frame()
+    cross = CrossNominations()
+    folds = make_folds(completed_years(df), 'rolling')
+    print(f"\n📊 {len(df)} nominees, {df.groupby(['year_ceremony', 'category']).ngroups} races, "
+          f"{len(folds)} rolling folds")
+
+    rows, oofs = [], {}
+    for name, model_class in [('joint', JointCategoryModel), ('per_category', PerCategoryModels)]:
+        oof, fit_seconds, predict_seconds = backtest(model_class, df, cross, folds)
+        oofs[name] = oof
+        metrics = race_metrics(oof)
+        rows.append({'model': name, 'category': 'ALL', **metrics,
+                     'fit_seconds': fit_seconds, 'predict_seconds': predict_seconds})
+        for category, part in oof.groupby('category'):
+            rows.append({'model': name, 'category': category, **race_metrics(part)})
+
+        print(f"   {name:<13} log-loss {metrics['race_log_loss']:.3f} | top-1 {metrics['top1_accuracy']:.1%} | "
+              f"fit {fit_seconds:.2f}s | predict {predict_seconds * 1000:.0f} ms")
+
+    results = pd.DataFrame(rows)
+    by_category = results[results['category'] != 'ALL'].pivot(
+        index='category', columns='model', values='race_log_loss')
+    print("\n📋 Race log-loss by category:")
+    for category, row in by_category.iterrows():
+        better = '✅' if row['joint'] <= row['per_category'] else '  '
+        print(f"   {better} {category:<20} joint {row['joint']:.3f} | per-category {row['per_category']:.3f}")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    results.to_csv(RESULTS_PATH, index=False)
+    print(f"\n💾 Benchmark saved to {RESULTS_PATH}")
+    return results
+
+
+# ==================== TRAINING ====================
+
+def train_joint_model():
+    """
+    Fit on every historical race, calibrate and register
+    """
+    start = time.perf_counter()
+    df = training_frame()
+    model = JointCategoryModel().fit(df)
+    print(f"✅ Joint model fitted on {model.model_.n_races_} races in {time.perf_counter() - start:.2f}s")
+
+    # Imported here: calibration imports this module
+    from calibration import attach_calibrator
+    calibrator = attach_calibrator('joint', model)
+    print(f"📐 Calibrated in {calibrator.fit_seconds_:.2f}s: "
+          f"{(calibrator.summary_['method'] != 'identity').sum()} of {len(calibrator.summary_)} categories mapped")
+
+    # Rolling backtest metrics (the out-of-fold predictions calibrated on)
+    features = BASIC_FEATURES + PRECURSOR_COLUMNS
+    path = save_bundle(MODEL_NAME, model, df[features],
+                       frame_hash(df[features + ['year_ceremony', 'category', 'film', 'winner']]),
+                       race_metrics(calibrator.oof_), years=df['year_ceremony'], mmap_mode=MMAP_ARRAYS)
+    print(f"💾 Model saved to {path}")
+    return model
+
+
+def load_joint_model():
+    """
+    Registered joint model (loaded on the first prediction), trained first
+    if it doesn't exist yet
+    """
+    if not has_bundle(MODEL_NAME):
+        train_joint_model()
+    return lazy_bundle(MODEL_NAME)
+
+
+if __name__ == "__main__":
+    # python src/joint_model.py [benchmark|train]
+    command = sys.argv[1] if len(sys.argv) > 1 else 'benchmark'
+    if command == 'train':
+        # (through the module, so the artifact unpickles outside this script)
+        import joint_model
+        joint_model.train_joint_model()
+    else:
+        benchmark()
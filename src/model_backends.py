@@ -0,0 +1,302 @@
+"""
+Gradient-Boosting Model Backends
+Pluggable alternative to the fixed-depth random forests: sklearn's
+HistGradientBoostingClassifier or XGBoost's hist tree method, with early
+stopping on held-out recent races (not random rows) and, for XGBoost, a
+per-race ranking objective. Reports training time, inference latency and
+backtest log-loss next to the RF tiers
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from threadpoolctl import threadpool_limits
+
+from race_kernels import RaceIndex
+
+try:
+    import xgboost
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    xgboost = None
+    XGBOOST_AVAILABLE = False
+
+
+RESULTS_PATH = 'data/cache/backtest/backend_comparison.csv'
+
+BACKENDS = ['random_forest', 'hist_gb', 'xgboost']
+
+
+def race_softmax(scores, groups):
+    """
+    Ranking scores -> win probabilities within each race
+    """
+    index = RaceIndex(np.asarray(groups))
+    maxima = index.broadcast(index.reduce(np.maximum, scores))
+    exp = np.exp(np.asarray(scores, dtype=np.float64) - maxima)
+    return exp / index.broadcast(index.reduce(np.add, exp))
+
+
+def race_log_loss(probs, y, groups):
+    """
+    Mean -log(race-normalized probability) of the winners
+    """
+    index = RaceIndex(np.asarray(groups))
+    probs = np.asarray(probs, dtype=np.float64)
+    normalized = probs / np.maximum(index.broadcast(index.reduce(np.add, probs)), 1e-12)
+    winners = np.asarray(y) == 1
+    return float(-np.log(np.clip(normalized[winners], 1e-6, 1)).mean()) if winners.any() else 0.0
+
+
+class GroupedBoosting:
+    """
+    Gradient-boosted trees with race-grouped early stopping.
+
+    The most recent `validation_fraction` of races (race ids sort by year)
+    is held out, boosting stops once their race log-loss hasn't improved
+    for `early_stopping_rounds` iterations, and the model is refitted on
+    every race with the best iteration count.
+
+    backend:   'hist_gb' (scikit-learn) or 'xgboost' (tree_method='hist')
+    objective: 'binary', or 'rank' (XGBoost pairwise ranking within each
+               race; probabilities are a softmax of the race's scores)
+    """
+
+    race_aware = True
+
+    PARAMS = ['backend', 'objective', 'learning_rate', 'max_depth', 'max_iter', 'min_samples_leaf',
+              'l2_regularization', 'validation_fraction', 'early_stopping_rounds', 'n_jobs',
+              'random_state']
+
+    def __init__(self, backend='hist_gb', objective='binary', learning_rate=0.05, max_depth=3,
+                 max_iter=500, min_samples_leaf=5, l2_regularization=1.0, validation_fraction=0.2,
+                 early_stopping_rounds=20, n_jobs=None, random_state=42):
+        self.backend = backend
+        self.objective = objective
+        self.learning_rate = learning_rate
+        self.max_depth = max_depth
+        self.max_iter = max_iter
+        self.min_samples_leaf = min_samples_leaf
+        self.l2_regularization = l2_regularization
+        self.validation_fraction = validation_fraction
+        self.early_stopping_rounds = early_stopping_rounds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def get_params(self, deep=True):
+        return {name: getattr(self, name) for name in self.PARAMS}
+
+    def set_params(self, **params):
+        for name, value in params.items():
+            setattr(self, name, value)
+        return self
+
+    # -------------------- backends --------------------
+
+    def _check(self):
+        if self.backend not in ('hist_gb', 'xgboost'):
+            raise ValueError(f"Unknown boosting backend '{self.backend}' (expected 'hist_gb' or 'xgboost')")
+        if self.backend == 'xgboost' and not XGBOOST_AVAILABLE:
+            raise ImportError("The 'xgboost' backend needs the xgboost package (pip install xgboost)")
+        if self.objective == 'rank' and self.backend != 'xgboost':
+            raise ValueError("A per-race ranking objective is only available with the 'xgboost' backend")
+
+    def _new_model(self, n_iter):
+        if self.backend == 'hist_gb':
+            return HistGradientBoostingClassifier(
+                learning_rate=self.learning_rate, max_depth=self.max_depth, max_iter=n_iter,
+                min_samples_leaf=self.min_samples_leaf, l2_regularization=self.l2_regularization,
+                early_stopping=False, random_state=self.random_state)
+
+        common = dict(tree_method='hist', learning_rate=self.learning_rate, max_depth=self.max_depth,
+                      n_estimators=n_iter, min_child_weight=self.min_samples_leaf,
+                      reg_lambda=self.l2_regularization, n_jobs=self.n_jobs or 0,
+                      random_state=self.random_state)
+        if self.objective == 'rank':
+            return xgboost.XGBRanker(objective='rank:pairwise', **common)
+        return xgboost.XGBClassifier(objective='binary:logistic', **common)
+
+    def _fit_model(self, model, X, y, groups, eval_set=None):
+        if self.objective == 'rank':
+            kwargs = {}
+            if eval_set is not None:
+                kwargs = {'eval_set': [eval_set[:2]], 'eval_qid': [eval_set[2]], 'verbose': False}
+            return model.fit(X, y, qid=groups, **kwargs)
+        if eval_set is not None:
+            return model.fit(X, y, eval_set=[eval_set[:2]], verbose=False)
+        return model.fit(X, y)
+
+    def _scores(self, model, X):
+        if self.objective == 'rank':
+            return model.predict(X)
+        return model.predict_proba(X)[:, 1]
+
+    # -------------------- early stopping --------------------
+
+    def _best_iteration_hist_gb(self, X, y, groups, train, valid):
+        # warm_start adds trees to the same model, so every checkpoint
+        # costs only the new trees
+        model = self._new_model(0)
+        model.set_params(warm_start=True)
+        best, best_iter, since_best, step = np.inf, 1, 0, 5
+        for n_iter in range(step, self.max_iter + 1, step):
+            model.set_params(max_iter=n_iter)
+            model.fit(X[train], y[train])
+            loss = race_log_loss(model.predict_proba(X[valid])[:, 1], y[valid], groups[valid])
+            if loss < best - 1e-6:
+                best, best_iter, since_best = loss, n_iter, 0
+            else:
+                since_best += step
+                if since_best >= self.early_stopping_rounds:
+                    break
+        return best_iter
+
+    def _best_iteration_xgboost(self, X, y, groups, train, valid):
+        model = self._new_model(self.max_iter)
+        model.set_params(early_stopping_rounds=self.early_stopping_rounds,
+                         eval_metric='ndcg@1' if self.objective == 'rank' else 'logloss')
+        self._fit_model(model, X[train], y[train], groups[train],
+                        eval_set=(X[valid], y[valid], groups[valid]))
+        return int(model.best_iteration) + 1
+
+    # -------------------- sklearn-style API --------------------
+
+    def fit(self, X, y, groups=None):
+        self._check()
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        groups = np.arange(len(X)) if groups is None else np.asarray(groups)
+
+        # Rows sorted by race (XGBoost ranking needs contiguous query groups)
+        order = np.argsort(groups, kind='stable')
+        X, y, groups = X[order], y[order], groups[order]
+
+        races = np.unique(groups)
+        n_valid = int(np.ceil(len(races) * self.validation_fraction))
+        valid = np.isin(groups, races[len(races) - n_valid:]) if 0 < n_valid < len(races) else None
+
+        start = time.perf_counter()
+        with threadpool_limits(self.n_jobs):
+            if valid is None or y[valid].sum() == 0 or y[~valid].sum() == 0:
+                self.best_iteration_ = self.max_iter
+            elif self.backend == 'hist_gb':
+                self.best_iteration_ = self._best_iteration_hist_gb(X, y, groups, ~valid, valid)
+            else:
+                self.best_iteration_ = self._best_iteration_xgboost(X, y, groups, ~valid, valid)
+
+            self.model_ = self._fit_model(self._new_model(self.best_iteration_), X, y, groups)
+        self.fit_seconds_ = time.perf_counter() - start
+        self.classes_ = np.array([0, 1])
+        return self
+
+    def predict_proba(self, X, groups=None):
+        X = np.asarray(X, dtype=np.float64)
+        with threadpool_limits(self.n_jobs):
+            scores = self._scores(self.model_, X)
+        if self.objective == 'rank':
+            scores = race_softmax(scores, np.zeros(len(X)) if groups is None else groups)
+        return np.column_stack([1 - scores, scores])
+
+    def predict(self, X, groups=None):
+        return (self.predict_proba(X, groups)[:, 1] >= 0.5).astype(int)
+
+
+def make_model(backend='random_forest', params=None):
+    """
+    Estimator for the training scripts: the random forest or a
+    GroupedBoosting model on the chosen backend, with `params`
+    """
+    if backend == 'random_forest':
+        return RandomForestClassifier(**(params or {}))
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend '{backend}' (expected one of {BACKENDS})")
+    return GroupedBoosting(**dict(params or {}, backend=backend))
+
+
+def fit_model(model, X, y, groups=None):
+    """
+    Fit any backend, passing race ids to the race-aware ones
+    """
+    if getattr(model, 'race_aware', False):
+        return model.fit(X, y, groups=groups)
+    return model.fit(X, y)
+
+
+# ==================== COMPARISON ====================
+
+def inference_latency(model, X, groups, repeats=50):
+    """
+    Median milliseconds to score one race
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if getattr(model, 'race_aware', False):
+            model.predict_proba(X, groups=groups)
+        else:
+            model.predict_proba(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def compare_backends(names=None, n_workers=None):
+    """
+    Rolling backtest log-loss / top-1, full-history training time and
+    single-race inference latency for each model, side by side
+    """
+    # Imported here: backtest registers the boosting models from this module
+    from backtest import MODELS, build_matrix, open_matrix, run_backtest
+
+    # (compared by name: run as a script, this module is __main__)
+    names = names or [n for n in MODELS if n in ('tier1_basic', 'tier2_enhanced', 'full_gg')
+                      or MODELS[n]['estimator'].__name__ == 'GroupedBoosting']
+
+    print("=" * 70)
+    print("MODEL BACKENDS: BOOSTING vs RANDOM FOREST TIERS")
+    print("=" * 70)
+    if not XGBOOST_AVAILABLE:
+        print("\n⚠️ xgboost is not installed - XGBoost backends skipped")
+    print()
+
+    rows = []
+    for name in names:
+        config = MODELS[name]
+        metrics, _ = run_backtest(name, 'rolling', n_workers=n_workers, verbose=False)
+
+        m = open_matrix(build_matrix(config['source'], config['features']))
+        X, y, race = np.asarray(m['X']), np.asarray(m['y']), np.asarray(m['race'])
+
+        model = config['estimator'](**config['params'])
+        start = time.perf_counter()
+        fit_model(model, X, y, race)
+        train_seconds = time.perf_counter() - start
+
+        last = race == race.max()
+        latency = inference_latency(model, X[last], race[last])
+
+        rows.append({
+            'model': name,
+            'estimator': config['estimator'].__name__,
+            'race_log_loss': metrics['race_log_loss'],
+            'top1_accuracy': metrics['top1_accuracy'],
+            'roc_auc': metrics['roc_auc'],
+            'train_seconds': train_seconds,
+            'latency_ms': latency,
+        })
+        print(f"   {name:<18} log-loss {metrics['race_log_loss']:.3f} | top-1 {metrics['top1_accuracy']:.1%} | "
+              f"train {train_seconds * 1000:>6.0f} ms | predict one race {latency:.2f} ms")
+
+    results = pd.DataFrame(rows)
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    results.to_csv(RESULTS_PATH, index=False)
+    print(f"\n💾 Comparison saved to {RESULTS_PATH}")
+    return results
+
+
+if __name__ == "__main__":
+    # python src/model_backends.py [model ...]
+    compare_backends(sys.argv[1:] or None)
@@ -7,8 +7,10 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_auc_score, confusion_matrix
-import joblib
-import os
+
+from experiment_store import frame_hash
+from feature_store import load_features
+from model_registry import save_bundle
 
 
 def train_enhanced_model():
@@ -22,8 +24,8 @@ def train_enhanced_model():
     # --------------------------------------------------
     # 1️⃣ Load Master Dataset
     # --------------------------------------------------
-    print("\n📂 Loading master dataset...")
-    df = pd.read_csv('data/processed/master_dataset.csv')
+    print("\n📂 Loading feature matrix from the feature store...")
+    df = load_features('best_picture')
     print(f"✅ Loaded {len(df)} records with {len(df.columns)} features")
     
     # --------------------------------------------------
@@ -127,9 +129,11 @@ def train_enhanced_model():
     print("\n📋 Test Set Classification Report:")
     print(classification_report(y_test, y_test_pred, zero_division=0))
     
+    metrics = {}
     try:
         auc_score = roc_auc_score(y_test, y_test_prob)
         print(f"\n🎯 ROC-AUC Score: {auc_score:.4f}")
+        metrics['roc_auc'] = round(float(auc_score), 4)
     except:
         print("\n⚠️ Not enough data for ROC-AUC")
     
@@ -175,18 +179,12 @@ def train_enhanced_model():
     # --------------------------------------------------
     # 8️⃣ Save Model
     # --------------------------------------------------
-    os.makedirs('models', exist_ok=True)
-    model_path = 'models/enhanced_model.pkl'
-    joblib.dump(model, model_path)
-    
-    # Save feature list
-    feature_list_path = 'models/feature_list.txt'
-    with open(feature_list_path, 'w') as f:
-        for feat in available_features:
-            f.write(f"{feat}\n")
+    # The bundle's schema replaces a separate feature list
+    model_path = save_bundle('enhanced', model, X_train,
+                             frame_hash(train[available_features + ['winner', 'year_ceremony']]), metrics,
+                             years=train['year_ceremony'])
     
     print(f"\n💾 Model saved to {model_path}")
-    print(f"💾 Feature list saved to {feature_list_path}")
     
     print("\n✅ ENHANCED TRAINING COMPLETE!")
     
@@ -6,25 +6,88 @@ Two-Tier Prediction System
 
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, roc_auc_score
-import joblib
-import os
+import sys
 
+import model_backends
+from experiment_store import frame_hash, tracked_run
+from feature_registry import BASIC_FEATURES, ENHANCED_FEATURES
+from feature_store import load_features
+from model_backends import fit_model, make_model
+from model_registry import activate_restored, load_bundle, save_bundle
 
-def train_two_tier_system():
+
+TIER1_DEFAULTS = {
+    'n_estimators': 200,
+    'max_depth': 8,
+    'class_weight': {0: 1, 1: 10},
+    'random_state': 42,
+}
+
+TIER2_DEFAULTS = {
+    'n_estimators': 300,
+    'max_depth': 10,
+    'class_weight': {0: 1, 1: 15},
+    'random_state': 42,
+}
+
+# Backtest model whose searched parameters a boosting backend uses (both
+# tiers; GroupedBoosting defaults until it has been tuned)
+BOOSTING_MODELS = {
+    'hist_gb': 'hgb_enhanced',
+    'xgboost': 'xgb_enhanced',
+}
+
+
+def train_two_tier_system(backend='random_forest', force=False):
     """
     Train both basic and enhanced models
+    backend: 'random_forest' (default), 'hist_gb' or 'xgboost'
+    force: retrain even if this exact run is in the experiment store
     """
     print("=" * 60)
     print("TWO-TIER PREDICTION SYSTEM")
     print("=" * 60)
+    print(f"🤖 Model backend: {backend}")
     
     # --------------------------------------------------
     # Load Data
     # --------------------------------------------------
-    print("\n📂 Loading master dataset...")
-    df = pd.read_csv('data/processed/master_dataset.csv')
+    print("\n📂 Loading feature matrix from the feature store...")
+    df = load_features('best_picture')
+    
+    # Searched parameters (src/hyperparameter_search.py) when available;
+    # imported here because the backtest reads the defaults from this module
+    from hyperparameter_search import tuned_params
+    if backend == 'random_forest':
+        tier_params = [tuned_params('tier1_basic', TIER1_DEFAULTS), tuned_params('tier2_enhanced', TIER2_DEFAULTS)]
+    else:
+        tier_params = [tuned_params(BOOSTING_MODELS[backend], {})] * 2
+    params = {'backend': backend, 'tier1': tier_params[0], 'tier2': tier_params[1]}
+    columns = list(dict.fromkeys(list(BASIC_FEATURES) + list(ENHANCED_FEATURES)))
+    data = frame_hash(df[columns + ['winner', 'year_ceremony', 'film']])
+    
+    run = tracked_run('two_tier', params, data, lambda: fit_two_tier(df, params),
+                      code_modules=(sys.modules[__name__], model_backends), force=force)
+    if run['cached']:
+        for name, value in run['metrics'].items():
+            print(f"   {name}: {value}")
+        # Restored bundles become the registry's current versions again,
+        # unless an incremental refresh has trained a model on later years
+        for path in run['artifacts']:
+            activate_restored(path)
+    
+    model_basic = load_bundle('tier1_basic')
+    model_enhanced = load_bundle('tier2_enhanced') if len(run['artifacts']) > 1 else None
+    return model_basic, model_enhanced
+
+
+def fit_two_tier(df, params):
+    """
+    Fit, evaluate and register both tiers -> (metrics, bundle paths)
+    """
+    backend = params['backend']
+    metrics = {}
     
     # --------------------------------------------------
     # TIER 1: BASIC MODEL (All Historical Data)
@@ -33,19 +96,8 @@ def train_two_tier_system():
     print("TIER 1: BASIC MODEL (Nominations Only)")
     print("=" * 60)
     
-    # Features available for ALL films
-    basic_features = [
-        'total_nominations',
-        'nomination_share',
-    ]
-    
-    # Add engineered features from earlier
-    df['nom_ratio'] = df['total_nominations'] / df['year_total_nominations']
-    df['is_top_nominated'] = (df.groupby('year_ceremony')['total_nominations']
-                               .transform('max') == df['total_nominations']).astype(int)
-    df['nom_rank'] = df.groupby('year_ceremony')['total_nominations'].rank(ascending=False, method='min')
-    
-    basic_features.extend(['nom_ratio', 'is_top_nominated', 'nom_rank'])
+    # Features available for ALL films (nominations only)
+    basic_features = list(BASIC_FEATURES)
     
     df_basic = df[basic_features + ['winner', 'year_ceremony', 'film']].dropna()
     
@@ -63,14 +115,10 @@ def train_two_tier_system():
     print(f"Training: {len(X_train_basic)}, Testing: {len(X_test_basic)}")
     
     # Train
-    model_basic = RandomForestClassifier(
-        n_estimators=200,
-        max_depth=8,
-        class_weight={0: 1, 1: 10},
-        random_state=42
-    )
+    model_basic = make_model(backend, params['tier1'])
     
-    model_basic.fit(X_train_basic, y_train_basic)
+    # Boosting backends early-stop on held-out recent races (one per year)
+    fit_model(model_basic, X_train_basic, y_train_basic, groups=train_basic['year_ceremony'])
     
     # Evaluate
     y_prob_basic = model_basic.predict_proba(X_test_basic)[:, 1]
@@ -82,6 +130,7 @@ def train_two_tier_system():
     try:
         auc_basic = roc_auc_score(y_test_basic, y_prob_basic)
         print(f"ROC-AUC: {auc_basic:.4f}")
+        metrics['tier1_roc_auc'] = round(float(auc_basic), 4)
     except:
         pass
     
@@ -92,16 +141,8 @@ def train_two_tier_system():
     print("TIER 2: ENHANCED MODEL (With Precursor Awards)")
     print("=" * 60)
     
-        # Tier 2: Just add precursor awards (don't require ratings/sentiment)
-    enhanced_features = basic_features + [
-        'won_gg_drama',
-        'won_gg_musical',
-        'won_bafta',
-        'won_sag_cast',
-        'total_precursor_wins',
-        'has_precursor_win',
-        'precursor_sweep',
-    ]
+    # Tier 2: Just add precursor awards (don't require ratings/sentiment)
+    enhanced_features = list(ENHANCED_FEATURES)
 
     print(f"Enhanced features: {enhanced_features}")
     
@@ -124,14 +165,9 @@ def train_two_tier_system():
             print(f"Training: {len(X_train_enh)}, Testing: {len(X_test_enh)}")
             
             # Train
-            model_enhanced = RandomForestClassifier(
-                n_estimators=300,
-                max_depth=10,
-                class_weight={0: 1, 1: 15},
-                random_state=42
-            )
+            model_enhanced = make_model(backend, params['tier2'])
             
-            model_enhanced.fit(X_train_enh, y_train_enh)
+            fit_model(model_enhanced, X_train_enh, y_train_enh, groups=train_enh['year_ceremony'])
             
             # Evaluate
             if len(X_test_enh) > 0:
@@ -144,6 +180,7 @@ def train_two_tier_system():
                 try:
                     auc_enh = roc_auc_score(y_test_enh, y_prob_enh)
                     print(f"ROC-AUC: {auc_enh:.4f}")
+                    metrics['tier2_roc_auc'] = round(float(auc_enh), 4)
                 except:
                     pass
         else:
@@ -154,31 +191,25 @@ def train_two_tier_system():
         model_enhanced = None
     
     # --------------------------------------------------
-    # Save Models
+    # Save Models (bundled with their feature schema)
     # --------------------------------------------------
-    os.makedirs('models', exist_ok=True)
-    
-    joblib.dump(model_basic, 'models/tier1_basic_model.pkl')
-    print(f"\n💾 Tier 1 model saved")
+    path = save_bundle('tier1_basic', model_basic, X_train_basic, frame_hash(train_basic),
+                       {'roc_auc': metrics.get('tier1_roc_auc')}, years=train_basic['year_ceremony'])
+    print(f"\n💾 Tier 1 model saved to {path}")
+    artifacts = [path]
     
     if model_enhanced:
-        joblib.dump(model_enhanced, 'models/tier2_enhanced_model.pkl')
-        print(f"💾 Tier 2 model saved")
-    
-    # Save feature lists
-    with open('models/basic_features.txt', 'w') as f:
-        for feat in basic_features:
-            f.write(f"{feat}\n")
-    
-    if model_enhanced:
-        with open('models/enhanced_features.txt', 'w') as f:
-            for feat in enhanced_features:
-                f.write(f"{feat}\n")
+        path = save_bundle('tier2_enhanced', model_enhanced, X_train_enh, frame_hash(train_enh),
+                           {'roc_auc': metrics.get('tier2_roc_auc')}, years=train_enh['year_ceremony'])
+        print(f"💾 Tier 2 model saved to {path}")
+        artifacts.append(path)
     
     print("\n✅ TWO-TIER SYSTEM COMPLETE!")
     
-    return model_basic, model_enhanced
+    return metrics, artifacts
 
 
 if __name__ == "__main__":
-    train_two_tier_system()
\ No newline at end of file
+    # python src/model_two_tier.py [--backend hist_gb|xgboost] [--force]
+    backend = sys.argv[sys.argv.index('--backend') + 1] if '--backend' in sys.argv else 'random_forest'
+    train_two_tier_system(backend, force='--force' in sys.argv)
\ No newline at end of file
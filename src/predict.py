@@ -4,25 +4,9 @@ Uses trained model to predict Oscar winners for new nominees
 """
 
 import pandas as pd
-import joblib
-import os
 
-
-def engineer_features(df):
-    """
-    Create the same features used during training
-    """
-    # Nomination ratio
-    df['nom_ratio'] = df['total_nominations'] / df['year_total_nominations']
-    
-    # Is it the most nominated film that year?
-    df['is_top_nominated'] = (df.groupby('year_ceremony')['total_nominations']
-                               .transform('max') == df['total_nominations']).astype(int)
-    
-    # Nomination rank within year
-    df['nom_rank'] = df.groupby('year_ceremony')['total_nominations'].rank(ascending=False, method='min')
-    
-    return df
+from feature_store import load_features
+from model_registry import has_bundle, lazy_bundle
 
 
 def predict_winners(year=None):
@@ -35,16 +19,17 @@ def predict_winners(year=None):
     
     # Load model
     print("\n📂 Loading trained model...")
-    if not os.path.exists("models/best_picture_model.pkl"):
-        print("❌ Model not found! Please train the model first.")
+    if not has_bundle('best_picture'):
+        print("❌ Model not found! Please train the model first (python models/model.py).")
         return
     
-    model = joblib.load("models/best_picture_model.pkl")
-    print("✅ Model loaded successfully!")
+    # Loaded on the first prediction
+    model = lazy_bundle('best_picture')
+    print(f"✅ Model {model.version} found ({len(model.features)} features)")
     
     # Load data
     print("\n📂 Loading nominee data...")
-    df = pd.read_csv("data/processed/best_picture_clean.csv")
+    df = load_features('best_picture')
     
     # Filter by year if specified
     if year:
@@ -60,19 +45,8 @@ def predict_winners(year=None):
         print(f"❌ No nominees found for year {year}")
         return
     
-    # Engineer features
-    df = engineer_features(df)
-    
-    # Prepare features
-    features = [
-        'total_nominations',
-        'nomination_share',
-        'nom_ratio',
-        'is_top_nominated',
-        'nom_rank'
-    ]
-    
-    X = df[features]
+    # The bundle checks the store's columns against its training schema
+    X = df
     
     # Make predictions
     print(f"\n🔮 Predicting winners for {year} ceremony...")
@@ -4,10 +4,15 @@ Predicts winners across every major Oscar category
 """
 
 import pandas as pd
-import joblib
 import os
+import time
 from datetime import datetime
 
+from calibration import calibrated_predict
+from ensemble import load_ensemble
+from feature_store import FeatureStore
+from joint_model import load_joint_model
+
 
 # ALL 24 OSCAR CATEGORIES DATA
 ALL_CATEGORIES_DATA = {
@@ -214,44 +219,35 @@ ALL_CATEGORIES_DATA = {
 }
 
 
-def predict_single_category(category_name, nominees_data, model, features):
+def build_nominee_frame(categories_data, year=2026):
+    """
+    One row per nominee across all categories, in the feature store layout
+    """
+    rows = []
+    for category_name, nominees_data in categories_data.items():
+        for nominee in nominees_data:
+            row = dict(nominee)
+            row['year_ceremony'] = year
+            row['category'] = category_name
+            row['total_nominations'] = nominee['noms']
+            row['winner'] = 0
+            rows.append(row)
+    
+    # Precursor columns are left out: the registry fills them with 0 until
+    # the results are added
+    return pd.DataFrame(rows)
+
+
+def predict_single_category(category_name, df):
     """
-    Predict winner for a single category
+    Rank and display a single category
+    df: this category's rows, already scored by the joint model
     """
     print(f"\n{'='*70}")
     print(f"📋 {category_name}")
     print('='*70)
     
-    # Create DataFrame
-    df = pd.DataFrame(nominees_data)
-    
-    # Calculate features
-    df['year_ceremony'] = 2026
-    df['total_nominations'] = df['noms']
-    df['nomination_share'] = df['noms'] / df['noms'].sum()
-    df['year_total_nominations'] = df['noms'].sum()
-    df['nom_ratio'] = df['noms'] / df['year_total_nominations']
-    df['is_top_nominated'] = (df['noms'] == df['noms'].max()).astype(int)
-    df['nom_rank'] = df['noms'].rank(ascending=False, method='min')
-    
-    # Precursor awards (placeholder)
-    df['won_gg_drama'] = 0
-    df['won_gg_musical'] = 0
-    df['won_bafta'] = 0
-    df['won_sag_cast'] = 0
-    df['total_precursor_wins'] = 0
-    df['has_precursor_win'] = 0
-    df['precursor_sweep'] = 0
-    
-    # Prepare features
-    X = df[features]
-    
-    # Predict
-    try:
-        probabilities = model.predict_proba(X)[:, 1]
-        df['win_probability'] = probabilities
-    except:
-        df['win_probability'] = df['nomination_share']
+    df = df.copy()
     
     # Sort by probability
     df = df.sort_values('win_probability', ascending=False)
@@ -288,45 +284,51 @@ def predict_all_categories():
     print("🎬 COMPLETE 2026 OSCAR PREDICTIONS - ALL 24 CATEGORIES")
     print("="*70)
     
-    # Load model
-    print("\n🤖 Loading prediction model...")
-    try:
-        model = joblib.load('models/tier2_enhanced_model.pkl')
-        print("✅ Loaded Tier 2 Enhanced Model")
-    except:
-        try:
-            model = joblib.load('models/tier1_basic_model.pkl')
-            print("✅ Loaded Tier 1 Basic Model")
-        except:
-            print("❌ No model found!")
-            return
-    
-    # Features
-    features = [
-        'total_nominations',
-        'nomination_share',
-        'nom_ratio',
-        'is_top_nominated',
-        'nom_rank',
-        'won_gg_drama',
-        'won_gg_musical',
-        'won_bafta',
-        'won_sag_cast',
-        'total_precursor_wins',
-        'has_precursor_win',
-        'precursor_sweep',
-    ]
-    
-    # Predict each category
+    # Stacked ensemble when one has been trained (src/ensemble.py) and beat
+    # the joint model in its rolling evaluation, otherwise the joint model.
+    # Chosen from the registry manifest; the bundle loads on the first predict
+    print("\n🤖 Selecting prediction model...")
+    model = load_ensemble()
+    scores = None
+    if model is not None and 'joint_log_loss' in model.metrics:
+        scores = model.metrics['ensemble_log_loss_vs_joint'], model.metrics['joint_log_loss']
+    if scores is not None and scores[0] < scores[1]:
+        print(f"✅ Stacked ensemble {model.version} "
+              f"(log-loss {scores[0]:.3f} vs joint {scores[1]:.3f})")
+    else:
+        if scores is not None:
+            print(f"⚠️ Stacked ensemble skipped: log-loss {scores[0]:.3f} doesn't beat the joint model's {scores[1]:.3f}")
+        elif model is not None:
+            print("⚠️ Stacked ensemble skipped: it wasn't evaluated against the joint model")
+        model = load_joint_model()
+        print(f"✅ Joint multi-category model {model.version}")
+    
+    # This year's nominees go through the same feature store as training
+    print("\n🔧 Materializing 2026 features...")
+    store = FeatureStore('all_categories')
+    stale = store.stale_races()
+    if stale:
+        print(f"♻️ Re-predicting after new precursor results: "
+              f"{', '.join(category for _, category in stale)}")
+    nominee_features = store.add_year(build_nominee_frame(ALL_CATEGORIES_DATA))
+    
+    # One batched call scores every race; probabilities sum to 1 per race
+    # (calibrated per category, fitted when the model was trained)
+    start = time.perf_counter()
+    nominee_features['win_probability'] = calibrated_predict(model, nominee_features)
+    print(f"⚡ Scored {len(nominee_features)} nominees in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms (including the model load)")
+    if getattr(model.estimator, 'calibrator', None) is not None:
+        print("📐 Per-category calibration applied")
+    
+    # Display each category
     all_predictions = {}
     summary = []
     
-    for category_name, nominees_data in ALL_CATEGORIES_DATA.items():
+    for category_name in ALL_CATEGORIES_DATA:
         predictions, winner_name, win_prob = predict_single_category(
             category_name, 
-            nominees_data, 
-            model, 
-            features
+            nominee_features[nominee_features['display_category'] == category_name]
         )
         all_predictions[category_name] = predictions
         summary.append({
@@ -376,6 +378,7 @@ def predict_all_categories():
     # Master summary
     summary_df = pd.DataFrame(summary)
     summary_df.to_csv('data/predictions_2026/ALL_CATEGORIES_SUMMARY.csv', index=False)
+    store.clear_stale()
     
     print(f"\n💾 All 24 category predictions saved!")
     print(f"📊 Summary: data/predictions_2026/ALL_CATEGORIES_SUMMARY.csv")
@@ -0,0 +1,204 @@
+"""
+Historical Analog Race Search
+KD-tree over one feature vector per historical race (nomination-share
+profile, precursor pattern, rank structure). Given this year's race, returns
+the most similar past races and how they turned out
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from feature_registry import PRECURSOR_COLUMNS, compute_features
+from feature_store import CATEGORY_ALIASES, load_base_frame
+
+
+TOP_K_SHARES = 5
+
+VECTOR_COLUMNS = [f'share_{i + 1}' for i in range(TOP_K_SHARES)] + [
+    'field_size',
+    'share_gap',
+    'top_tie_share',
+    'precursor_spread',
+    'max_precursor_wins',
+    'favourite_has_precursor',
+    'precursors_split',
+]
+
+
+def race_vector(rows):
+    """
+    Fixed-length description of one race from its nominee rows
+    (total_nominations plus any precursor columns)
+    """
+    noms = rows['total_nominations'].fillna(0).to_numpy(dtype=np.float64)
+    total = noms.sum() or 1.0
+    shares = np.sort(noms / total)[::-1]
+    padded = np.zeros(TOP_K_SHARES)
+    padded[:min(TOP_K_SHARES, len(shares))] = shares[:TOP_K_SHARES]
+
+    precursor = np.zeros(len(rows))
+    for column in PRECURSOR_COLUMNS:
+        if column in rows.columns:
+            precursor += rows[column].fillna(0).to_numpy(dtype=np.float64)
+    favourite = int(np.argmax(noms)) if len(noms) else 0
+
+    return np.concatenate([padded, [
+        len(rows) / 10,
+        shares[0] - shares[1] if len(shares) > 1 else shares[0] if len(shares) else 0,
+        (noms == noms.max()).sum() / len(noms) if len(noms) else 0,
+        (precursor > 0).mean() if len(noms) else 0,
+        precursor.max() / len(PRECURSOR_COLUMNS) if len(noms) else 0,
+        float(len(noms) > 0 and precursor[favourite] > 0),
+        float((precursor > 0).sum() > 1),
+    ]])
+
+
+def historical_races():
+    """
+    Nominee rows for every single-winner race: Best Picture from the
+    precursor-matched dataset, every other named category from
+    all_categories_master ('Other' mixes categories and is skipped)
+    """
+    picture = load_base_frame('best_picture_full_gg')
+    others = load_base_frame('all_categories')
+    others = others[~others['category'].isin(['Best Picture', 'Other'])]
+
+    frame = pd.concat([picture, others[picture.columns.intersection(others.columns)]], ignore_index=True)
+    frame = compute_features(frame, names=['nom_rank', 'total_precursor_wins'])
+
+    winners = frame.groupby(['year_ceremony', 'category'])['winner'].transform('sum')
+    return frame[winners == 1].reset_index(drop=True)
+
+
+class AnalogIndex:
+    """
+    One KD-tree over all races plus one per category
+    """
+
+    def __init__(self, races=None):
+        races = historical_races() if races is None else races
+
+        vectors, outcomes = [], []
+        for (year, category), rows in races.groupby(['year_ceremony', 'category'], sort=True):
+            winner = rows[rows['winner'] == 1].iloc[0]
+            vectors.append(race_vector(rows))
+            outcomes.append({
+                'year': int(year),
+                'category': category,
+                'winner': winner['nominee'],
+                'winner_film': winner['film'],
+                'winner_nominations': int(winner['total_nominations']),
+                'winner_nom_rank': int(winner['nom_rank']),
+                'winner_precursor_wins': int(winner['total_precursor_wins']),
+                'favourite_won': int(winner['nom_rank'] == 1),
+                'field_size': len(rows),
+            })
+
+        self.raw = np.vstack(vectors)
+        self.outcomes = pd.DataFrame(outcomes)
+
+        # Global tree across categories, plus one per category. Each tree
+        # standardizes with its own races and drops dimensions that never
+        # vary there (e.g. precursors, only recorded for Best Picture)
+        self.trees = {None: self._build_tree(np.arange(len(self.outcomes)))}
+        for category in self.outcomes['category'].unique():
+            self.trees[category] = self._build_tree(np.flatnonzero(self.outcomes['category'] == category))
+
+    def _build_tree(self, positions):
+        vectors = self.raw[positions]
+        std = vectors.std(axis=0)
+        active = std > 1e-9
+        mean, scale = vectors.mean(axis=0)[active], std[active]
+        tree = cKDTree((vectors[:, active] - mean) / scale)
+        return {'tree': tree, 'positions': positions, 'active': active, 'mean': mean, 'scale': scale}
+
+    def query(self, rows, k=5, category=None, exclude_year=None):
+        """
+        k most similar historical races to `rows` (one race's nominees).
+        With a category, analogs come from that category only, and a
+        category with no history gets none; category=None searches every
+        category.
+        """
+        category = CATEGORY_ALIASES.get(category, category)
+        if category not in self.trees:
+            return pd.DataFrame(columns=[*self.outcomes.columns, 'distance'])
+        entry = self.trees[category]
+        tree, positions = entry['tree'], entry['positions']
+        point = (race_vector(rows)[entry['active']] - entry['mean']) / entry['scale']
+
+        # Over-fetch so excluding a year still leaves k results
+        fetch = min(len(positions), k + (1 if exclude_year is not None else 0))
+        distances, idx = tree.query(point, k=fetch)
+        distances, idx = np.atleast_1d(distances), np.atleast_1d(idx)
+
+        result = self.outcomes.iloc[positions[idx]].copy()
+        result['distance'] = distances
+        if exclude_year is not None:
+            result = result[result['year'] != exclude_year]
+        return result.head(k).reset_index(drop=True)
+
+
+def describe_analog(analog):
+    """
+    One-line explanation of an analog race
+    """
+    rank = int(analog['winner_nom_rank'])
+    how = "the most-nominated nominee won" if rank == 1 else f"won from nomination rank #{rank}"
+    precursors = int(analog['winner_precursor_wins'])
+    precursor_text = f", {precursors} precursor win{'s' if precursors != 1 else ''}" if precursors else ""
+    winner = analog['winner']
+    if analog['winner_film'] and analog['winner_film'] != winner:
+        winner = f"{winner} ({analog['winner_film']})"
+    return (f"{analog['year']} {analog['category']}: {winner} - {how} "
+            f"({analog['winner_nominations']} noms{precursor_text})")
+
+
+# Website short names -> names used by predict_all_categories_2026.py
+PREDICTION_CATEGORIES = {
+    'Best Actor': 'Best Actor in a Leading Role',
+    'Best Actress': 'Best Actress in a Leading Role',
+    'Best Supporting Actor': 'Best Actor in a Supporting Role',
+    'Best Supporting Actress': 'Best Actress in a Supporting Role',
+}
+
+
+def load_prediction_race(category, folder='data/predictions_2026'):
+    """
+    A 2026 race's nominees from its predictions CSV (None if not predicted)
+    """
+    category = PREDICTION_CATEGORIES.get(category, category)
+    safe_name = category.lower().replace(' ', '_').replace(',', '').replace('-', '_')
+    path = os.path.join(folder, f'{safe_name}_predictions.csv')
+    return pd.read_csv(path) if os.path.exists(path) else None
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("HISTORICAL ANALOG RACES")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    index = AnalogIndex()
+    print(f"\n🌳 Indexed {len(index.outcomes)} races in {time.perf_counter() - start:.2f}s")
+
+    category = sys.argv[1] if len(sys.argv) > 1 else 'Best Picture'
+    race = load_prediction_race(category)
+    if race is None:
+        print(f"\n⚠️ No 2026 predictions for {category} - run the prediction script first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    analogs = index.query(race, k=5, category=category)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if analogs.empty:
+        print(f"\n⚠️ No historical {category} races to compare with")
+        sys.exit(0)
+
+    print(f"\n🔍 2026 {category} - closest historical races ({elapsed_ms:.1f} ms):")
+    for _, analog in analogs.iterrows():
+        print(f"   • {describe_analog(analog)}  [distance {analog['distance']:.2f}]")
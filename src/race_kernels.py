@@ -0,0 +1,242 @@
+"""
+Within-Race NumPy Kernels
+Sorts rows by race (year, category) once and keeps CSR-style offsets, so
+share / ratio / top-nominated / rank become a handful of reduceat calls
+instead of thousands of small pandas groupby operations
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class RaceIndex:
+    """
+    Row order and offsets for grouping rows into races
+
+    order:   row positions sorted by race
+    starts:  offset of each race's first row in sorted order (CSR indptr
+             without the final end)
+    sizes:   rows per race
+    race_id: race number of every row, in original order
+    """
+
+    def __init__(self, *keys):
+        # Hash-factorize each key column (much cheaper than sorting strings),
+        # then pack them into one int64 race key so a single stable argsort
+        # groups the rows - rows keep their original order inside each race.
+        # Missing keys get a code of their own (the default -1 would collide
+        # with another race's packed key)
+        race_key = np.zeros(len(keys[0]), dtype=np.int64)
+        for k in keys:
+            codes, uniques = pd.factorize(k, sort=True, use_na_sentinel=False)
+            race_key = race_key * max(len(uniques), 1) + codes
+
+        self.order = np.argsort(race_key, kind='stable')
+        self.n_rows = len(self.order)
+
+        sorted_key = race_key[self.order]
+        changed = np.ones(self.n_rows, dtype=bool)
+        changed[1:] = sorted_key[1:] != sorted_key[:-1]
+
+        self.starts = np.flatnonzero(changed)
+        self.sizes = np.diff(np.append(self.starts, self.n_rows))
+        self.n_races = len(self.starts)
+
+        sorted_race = np.repeat(np.arange(self.n_races), self.sizes)
+        self.race_id = np.empty(self.n_rows, dtype=np.int64)
+        self.race_id[self.order] = sorted_race
+
+    @classmethod
+    def from_frame(cls, df, columns=('year_ceremony', 'category')):
+        # Pass Series through: factorizing pandas string columns directly
+        # avoids a slow conversion to object arrays
+        return cls(*[df[c] for c in columns])
+
+    # -------------------- helpers --------------------
+
+    def to_sorted(self, values):
+        return np.asarray(values, dtype=np.float64)[self.order]
+
+    def to_original(self, sorted_values):
+        out = np.empty_like(sorted_values)
+        out[self.order] = sorted_values
+        return out
+
+    def broadcast(self, per_race):
+        """
+        Per-race values -> one value per row (original order)
+        """
+        return np.asarray(per_race)[self.race_id]
+
+    def reduce(self, ufunc, values):
+        """
+        ufunc.reduceat over every race, e.g. reduce(np.add, x) -> race sums
+        """
+        return ufunc.reduceat(self.to_sorted(values), self.starts) if self.n_rows else np.empty(0)
+
+
+# ==================== KERNELS ====================
+
+def race_share(index, values):
+    """
+    value / race total (nomination_share)
+    """
+    return np.asarray(values, dtype=np.float64) / index.broadcast(index.reduce(np.add, values))
+
+
+def race_ratio(index, values):
+    """
+    value / race mean (nom_ratio)
+    """
+    means = index.reduce(np.add, values) / index.sizes
+    return np.asarray(values, dtype=np.float64) / index.broadcast(means)
+
+
+def race_max_flag(index, values):
+    """
+    1 where the value equals the race maximum (is_top_nominated)
+    """
+    maxima = index.reduce(np.maximum, values)
+    return (np.asarray(values, dtype=np.float64) == index.broadcast(maxima)).astype(np.int64)
+
+
+def race_rank(index, values):
+    """
+    Descending rank within race, ties share the lowest rank (pandas
+    rank(ascending=False, method='min'))
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return values.copy()
+
+    # Nomination counts are small integers: rank = 1 + number of race-mates
+    # with a higher count, read off a per-race histogram - no sort at all
+    finite = np.isfinite(values).all()
+    span = int(values.max() - values.min()) + 1 if finite else 0
+    if finite and index.n_races * span <= 4 * len(values) + 1024 and np.array_equal(values, np.round(values)):
+        distance = (values.max() - values).astype(np.int64)  # 0 = race-wide max
+        hist = np.bincount(index.race_id * span + distance, minlength=index.n_races * span)
+        hist = hist.reshape(index.n_races, span)
+        higher = np.cumsum(hist, axis=1) - hist
+        return (higher[index.race_id, distance] + 1).astype(np.float64)
+
+    # General case - segment sort: by race, then by value descending
+    order = np.lexsort((-values, index.race_id))
+    sorted_values = values[order]
+    sorted_race = index.race_id[order]
+
+    n = len(order)
+    positions = np.arange(n)
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = (sorted_race[1:] != sorted_race[:-1]) | (sorted_values[1:] != sorted_values[:-1])
+    tie_start = np.maximum.accumulate(np.where(new_group, positions, 0))
+
+    ranks = np.empty(n, dtype=np.float64)
+    ranks[order] = tie_start - index.starts[sorted_race] + 1
+    return ranks
+
+
+# ==================== BENCHMARK ====================
+
+def pandas_features(df):
+    """
+    The groupby path the kernels replace
+    """
+    groups = df.groupby(['year_ceremony', 'category'], sort=False)['total_nominations']
+    return {
+        'nomination_share': df['total_nominations'] / groups.transform('sum'),
+        'nom_ratio': df['total_nominations'] / groups.transform('mean'),
+        'is_top_nominated': (groups.transform('max') == df['total_nominations']).astype(int),
+        'nom_rank': groups.rank(ascending=False, method='min'),
+    }
+
+
+def kernel_features(df, index=None):
+    index = index or RaceIndex.from_frame(df)
+    noms = df['total_nominations'].to_numpy()
+    return {
+        'nomination_share': race_share(index, noms),
+        'nom_ratio': race_ratio(index, noms),
+        'is_top_nominated': race_max_flag(index, noms),
+        'nom_rank': race_rank(index, noms),
+    }
+
+
+def scaled_frame(base, scale, seed=42):
+    """
+    base repeated `scale` times as distinct races, with nomination counts
+    jittered so every copy is a different race
+    """
+    rng = np.random.default_rng(seed)
+    n = len(base)
+    # Categorical keeps the 10,000x frame (36M rows) within a few GB
+    codes, categories = pd.factorize(base['category'])
+    return pd.DataFrame({
+        'year_ceremony': (np.tile(base['year_ceremony'].to_numpy(), scale)
+                          + 10000 * np.repeat(np.arange(scale), n)),
+        'category': pd.Categorical.from_codes(np.tile(codes, scale), categories),
+        'total_nominations': (np.tile(base['total_nominations'].to_numpy(np.int64), scale)
+                              + rng.integers(0, 3, n * scale)),
+    })
+
+
+def benchmark(scales=(1, 100, 10000), max_pandas_rows=None):
+    """
+    Time pandas groupby vs kernels on the all-categories data at each scale
+    """
+    print("=" * 70)
+    print("RACE KERNEL BENCHMARK")
+    print("=" * 70)
+
+    base = pd.read_csv('data/processed/all_categories_master.csv')
+    base = base.rename(columns={'year': 'year_ceremony'})
+    base['total_nominations'] = base['total_nominations'].fillna(0)
+
+    results = []
+    for scale in scales:
+        df = scaled_frame(base, scale)
+
+        start = time.perf_counter()
+        kernels = kernel_features(df)
+        kernel_time = time.perf_counter() - start
+
+        # Monte Carlo / what-if use: same races, new values, index reused
+        index = RaceIndex.from_frame(df)
+        start = time.perf_counter()
+        kernel_features(df, index)
+        reuse_time = time.perf_counter() - start
+
+        pandas_time = None
+        if max_pandas_rows is None or len(df) <= max_pandas_rows:
+            start = time.perf_counter()
+            expected = pandas_features(df)
+            pandas_time = time.perf_counter() - start
+            for name, values in expected.items():
+                np.testing.assert_allclose(kernels[name], values.to_numpy(dtype=np.float64))
+
+        results.append({
+            'scale': f"{scale}x",
+            'rows': len(df),
+            'pandas_sec': pandas_time,
+            'kernel_sec': kernel_time,
+            'kernel_reused_index_sec': reuse_time,
+            'speedup': pandas_time / kernel_time if pandas_time else None,
+        })
+        speedup = f"{pandas_time / kernel_time:.1f}x" if pandas_time else "skipped"
+        pandas_label = f"{pandas_time:.3f}s" if pandas_time else "-"
+        print(f"\n⏱️ {scale}x ({len(df):,} rows): kernels {kernel_time:.3f}s, "
+              f"pandas {pandas_label} → {speedup}")
+
+    results = pd.DataFrame(results)
+    print("\n" + results.to_string(index=False))
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    # e.g. python src/race_kernels.py 1 100 10000
+    scales = [int(s) for s in sys.argv[1:]] or [1, 100, 10000]
+    benchmark(scales)
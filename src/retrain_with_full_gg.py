@@ -4,63 +4,46 @@ Compare performance before vs after
 """
 
 import pandas as pd
-import joblib
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, roc_auc_score
-import os
+import sys
 
+from experiment_store import frame_hash, tracked_run
+from feature_registry import ENHANCED_FEATURES
+from feature_store import load_features
+from model_registry import activate_restored, load_bundle, save_bundle
 
-def retrain_with_full_gg():
+
+DEFAULTS = {
+    'n_estimators': 200,
+    'max_depth': 8,
+    'min_samples_split': 3,
+    'min_samples_leaf': 2,
+    'class_weight': {0: 1, 1: 10},
+    'random_state': 42,
+}
+
+
+def retrain_with_full_gg(force=False):
     """
     Retrain the model with expanded Golden Globes data
+    force: retrain even if this exact run is in the experiment store
     """
     print("="*70)
     print("🔄 RETRAINING MODEL WITH FULL GOLDEN GLOBES DATA")
     print("="*70)
     
     # Load the expanded dataset
-    df = pd.read_csv('data/processed/oscar_with_full_gg_matched.csv')
+    df = load_features('best_picture_full_gg')
     
     print(f"\n✅ Loaded {len(df)} records")
     print(f"   Years: {df['year_ceremony'].min()} - {df['year_ceremony'].max()}")
     print(f"   Films with GG data: {((df['won_gg_drama'] > 0) | (df['won_gg_musical'] > 0)).sum()}")
     
-    # Prepare features
-    print(f"\n🔧 Preparing features...")
-    
-    # Basic features
-    df['nomination_share'] = df['total_nominations'] / df['year_total_nominations']
-    df['nom_ratio'] = df['total_nominations'] / df.groupby('year_ceremony')['total_nominations'].transform('mean')
-    df['is_top_nominated'] = (df['total_nominations'] == df.groupby('year_ceremony')['total_nominations'].transform('max')).astype(int)
-    df['nom_rank'] = df.groupby('year_ceremony')['total_nominations'].rank(ascending=False, method='min')
-    
-    # Precursor features
-    df['total_precursor_wins'] = df['won_gg_drama'] + df['won_gg_musical']
-    df['has_precursor_win'] = (df['total_precursor_wins'] > 0).astype(int)
-    df['precursor_sweep'] = 0  # Will be 1 when film wins GG+BAFTA+SAG
-    
-    # Add placeholder for BAFTA/SAG
-    if 'won_bafta' not in df.columns:
-        df['won_bafta'] = 0
-    if 'won_sag_cast' not in df.columns:
-        df['won_sag_cast'] = 0
-    
-    # Features list
-    features = [
-        'total_nominations',
-        'nomination_share',
-        'nom_ratio',
-        'is_top_nominated',
-        'nom_rank',
-        'won_gg_drama',
-        'won_gg_musical',
-        'won_bafta',
-        'won_sag_cast',
-        'total_precursor_wins',
-        'has_precursor_win',
-        'precursor_sweep',
-    ]
+    # Features come from the registry; BAFTA/SAG are 0 in this source, so
+    # total_precursor_wins counts GG wins and precursor_sweep stays 0
+    features = list(ENHANCED_FEATURES)
     
     # Prepare data
     X = df[features]
@@ -79,32 +62,49 @@ def retrain_with_full_gg():
     print(f"   Training: {len(X_train)} films (up to 2021)")
     print(f"   Testing: {len(X_test)} films (2022-2024)")
     
-    # Train model
-    print(f"\n🤖 Training Random Forest...")
-    
-    model = RandomForestClassifier(
-        n_estimators=200,
-        max_depth=8,
-        min_samples_split=3,
-        min_samples_leaf=2,
-        class_weight={0: 1, 1: 10},
-        random_state=42
-    )
-    
-    model.fit(X_train, y_train)
-    
-    print(f"✅ Model trained!")
+    # Imported here because the backtest reads DEFAULTS from this module
+    from hyperparameter_search import tuned_params
+    params = tuned_params('full_gg', DEFAULTS)
     
-    # Evaluate
-    print(f"\n📊 MODEL PERFORMANCE:")
-    
-    y_pred = model.predict(X_test)
-    y_proba = model.predict_proba(X_test)[:, 1]
-    
-    print(classification_report(y_test, y_pred, zero_division=0))
-    
-    roc_auc = roc_auc_score(y_test, y_proba)
-    print(f"ROC-AUC: {roc_auc:.4f}")
+    def fit():
+        # Train model
+        print(f"\n🤖 Training Random Forest...")
+        
+        model = RandomForestClassifier(**params)
+        
+        model.fit(X_train, y_train)
+        
+        print(f"✅ Model trained!")
+        
+        # Evaluate
+        print(f"\n📊 MODEL PERFORMANCE:")
+        
+        y_pred = model.predict(X_test)
+        y_proba = model.predict_proba(X_test)[:, 1]
+        
+        print(classification_report(y_test, y_pred, zero_division=0))
+        
+        roc_auc = roc_auc_score(y_test, y_proba)
+        print(f"ROC-AUC: {roc_auc:.4f}")
+        
+        # Save new model (bundled with its feature schema)
+        metrics = {'roc_auc': round(float(roc_auc), 4)}
+        path = save_bundle('full_gg', model, X_train, frame_hash(df[train_mask]), metrics,
+                           years=df.loc[train_mask, 'year_ceremony'])
+        
+        print(f"\n💾 New model saved to: {path}")
+        
+        return metrics, [path]
+    
+    # Skipped when this exact run is already in the experiment store
+    data = frame_hash(df[features + ['winner', 'year_ceremony', 'film']])
+    run = tracked_run('full_gg', params, data, fit, code_modules=(sys.modules[__name__],), force=force)
+    roc_auc = run['metrics']['roc_auc']
+    if run['cached']:
+        activate_restored(next(iter(run['artifacts'])))
+        print(f"ROC-AUC: {roc_auc:.4f}")
+    bundle = load_bundle('full_gg')
+    model = bundle.estimator
     
     # Feature importance
     print(f"\n📈 FEATURE IMPORTANCE:")
@@ -130,20 +130,13 @@ def retrain_with_full_gg():
     else:
         print(f"   ➡️ Same performance")
     
-    # Save new model
-    os.makedirs('models', exist_ok=True)
-    model_path = 'models/tier2_enhanced_model_full_gg.pkl'
-    joblib.dump(model, model_path)
-    
-    print(f"\n💾 New model saved to: {model_path}")
-    
     # Test on recent films
     print(f"\n🔮 TESTING ON 2024 FILMS:")
     test_2024 = df[df['year_ceremony'] == 2024].copy()
     
     if len(test_2024) > 0:
         X_2024 = test_2024[features]
-        proba_2024 = model.predict_proba(X_2024)[:, 1]
+        proba_2024 = bundle.predict_proba(X_2024)[:, 1]
         test_2024['predicted_prob'] = proba_2024
         
         test_2024_sorted = test_2024.sort_values('predicted_prob', ascending=False)
@@ -163,4 +156,5 @@ def retrain_with_full_gg():
 
 
 if __name__ == "__main__":
-    retrain_with_full_gg()
\ No newline at end of file
+    # python src/retrain_with_full_gg.py [--force]
+    retrain_with_full_gg(force='--force' in sys.argv)
\ No newline at end of file
@@ -6,6 +6,8 @@ Checks if predictions align with historical patterns
 import pandas as pd
 import os
 
+from race_analogs import AnalogIndex, describe_analog, load_prediction_race
+
 
 def validate_best_picture():
     """
@@ -187,55 +189,33 @@ def check_historical_comparison():
     print(f"   GG Drama: {'✅' if top_pred.get('won_gg_drama', 0) == 1 else '❌'}")
     print(f"   Win Probability: {top_pred['win_probability']:.1%}")
     
-    print("\n📊 Similar Historical Winners:")
-    
-    # Find historical analogs
-    historical_analogs = [
-        {
-            'year': 2024,
-            'film': 'Oppenheimer',
-            'noms': 13,
-            'gg_drama': True,
-            'bafta': True,
-            'sag': True,
-            'result': 'WON ✅'
-        },
-        {
-            'year': 2022,
-            'film': 'CODA',
-            'noms': 3,
-            'gg_drama': False,
-            'bafta': False,
-            'sag': True,
-            'result': 'WON ✅ (upset!)'
-        },
-        {
-            'year': 2021,
-            'film': 'Nomadland',
-            'noms': 6,
-            'gg_drama': True,
-            'bafta': True,
-            'sag': False,
-            'result': 'WON ✅'
-        },
-        {
-            'year': 2020,
-            'film': 'Parasite',
-            'noms': 6,
-            'gg_drama': False,
-            'bafta': False,
-            'sag': True,
-            'result': 'WON ✅'
-        },
-    ]
-    
-    for analog in historical_analogs:
-        print(f"\n{analog['year']} - {analog['film']}:")
-        print(f"   Nominations: {analog['noms']}")
-        print(f"   GG Drama: {'✅' if analog['gg_drama'] else '❌'}")
-        print(f"   BAFTA: {'✅' if analog['bafta'] else '❌'}")
-        print(f"   SAG: {'✅' if analog['sag'] else '❌'}")
-        print(f"   Result: {analog['result']}")
+    print("\n📊 Most Similar Historical Races (KD-tree over race features):")
+    
+    index = AnalogIndex()
+    analogs = index.query(df, k=5, category='Best Picture')
+    
+    for _, analog in analogs.iterrows():
+        print(f"\n{analog['year']} - {analog['winner']}:")
+        print(f"   Nominations: {analog['winner_nominations']} (rank #{analog['winner_nom_rank']} of {analog['field_size']})")
+        print(f"   Precursor wins: {analog['winner_precursor_wins']}")
+        print(f"   Similarity distance: {analog['distance']:.2f}")
+        print(f"   Result: {'Favourite won ✅' if analog['favourite_won'] else 'Upset ⚡'}")
+    
+    favourite_rate = analogs['favourite_won'].mean()
+    print(f"\n   📌 The most-nominated film won {favourite_rate:.0%} of these analog races")
+    
+    # Same lookup for every other category with a predictions file
+    print("\n📚 Closest analog per category:")
+    for category in ['Best Director', 'Best Actor in a Leading Role', 'Best Actress in a Leading Role',
+                     'Best Actor in a Supporting Role', 'Best Actress in a Supporting Role',
+                     'Best Cinematography', 'Best Film Editing']:
+        race = load_prediction_race(category)
+        if race is not None:
+            closest = index.query(race, k=1, category=category)
+            if closest.empty:
+                print(f"   {category}: no historical races in this category")
+            else:
+                print(f"   {category}: {describe_analog(closest.iloc[0])}")
 
 
 def final_verdict():
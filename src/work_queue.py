@@ -0,0 +1,358 @@
+"""
+Distributed Backtest Work Queue
+A coordinator serves (model config, fold) backtest tasks over TCP and any
+number of workers - on this host or others - pull them, read the feature
+store, fit the fold and push the result back. No external broker: the
+standard library's authenticated multiprocessing connections carry the
+messages. Those are pickles, so the shared key matters: a coordinator
+reachable from other hosts needs an explicit OSCAR_QUEUE_KEY, and one on
+the loopback interface without it uses a random key for the run. Tasks
+of a worker whose connection drops, or that holds a task past its lease,
+go back on the queue. Results land in the backtest's per-fold cache, so
+backtest.py reads them like locally computed folds
+"""
+
+import ipaddress
+import multiprocessing
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Client, Listener
+
+import pandas as pd
+
+from backtest import (FIRST_YEAR, FULL_HISTORY_FIRST_YEAR, MODELS, backtest_all, build_matrix, completed_years,
+                      load_result, make_folds, open_matrix, run_fold, save_result)
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 5917
+KEY_VARIABLE = 'OSCAR_QUEUE_KEY'
+
+LEASE_SECONDS = 600       # a task not returned in this time is handed out again
+POLL_SECONDS = 1.0        # how long a worker waits when only leased tasks remain
+MAX_ATTEMPTS = 3          # worker-reported failures before a task is given up
+CONNECT_RETRIES = 30
+
+
+# ==================== KEYS ====================
+
+def is_loopback(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def coordinator_key(host):
+    """
+    $OSCAR_QUEUE_KEY, or a random key for a coordinator bound to loopback.
+    Refuses to serve other interfaces without an explicit key: whoever
+    knows the key can make the coordinator unpickle anything.
+    """
+    key = os.environ.get(KEY_VARIABLE)
+    if key:
+        return key.encode()
+    if not is_loopback(host):
+        raise ValueError(f"Refusing to serve on {host} without a key - set {KEY_VARIABLE} to a secret "
+                         f"shared with the workers")
+    return secrets.token_hex(16).encode()
+
+
+def worker_key():
+    key = os.environ.get(KEY_VARIABLE)
+    if not key:
+        raise ValueError(f"Set {KEY_VARIABLE} to the coordinator's key")
+    return key.encode()
+
+
+# ==================== TASKS ====================
+
+def backtest_tasks(models=None, modes=('rolling', 'loyo'), full_history=False, use_cache=True):
+    """
+    Every uncached (config, fold, matrix directory) of the given models
+    """
+    tasks = []
+    first_year = FULL_HISTORY_FIRST_YEAR if full_history else FIRST_YEAR
+    for name in models or MODELS:
+        config = MODELS[name]
+        path = build_matrix(config['source'], config['features'])
+        ids = pd.read_parquet(os.path.join(path, 'ids.parquet'))
+        for mode in modes:
+            for fold in make_folds(completed_years(ids), mode, first_year):
+                if not use_cache or load_result(config, fold, path) is None:
+                    tasks.append((config, fold, path))
+    return tasks
+
+
+# ==================== COORDINATOR ====================
+
+class Coordinator:
+    """
+    Hands out tasks one at a time per worker connection and collects results.
+
+    pending:   task ids waiting for a worker
+    leases:    task id -> (worker, deadline) for tasks being worked on
+    results:   task id -> result (first result wins; late duplicates ignored)
+    """
+
+    def __init__(self, tasks, host=DEFAULT_HOST, port=DEFAULT_PORT, authkey=None,
+                 lease_seconds=LEASE_SECONDS, verbose=True):
+        self.tasks = list(tasks)
+        self.pending = deque(range(len(self.tasks)))
+        self.leases = {}
+        self.results = {}
+        self.failed = {}
+        self.attempts = {}
+        self.workers = set()
+        self.lease_seconds = lease_seconds
+        self.verbose = verbose
+        self.lock = threading.Condition()
+        self.authkey = authkey or coordinator_key(host)
+        self.listener = Listener((host, port), authkey=self.authkey)
+        self.address = self.listener.address
+
+    def log(self, message):
+        if self.verbose:
+            print(message, flush=True)
+
+    def finished(self):
+        return len(self.results) + len(self.failed) == len(self.tasks)
+
+    # -------------------- queue --------------------
+
+    def _requeue(self, task_ids, reason):
+        for tid in task_ids:
+            self.leases.pop(tid, None)
+            if tid not in self.results and tid not in self.failed:
+                self.pending.appendleft(tid)
+        if task_ids:
+            self.log(f"   ♻️ Re-queued {len(task_ids)} task(s): {reason}")
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        expired = [tid for tid, (_, deadline) in self.leases.items() if deadline < now]
+        self._requeue(expired, 'lease expired')
+
+    def next_task(self, worker):
+        with self.lock:
+            self._expire_leases()
+            # A re-queued task can still finish on the worker whose lease
+            # expired: skip it once its result is in
+            while self.pending and (self.pending[0] in self.results or self.pending[0] in self.failed):
+                self.pending.popleft()
+            if self.pending:
+                tid = self.pending.popleft()
+                self.leases[tid] = (worker, time.monotonic() + self.lease_seconds)
+                config, fold, path = self.tasks[tid]
+                return ('task', tid, config, fold, os.path.basename(path))
+            if self.finished():
+                return ('done',)
+            return ('wait', POLL_SECONDS)
+
+    def complete(self, tid, result):
+        config, fold, path = self.tasks[tid]
+        with self.lock:
+            self.leases.pop(tid, None)
+            if tid in self.results or tid in self.failed:
+                return
+            self.results[tid] = save_result(config, fold, path, result)
+            done = len(self.results)
+            self.lock.notify_all()
+        if done % 25 == 0 or done == len(self.tasks):
+            self.log(f"   📥 {done}/{len(self.tasks)} folds done")
+
+    def fail(self, tid, worker, message):
+        with self.lock:
+            self.leases.pop(tid, None)
+            self.attempts[tid] = self.attempts.get(tid, 0) + 1
+            if self.attempts[tid] >= MAX_ATTEMPTS:
+                self.failed[tid] = message
+                self.lock.notify_all()
+            else:
+                self.pending.append(tid)
+        self.log(f"   ⚠️ {worker} failed task {tid}: {message}")
+
+    # -------------------- connections --------------------
+
+    def _handle(self, conn):
+        worker = 'unknown worker'
+        try:
+            while True:
+                message = conn.recv()
+                kind = message[0]
+                if kind == 'hello':
+                    worker = message[1]
+                    with self.lock:
+                        self.workers.add(worker)
+                    self.log(f"   🔌 {worker} connected")
+                    conn.send(('welcome',))
+                elif kind == 'next':
+                    conn.send(self.next_task(worker))
+                elif kind == 'result':
+                    self.complete(message[1], message[2])
+                elif kind == 'error':
+                    self.fail(message[1], worker, message[2])
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            with self.lock:
+                lost = [tid for tid, (owner, _) in self.leases.items() if owner == worker]
+                self._requeue(lost, f'{worker} disconnected')
+                self.workers.discard(worker)
+                self.lock.notify_all()
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError):
+                return
+            except Exception as exc:  # failed handshake (wrong authkey) - keep serving
+                self.log(f"   🚫 Rejected connection: {exc}")
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def serve(self):
+        """
+        Serve until every task has a result (or has failed too often)
+        """
+        threading.Thread(target=self._accept, daemon=True).start()
+        with self.lock:
+            while not self.finished():
+                # Wake up now and then so expired leases are noticed even
+                # when no worker is asking for work
+                self.lock.wait(timeout=POLL_SECONDS)
+                self._expire_leases()
+        # Let idle workers pick up the 'done' message before closing
+        time.sleep(POLL_SECONDS * 2)
+        self.listener.close()
+        return self.results, self.failed
+
+
+# ==================== WORKER ====================
+
+def connect(host, port, authkey, retries=CONNECT_RETRIES):
+    for attempt in range(retries):
+        try:
+            return Client((host, port), authkey=authkey)
+        except (ConnectionRefusedError, OSError):
+            if attempt == retries - 1:
+                raise
+            time.sleep(1)
+
+
+def run_worker(host=DEFAULT_HOST, port=DEFAULT_PORT, authkey=None, name=None):
+    """
+    Pull tasks until the coordinator says it's done. Matrices are built from
+    this machine's feature store and must match the coordinator's version.
+    The key defaults to $OSCAR_QUEUE_KEY.
+    """
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    conn = connect(host, port, authkey or worker_key())
+    conn.send(('hello', name))
+    conn.recv()
+
+    matrices, completed = {}, 0
+    try:
+        while True:
+            conn.send(('next',))
+            message = conn.recv()
+            if message[0] == 'done':
+                break
+            if message[0] == 'wait':
+                time.sleep(message[1])
+                continue
+
+            _, tid, config, fold, matrix_key = message
+            try:
+                path = build_matrix(config['source'], config['features'])
+                if os.path.basename(path) != matrix_key:
+                    raise RuntimeError(f"feature store version mismatch ({os.path.basename(path)} "
+                                       f"here, {matrix_key} on the coordinator)")
+                if path not in matrices:
+                    matrices[path] = open_matrix(path)
+                result = run_fold(config, fold, matrices[path])
+            except Exception as exc:
+                conn.send(('error', tid, f"{type(exc).__name__}: {exc}"))
+                continue
+            conn.send(('result', tid, result))
+            completed += 1
+    except (EOFError, OSError):
+        pass  # coordinator finished and closed the connection
+    finally:
+        conn.close()
+    return completed
+
+
+# ==================== ENTRY POINTS ====================
+
+def distributed_backtest(models=None, modes=('rolling', 'loyo'), full_history=False, host=DEFAULT_HOST,
+                         port=DEFAULT_PORT, local_workers=0, use_cache=True):
+    """
+    Serve every uncached fold to the workers, then summarize like backtest.py
+    """
+    print("=" * 70)
+    print("DISTRIBUTED BACKTEST")
+    print("=" * 70)
+
+    tasks = backtest_tasks(models, modes, full_history, use_cache)
+    coordinator = Coordinator(tasks, host, port)
+    host, port = coordinator.address
+    print(f"\n📡 Coordinator on {host}:{port} with {len(tasks)} fold task(s)")
+    if KEY_VARIABLE in os.environ:
+        print(f"   Start workers with: python src/work_queue.py worker --host <this host> --port {port} "
+              f"(same {KEY_VARIABLE})")
+    else:
+        print(f"   Start workers with: {KEY_VARIABLE}={coordinator.authkey.decode()} "
+              f"python src/work_queue.py worker --port {port}")
+
+    processes = [multiprocessing.Process(target=run_worker, args=(host, port, coordinator.authkey), daemon=True)
+                 for _ in range(local_workers)]
+    for process in processes:
+        process.start()
+
+    start = time.perf_counter()
+    _, failed = coordinator.serve() if tasks else ({}, {})
+    print(f"\n⏱️ Folds finished in {time.perf_counter() - start:.1f}s")
+    for process in processes:
+        process.join(timeout=10)
+    for tid, message in failed.items():
+        config, fold, _ = tasks[tid]
+        print(f"   ❌ {config['name']} {fold['mode']} {fold['test_year']}: {message}")
+    if failed:
+        raise RuntimeError(f"{len(failed)} fold task(s) failed on every attempt")
+
+    # Every fold is cached now: the summary reads them back
+    return backtest_all(models, modes, full_history=full_history, n_workers=1)
+
+
+def _option(args, name, default):
+    return args[args.index(name) + 1] if name in args else default
+
+
+if __name__ == "__main__":
+    # python src/work_queue.py coordinator [model ...] [--port 5917] [--host 0.0.0.0] [--local-workers N]
+    #                                      [--full-history] [--no-cache]
+    # python src/work_queue.py worker [--host HOST] [--port 5917]
+    # (--host other than loopback needs OSCAR_QUEUE_KEY set on both sides)
+    args = sys.argv[1:]
+    command = args[0] if args else 'coordinator'
+    host = _option(args, '--host', DEFAULT_HOST)
+    port = int(_option(args, '--port', DEFAULT_PORT))
+
+    if command == 'worker':
+        count = run_worker(host, port)
+        print(f"✅ Worker finished {count} task(s)")
+    else:
+        values = {'--port', '--host', '--local-workers'}
+        names = [a for i, a in enumerate(args[1:], 1)
+                 if not a.startswith('--') and args[i - 1] not in values]
+        distributed_backtest(names or None, full_history='--full-history' in args, host=host, port=port,
+                             local_workers=int(_option(args, '--local-workers', 0)),
+                             use_cache='--no-cache' not in args)
@@ -8,6 +8,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sentiment'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
 
 # Page config
 st.set_page_config(
@@ -196,6 +200,80 @@ def calculate_explanation(film_data, all_films):
     return reasons
 
 
+@st.cache_resource
+def load_review_index():
+    """
+    Review index built by sentiment/review_index.py (None if not built yet)
+    """
+    from review_index import INDEX_PATH, ReviewIndex
+    
+    if not os.path.exists(INDEX_PATH):
+        return None
+    return ReviewIndex.load(INDEX_PATH)
+
+
+def show_review_evidence(film_name, days=30):
+    """
+    What recent reviews say about each craft of a film
+    """
+    index = load_review_index()
+    if index is None:
+        return
+    
+    summary = [s for s in index.aspect_summary(film_name, days=days) if s['num_reviews'] > 0]
+    if not summary:
+        return
+    
+    st.subheader(f"🗣️ What Reviews Say (last {days} days)")
+    
+    for item in sorted(summary, key=lambda s: s['num_reviews'], reverse=True):
+        aspect = item['aspect'].replace('_', ' ').title()
+        with st.expander(f"{aspect}: {item['avg_vader']:+.2f} avg sentiment ({item['num_reviews']} reviews)"):
+            for sample in item['most_positive'] + item['most_negative']:
+                st.write(f"> {sample['snippet']}")
+
+
+@st.cache_data
+def load_sag_boost():
+    """
+    SAG ensemble odds factor for Best Picture (src/fit_boost_factors.py)
+    """
+    from fit_boost_factors import boost_factor
+    
+    return boost_factor('Best Picture', 'sag')
+
+
+@st.cache_resource
+def load_analog_index():
+    """
+    KD-tree over historical races (src/race_analogs.py)
+    """
+    from race_analogs import AnalogIndex
+    
+    return AnalogIndex()
+
+
+def show_race_analogs(race_rows, category='Best Picture', k=5):
+    """
+    Most similar historical races and how they turned out
+    """
+    from race_analogs import describe_analog
+    
+    analogs = load_analog_index().query(race_rows, k=k, category=category)
+    if analogs.empty:
+        return
+    
+    st.subheader("📚 Most Similar Historical Races")
+    st.write("Past races with the closest nomination spread and precursor pattern:")
+    
+    for _, analog in analogs.iterrows():
+        icon = "🎯" if analog['favourite_won'] else "⚡"
+        st.write(f"{icon} {describe_analog(analog)}")
+    
+    favourites = analogs['favourite_won'].mean()
+    st.caption(f"The most-nominated nominee won {favourites:.0%} of these {len(analogs)} races")
+
+
 def show_film_explanation(film_name, film_data, all_films):
     """
     Display detailed explanation for a film's prediction
@@ -262,6 +340,8 @@ def show_film_explanation(film_name, film_data, all_films):
     
     st.plotly_chart(fig, use_container_width=True)
     
+    show_review_evidence(film_name)
+    
     # Path to victory
     st.subheader("🎯 Path to Victory")
     
@@ -287,6 +367,7 @@ page = st.sidebar.radio(
      "🔍 Film Explainer",
      "🔮 Scenario Simulator",
      "📈 Historical Patterns",
+     "📉 Sentiment Momentum",
      "ℹ️ About Model"]
 )
 
@@ -377,6 +458,12 @@ if page == "🎬 Best Picture Race":
     )
     
     st.plotly_chart(fig, use_container_width=True)
+    
+    # Full field (all nominees) when the prediction file is available
+    from race_analogs import load_prediction_race
+    
+    race_rows = load_prediction_race('Best Picture')
+    show_race_analogs(best_picture_data if race_rows is None else race_rows, 'Best Picture')
 
 
 # ========== PAGE: FILM EXPLAINER ==========
@@ -449,9 +536,10 @@ elif page == "🔮 Scenario Simulator":
         # Simulate SAG boost
         df_sim = best_picture_data.copy()
         
-        # Apply 2.0x boost to SAG winner
+        # Apply the historically fitted SAG boost to the SAG winner
+        sag_boost = load_sag_boost()
         mask = df_sim['film'] == sag_winner
-        df_sim.loc[mask, 'win_probability'] *= 2.0
+        df_sim.loc[mask, 'win_probability'] *= sag_boost
         
         # Normalize
         total = df_sim['win_probability'].sum()
@@ -461,7 +549,7 @@ elif page == "🔮 Scenario Simulator":
         df_sim = df_sim.sort_values('win_probability', ascending=False).reset_index(drop=True)
         
         # Display
-        st.success(f"✅ Simulated: **{sag_winner}** wins SAG Outstanding Cast")
+        st.success(f"✅ Simulated: **{sag_winner}** wins SAG Outstanding Cast ({sag_boost:.1f}x odds)")
         
         # Show why SAG matters
         st.markdown("""
@@ -599,6 +687,49 @@ elif page == "📈 Historical Patterns":
     """)
 
 
+# ========== PAGE: SENTIMENT MOMENTUM ==========
+elif page == "📉 Sentiment Momentum":
+    
+    st.header("📉 Sentiment Momentum Through the Season")
+    
+    timeseries_path = 'data/external/sentiment_momentum_timeseries.csv'
+    
+    if not os.path.exists(timeseries_path):
+        st.info("No momentum data yet - run sentiment/sentiment_momentum.py on a daily review batch")
+    else:
+        momentum = pd.read_csv(timeseries_path)
+        momentum = momentum[momentum['film'].isin(best_picture_data['film'])]
+        
+        window = st.radio("Rolling window:", ["vader_7d", "vader_30d", "vader_90d"], horizontal=True)
+        
+        fig = px.line(
+            momentum,
+            x='momentum_as_of',
+            y=window,
+            color='film',
+            markers=True,
+            title=f"Average VADER Sentiment ({window.split('_')[1]} window)"
+        )
+        fig.update_layout(xaxis_title="Date", yaxis_title="Avg Sentiment", height=450)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        fig2 = px.line(
+            momentum,
+            x='momentum_as_of',
+            y='sentiment_momentum',
+            color='film',
+            title="Momentum (7-day EWM minus 30-day EWM)"
+        )
+        fig2.add_hline(y=0, line_dash="dash", line_color="gray")
+        fig2.update_layout(xaxis_title="Date", yaxis_title="Momentum", height=400)
+        st.plotly_chart(fig2, use_container_width=True)
+        
+        st.markdown("""
+        **Reading the chart:** momentum above zero means recent reviews are warmer than
+        the season-long trend - a film that is peaking at the right time.
+        """)
+
+
 # ========== PAGE: ABOUT MODEL ==========
 elif page == "ℹ️ About Model":
     
@@ -8,6 +8,9 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
 
 # Page config
 st.set_page_config(
@@ -268,6 +271,106 @@ def load_all_predictions():
     return predictions
 
 
+@st.cache_data
+def load_reliability():
+    """
+    Reliability-diagram bins written by src/calibration.py (None if not run yet)
+    """
+    from calibration import RELIABILITY_PATH
+    
+    if not os.path.exists(RELIABILITY_PATH):
+        return None
+    return pd.read_csv(RELIABILITY_PATH)
+
+
+def show_reliability_diagram():
+    """
+    Predicted vs observed win rates, before and after calibration
+    """
+    reliability = load_reliability()
+    if reliability is None:
+        return
+    
+    st.markdown("### 📐 Probability Calibration")
+    st.write("Out-of-fold backtest predictions grouped by predicted probability: "
+             "a calibrated model's points sit on the diagonal.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        model_name = st.selectbox("Model", reliability['model'].unique().tolist())
+    rows = reliability[reliability['model'] == model_name]
+    with col2:
+        category = st.selectbox("Category", rows['category'].unique().tolist())
+    rows = rows[rows['category'] == category]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode='lines', name='Perfect calibration',
+                             line=dict(color='gray', dash='dash')))
+    for stage, color in [('raw', '#FFA500'), ('calibrated', '#FFD700')]:
+        points = rows[rows['stage'] == stage]
+        fig.add_trace(go.Scatter(
+            x=points['mean_predicted'], y=points['observed_rate'], mode='lines+markers',
+            name=stage.title(), marker=dict(size=6 + 2 * points['count'] ** 0.5, color=color),
+            text=points['count'], hovertemplate='Predicted %{x:.1%}<br>Won %{y:.1%}<br>%{text} nominees'
+        ))
+    fig.update_layout(xaxis_title='Predicted win probability', yaxis_title='Observed win rate',
+                      xaxis=dict(range=[0, 1], tickformat='.0%'), yaxis=dict(range=[0, 1], tickformat='.0%'),
+                      height=450)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.cache_data
+def load_model_registry():
+    """
+    Registered model versions from the registry manifest (no model is loaded)
+    """
+    from model_registry import registered_models
+    
+    return registered_models()
+
+
+def show_model_registry():
+    """
+    Current model bundles with their schema size, data hash and metrics
+    """
+    models = load_model_registry()
+    if models.empty:
+        return
+    
+    st.markdown("### 🗂️ Model Versions")
+    current = models[models['current']].drop(columns=['current'])
+    st.dataframe(current, use_container_width=True, hide_index=True)
+
+
+@st.cache_resource
+def load_analog_index():
+    """
+    KD-tree over historical races (src/race_analogs.py)
+    """
+    from race_analogs import AnalogIndex
+    
+    return AnalogIndex()
+
+
+def show_race_analogs(category, k=3):
+    """
+    Closest historical races to this year's race, from its predictions file
+    """
+    from race_analogs import describe_analog, load_prediction_race
+    
+    race_rows = load_prediction_race(category)
+    if race_rows is None:
+        return
+    
+    analogs = load_analog_index().query(race_rows, k=k, category=category)
+    if analogs.empty:
+        return
+    st.markdown("**Most similar historical races:**")
+    for _, analog in analogs.iterrows():
+        icon = "🎯" if analog['favourite_won'] else "⚡"
+        st.markdown(f"{icon} {describe_analog(analog)}")
+
+
 def get_category_explanation(category, winner_data, all_data):
     """
     Generate explanation for why a nominee has their probability
@@ -559,7 +662,9 @@ elif page == "🎬 Best Picture":
                 <p class="{color_class}">Impact: {reason['impact']}</p>
             </div>
             """, unsafe_allow_html=True)
-    
+
+        show_race_analogs('Best Picture', k=5)
+
     # Visualization
     st.subheader("📈 Race Visualization")
     
@@ -633,6 +738,8 @@ elif page == "🎭 Acting Categories":
             for reason in reasons:
                 icon = "✅" if reason['type'] == 'positive' else ("❌" if reason['type'] == 'negative' else "⏳")
                 st.markdown(f"{icon} **{reason['factor']}**: {reason['detail']} - *{reason['impact']}*")
+            
+            show_race_analogs(cat_name)
         
         st.markdown("---")
 
@@ -941,6 +1048,9 @@ elif page == "ℹ️ About Model":
     
     *All predictions based on historical data and statistical modeling.*
     """)
+    
+    show_reliability_diagram()
+    show_model_registry()
 
 # Footer
 st.markdown("---")